@@ -4,7 +4,7 @@
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from functools import lru_cache
 
 try:
@@ -94,6 +94,13 @@ class Settings:
         self.market_cache_ttl: int = _get_env_var_as_int(
             "MARKET_CACHE_TTL", "86400"
         )  # 24小时
+        # 启动时预热缓存的自选股列表（逗号分隔）
+        self.watchlist: List[str] = [
+            item.strip()
+            for item in os.getenv("WATCHLIST", "").split(",")
+            if item.strip()
+        ]
+        self.watchlist_warm_days: int = _get_env_var_as_int("WATCHLIST_WARM_DAYS", "30")
 
         # 日志配置
         self.log_level: str = os.getenv("LOG_LEVEL", "INFO")
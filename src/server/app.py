@@ -3,6 +3,7 @@ SSE + HTTP POST 双向通信股票数据服务器
 主应用入口文件
 """
 
+import asyncio
 import logging
 import sys
 from contextlib import asynccontextmanager
@@ -11,8 +12,14 @@ from pathlib import Path
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # 处理相对导入问题
 if __name__ == "__main__":
     # 如果直接运行此文件，添加项目根目录到 Python 路径
@@ -23,6 +30,8 @@ if __name__ == "__main__":
     from src.server.routes.api_routes import router as api_router
     from src.server.services.sse_service import SSEManager
     from src.server.services.message_service import MessageService
+    from src.server.services.market_service import get_market_service
+    from src.server.services.new_service import close_news_services
     from src.server.utils.event_manager import EventManager
     from src.config.settings import get_settings
 else:
@@ -31,6 +40,8 @@ else:
     from .routes.api_routes import router as api_router
     from .services.sse_service import SSEManager
     from .services.message_service import MessageService
+    from .services.market_service import get_market_service
+    from .services.new_service import close_news_services
     from .utils.event_manager import EventManager
     from ..config.settings import get_settings
 
@@ -52,10 +63,23 @@ async def lifespan(app: FastAPI):
     settings = get_settings()
     logger.info(f"📋 服务配置: {settings.app_name}")
 
+    # 后台预热自选股缓存，不阻塞服务启动
+    warm_task = None
+    if settings.watchlist:
+        warm_task = asyncio.create_task(
+            get_market_service().warm_cache(
+                settings.watchlist, settings.watchlist_warm_days
+            )
+        )
+
     yield
 
+    if warm_task and not warm_task.done():
+        warm_task.cancel()
+
     # 关闭时的清理
     logger.info("🛑 关闭 SSE + HTTP POST 双向通信服务器")
+    await close_news_services()
 
 
 def create_app() -> FastAPI:
@@ -67,6 +91,8 @@ def create_app() -> FastAPI:
         description="SSE + HTTP POST 双向通信股票数据服务",
         version="1.0.0",
         lifespan=lifespan,
+        # 安装了 orjson 时使用更快的 JSON 编码器
+        default_response_class=ORJSONResponse if orjson else JSONResponse,
     )
 
     # 配置 CORS
@@ -50,6 +50,7 @@ class ConnectionRegistry:
 
         self._connections: Dict[str, DataSourceConnection] = {}
         self._config = get_settings()
+        self._http_session = None
         self._initialized = True
 
         logger.info("✅ ConnectionRegistry 初始化完成")
@@ -278,6 +279,41 @@ class ConnectionRegistry:
 
         return conn
 
+    # ==================== HTTP 连接池 ====================
+
+    def get_http_session(self):
+        """
+        获取全局共享的 HTTP 会话（懒加载）
+
+        所有直接发起 HTTP 请求的服务共用一个带连接池的 requests.Session，
+        复用 TCP/TLS 连接（keep-alive），避免每次请求重新握手。
+
+        Returns:
+            requests.Session: 共享会话
+        """
+        if self._http_session is None:
+            with self._lock:
+                if self._http_session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    from urllib3.util.retry import Retry
+
+                    adapter = HTTPAdapter(
+                        pool_connections=20,
+                        pool_maxsize=64,
+                        max_retries=Retry(
+                            total=2,
+                            backoff_factor=0.3,
+                            status_forcelist=[429, 500, 502, 503, 504],
+                        ),
+                    )
+                    session = requests.Session()
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._http_session = session
+                    logger.info("✅ 共享 HTTP 连接池初始化完成")
+        return self._http_session
+
     # ==================== 通用方法 ====================
 
     def get_connection(self, source: str) -> Optional[DataSourceConnection]:
@@ -349,6 +385,11 @@ class ConnectionRegistry:
                 logger.error(f"❌ {name} 关闭失败: {e}")
 
         self._connections.clear()
+
+        if self._http_session is not None:
+            self._http_session.close()
+            self._http_session = None
+
         logger.info("✅ 所有连接已关闭")
 
     def get_stats(self) -> Dict[str, Any]:
@@ -172,7 +172,10 @@ class StockMCPServer:
                     return "❌ 新闻服务当前不可用"
 
                 # 获取实时股票新闻
-                result = service.get_news_for_date(symbol, None, days_back)
+                # 报告只展示最新 20 条
+                result = await service.aget_news_for_date(
+                    symbol, None, days_back, top_k=20
+                )
 
                 if not result.get("success", False):
                     error_msg = result.get("error", "获取新闻失败")
@@ -183,35 +186,41 @@ class StockMCPServer:
                 if not news_list:
                     return f"📰 {symbol} 最近 {days_back} 天没有找到新闻"
 
-                report = f"# {symbol} 实时新闻分析报告\n\n"
-                report += f"📅 时间范围: {result['start_date'][:10]}"
-                report += f" 到 {result['end_date'][:10]}\n"
-                report += f"📊 新闻总数: {result['total_count']}条\n"
-                report += f"🌐 市场: {result['market']}\n\n"
-
-                # 数据源统计
-                report += "## 📡 数据源统计\n"
-                for source, count in result.get("source_stats", {}).items():
-                    report += f"- {source}: {count}条\n"
-                report += "\n"
+                parts = [
+                    f"# {symbol} 实时新闻分析报告\n\n",
+                    f"📅 时间范围: {result['start_date'][:10]}",
+                    f" 到 {result['end_date'][:10]}\n",
+                    f"📊 新闻总数: {result['total_count']}条\n",
+                    f"🌐 市场: {result['market']}\n\n",
+                    # 数据源统计
+                    "## 📡 数据源统计\n",
+                ]
+                parts.extend(
+                    f"- {source}: {count}条\n"
+                    for source, count in result.get("source_stats", {}).items()
+                )
+                parts.append("\n")
 
                 # 显示新闻列表
-                report += "## 📰 新闻详情\n\n"
+                parts.append("## 📰 新闻详情\n\n")
                 for i, news in enumerate(news_list[:20], 1):
-                    report += f"### {i}. {news['title']}\n"
-                    report += f"**来源**: {news['source']} | "
-                    report += f"**时间**: {news['publish_time'][:19]}\n"
+                    parts.extend(
+                        (
+                            f"### {i}. {news['title']}\n",
+                            f"**来源**: {news['source']} | ",
+                            f"**时间**: {news['publish_time'][:19]}\n",
+                        )
+                    )
                     if news.get("content"):
-                        content = news["content"][:200]
-                        report += f"{content}...\n"
+                        parts.append(f"{news['content'][:200]}...\n")
                     if news.get("url"):
-                        report += f"🔗 [查看原文]({news['url']})\n"
-                    report += "\n"
+                        parts.append(f"🔗 [查看原文]({news['url']})\n")
+                    parts.append("\n")
 
-                if len(news_list) > 20:
-                    report += f"\n*还有 {len(news_list) - 20} 条新闻未显示*\n"
+                if result["total_count"] > 20:
+                    parts.append(f"\n*还有 {result['total_count'] - 20} 条新闻未显示*\n")
 
-                return report
+                return "".join(parts)
 
             except Exception as e:
                 logger.error(f"获取最新新闻失败: {e}")
@@ -304,19 +313,23 @@ class StockMCPServer:
 
     def _format_research_report(self, topic: str, search_result: dict) -> str:
         """格式化深度研究报告"""
-        report = f"# 深度研究报告: {topic}\n\n"
+        parts = [f"# 深度研究报告: {topic}\n\n"]
 
         if search_result.get("answer"):
-            report += f"## 核心摘要 (AI生成)\n\n{search_result['answer']}\n\n"
+            parts.append(f"## 核心摘要 (AI生成)\n\n{search_result['answer']}\n\n")
 
         if search_result.get("results"):
-            report += "## 关键信息来源与摘录\n\n"
+            parts.append("## 关键信息来源与摘录\n\n")
             for i, item in enumerate(search_result["results"]):
-                report += f"### {i+1}. [{item.get('title', '无标题')}]({item.get('url', '#')})\n"
-                report += f"**来源**: {item.get('source', '未知')}\n"
-                report += f"> {item.get('content', '无内容')}\n\n---\n\n"
+                parts.extend(
+                    (
+                        f"### {i+1}. [{item.get('title', '无标题')}]({item.get('url', '#')})\n",
+                        f"**来源**: {item.get('source', '未知')}\n",
+                        f"> {item.get('content', '无内容')}\n\n---\n\n",
+                    )
+                )
 
-        return report
+        return "".join(parts)
 
 
 async def run_mcp_server():
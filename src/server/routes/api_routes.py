@@ -155,7 +155,7 @@ async def get_latest_news(symbol: str, days_back: int = 30):
         news_service = get_news_service(use_proxy=False)
 
         # 调用服务获取新闻（使用当前日期向前查询）
-        result = news_service.get_news_for_date(symbol, None, days_back)
+        result = await news_service.aget_news_for_date(symbol, None, days_back)
 
         if not result.get("success", False):
             error_msg = result.get("error", "获取新闻失败")
@@ -195,7 +195,9 @@ async def get_news_by_date(symbol: str, target_date: str = None, days_before: in
         news_service = get_news_service(use_proxy=False)
 
         # 调用服务获取指定日期的新闻
-        result = news_service.get_news_for_date(symbol, target_date, days_before)
+        result = await news_service.aget_news_for_date(
+            symbol, target_date, days_before
+        )
 
         if not result.get("success", False):
             error_msg = result.get("error", "获取新闻失败")
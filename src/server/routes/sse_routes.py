@@ -4,7 +4,6 @@ SSE (Server-Sent Events) 路由
 """
 
 import asyncio
-import json
 import logging
 from datetime import datetime
 from typing import Dict, Any
@@ -13,7 +12,8 @@ from fastapi import APIRouter, Request, Response
 from fastapi.responses import StreamingResponse
 from sse_starlette import EventSourceResponse
 
-from ..services.sse_service import SSEManager
+from ..services.sse_service import SSEManager, SSEPayload
+from ..utils import json_utils
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -46,7 +46,7 @@ async def sse_connect(request: Request):
 
             yield {
                 "event": "connection",
-                "data": json.dumps(init_message, ensure_ascii=False),
+                "data": json_utils.dumps_str(init_message),
             }
 
             # 保持连接活跃，监听消息队列
@@ -54,10 +54,13 @@ async def sse_connect(request: Request):
                 try:
                     # 检查是否有待发送的消息
                     message = await sse_manager.get_message_for_client(client_id)
-                    if message:
+                    if isinstance(message, SSEPayload):
+                        # 广播消息已预先序列化，直接写出
+                        yield {"event": message.event, "data": message.data}
+                    elif message:
                         yield {
                             "event": message.get("event", "message"),
-                            "data": json.dumps(message, ensure_ascii=False),
+                            "data": json_utils.dumps_str(message),
                         }
 
                     # 定期发送心跳
@@ -9,16 +9,8 @@ from datetime import datetime
 import logging
 import warnings
 import threading
-import requests
 import socket
 
-try:
-    from requests.adapters import HTTPAdapter
-    from urllib3.util.retry import Retry
-except Exception:
-    HTTPAdapter = None
-    Retry = None
-
 try:
     import akshare as ak
 except ImportError:
@@ -62,19 +54,11 @@ class AkshareService:
         try:
             socket.setdefaulttimeout(default_timeout)
 
-            if HTTPAdapter and Retry:
-                retry_strategy = Retry(
-                    total=3,
-                    backoff_factor=1,
-                    status_forcelist=[429, 500, 502, 503, 504],
-                )
-                adapter = HTTPAdapter(max_retries=retry_strategy)
-                session = requests.Session()
-                session.mount("http://", adapter)
-                session.mount("https://", adapter)
-                self._session = session
+            # 复用全局共享的 HTTP 连接池
+            from ..core.connection_registry import get_connection_registry
 
-                logger.info("🔧 AKShare超时配置完成: 60秒超时，3次重试")
+            self._session = get_connection_registry().get_http_session()
+            logger.info("🔧 AKShare超时配置完成: 60秒超时，共享连接池")
         except Exception as e:
             logger.error(f"⚠️ AKShare超时配置失败: {e}")
             logger.info("🔧 使用默认超时设置")
@@ -4,20 +4,136 @@
 整合优化后的数据源（akshare_optimized, tushare_optimized, tdx_service, yfinance_service）
 实现智能降级机制，并能够生成完整的市场技术分析报告
 """
+import asyncio
 import logging
+import random
+import threading
+import time
 import warnings
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, List, Any
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
+import requests
 
-from ..utils.symbol_processor import get_symbol_processor
-from ..utils.data_source_strategy import get_data_source_strategy
+from ..utils.symbol_processor import get_symbol_processor, SymbolContext
+from ..utils.data_source_strategy import MARKET_DATA_SOURCES, get_data_source_strategy
+from ..utils.ttl_cache import TTLCache
 from ..exception.exception import DataNotFoundError
 
 logger = logging.getLogger("market_service")
 warnings.filterwarnings("ignore")
 
+# 各数据源最大并发请求数
+SOURCE_MAX_CONCURRENCY = {"tushare": 2, "akshare": 4, "tdx": 4, "yfinance": 4}
+# 各数据源每分钟最大请求数（Tushare 有严格的分钟配额）
+SOURCE_RATE_LIMITS = {"tushare": 200}
+# 瞬时故障重试次数及退避参数（秒）
+SOURCE_RETRY_COUNT = 2
+RETRY_BACKOFF_INITIAL = 0.1
+RETRY_BACKOFF_MAX = 2.0
+# 单次数据源请求超时（秒）
+SOURCE_TIMEOUT = {"tushare": 10, "akshare": 20, "tdx": 10, "yfinance": 15}
+# 熔断：连续失败次数阈值与熔断时长（秒）
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_OPEN_SECONDS = 60
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """
+    判断是否为可重试的瞬时故障（超时、连接错误、5xx/429）
+
+    只认明确的网络瞬时错误：OSError 还涵盖文件不存在、权限不足等永久错误，
+    requests 的 InvalidURL 等也属于 OSError，重试这些只会拖慢降级
+    """
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(
+        error,
+        (TimeoutError, ConnectionError, requests.Timeout, requests.ConnectionError),
+    )
+
+
+def _create_tushare_service():
+    from .tushare_service import get_tushare_service
+
+    return get_tushare_service()
+
+
+def _create_akshare_service():
+    from .akshare_service import get_akshare_service
+
+    return get_akshare_service()
+
+
+def _create_tdx_service():
+    from .tdx_service import get_tdx_service
+
+    return get_tdx_service()
+
+
+def _create_yfinance_service():
+    from .yfinance_service import YFinanceService
+
+    return YFinanceService()
+
+
+# (数据源, 市场) -> 取数方法名；未列出的组合表示该数据源不支持此市场
+_SOURCE_FETCHERS = {
+    ("tushare", "china"): "_fetch_tushare",
+    ("tushare", "hk"): "_fetch_tushare",
+    ("tushare", "other"): "_fetch_tushare",
+    ("akshare", "china"): "_fetch_akshare_china",
+    ("akshare", "hk"): "_fetch_akshare_hk",
+    ("akshare", "us"): "_fetch_akshare_us",
+    ("tdx", "china"): "_fetch_tdx",
+    ("yfinance", "china"): "_fetch_yfinance",
+    ("yfinance", "hk"): "_fetch_yfinance",
+    ("yfinance", "us"): "_fetch_yfinance",
+    ("yfinance", "other"): "_fetch_yfinance",
+}
+
+# source 列使用分类类型，避免整列重复的字符串对象
+_SOURCE_DTYPE = pd.CategoricalDtype(categories=["tushare", "tdx", "akshare", "yfinance"])
+
+# 数据源服务工厂（懒加载，首次使用时才导入对应依赖）
+_SERVICE_FACTORIES = {
+    "tushare": _create_tushare_service,
+    "akshare": _create_akshare_service,
+    "tdx": _create_tdx_service,
+    "yfinance": _create_yfinance_service,
+}
+
+
+class _RateLimiter:
+    """简单令牌桶限流器（线程安全）"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = per_minute
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """获取一个令牌，令牌不足时阻塞等待"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated_at) * self.rate
+                )
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
 
 class MarketDataService:
     """市场数据服务 - 支持多数据源降级和报告生成"""
@@ -27,45 +143,62 @@ class MarketDataService:
         self.symbol_processor = get_symbol_processor()
         self.strategy = get_data_source_strategy()
         self.services = {}
-        self._init_services()
-
-    def _init_services(self):
-        """初始化各数据源服务"""
-        # 1. Tushare优化服务
-        try:
-            from .tushare_service import get_tushare_service
-
-            self.services["tushare"] = get_tushare_service()
-            logger.info("✅ Tushare优化服务初始化成功")
-        except Exception as e:
-            logger.warning(f"⚠️ Tushare优化服务初始化失败: {e}")
+        self._services_lock = threading.Lock()
+        # 日线数据缓存：有界 LRU + TTL，避免长期运行时无限增长
+        self.cache = TTLCache(maxsize=10000, ttl=3600)
+        # 每个数据源的并发上限与限流器，防止并发扇出触发上游 429
+        self._semaphores = {
+            name: threading.BoundedSemaphore(limit)
+            for name, limit in SOURCE_MAX_CONCURRENCY.items()
+        }
+        self._rate_limiters = {
+            name: _RateLimiter(limit) for name, limit in SOURCE_RATE_LIMITS.items()
+        }
+        # 超时控制与熔断状态
+        self._executor = ThreadPoolExecutor(
+            max_workers=16, thread_name_prefix="market-source"
+        )
+        self._failures = Counter()
+        self._opened_until: Dict[str, float] = {}
+        self._circuit_lock = threading.Lock()
+        # 按市场预先绑定 (数据源, 取数方法) 链，避免每次调用重复分支判断
+        self._market_dispatch = {
+            market: tuple(
+                (source, getattr(self, _SOURCE_FETCHERS[(source, market)]))
+                for source in sources
+                if (source, market) in _SOURCE_FETCHERS
+            )
+            for market, sources in MARKET_DATA_SOURCES.items()
+        }
 
-        # 2. AKShare优化服务
-        try:
-            from .akshare_service import get_akshare_service
+    def _service(self, name: str):
+        """
+        按需获取数据源服务（首次使用时才导入并初始化）
 
-            self.services["akshare"] = get_akshare_service()
-            logger.info("✅ AKShare优化服务初始化成功")
-        except Exception as e:
-            logger.warning(f"⚠️ AKShare优化服务初始化失败: {e}")
+        初始化失败的数据源记为 None，后续调用直接跳过，不再重复尝试
 
-        # 3. 通达信服务
-        try:
-            from .tdx_service import get_tdx_service
+        Args:
+            name: 数据源名称
 
-            self.services["tdx"] = get_tdx_service()
-            logger.info("✅ 通达信服务初始化成功")
-        except Exception as e:
-            logger.warning(f"⚠️ 通达信服务初始化失败: {e}")
+        Returns:
+            数据源服务实例，不可用时返回 None
+        """
+        if name in self.services:
+            return self.services[name]
 
-        # 4. YFinance服务
-        try:
-            from .yfinance_service import YFinanceService
+        factory = _SERVICE_FACTORIES.get(name)
+        if factory is None:
+            return None
 
-            self.services["yfinance"] = YFinanceService()
-            logger.info("✅ YFinance服务初始化成功")
-        except Exception as e:
-            logger.warning(f"⚠️ YFinance服务初始化失败: {e}")
+        with self._services_lock:
+            if name not in self.services:
+                try:
+                    self.services[name] = factory()
+                    logger.info(f"✅ {name} 服务初始化成功")
+                except Exception as e:
+                    self.services[name] = None
+                    logger.warning(f"⚠️ {name} 服务初始化失败: {e}")
+        return self.services[name]
 
     def get_data_source_priority(self, symbol: str) -> List[str]:
         """
@@ -99,24 +232,40 @@ class MarketDataService:
         if start_date is None:
             start_date = (datetime.now() - timedelta(days=180)).strftime("%Y-%m-%d")
 
-        # 获取数据源优先级
-        data_sources = self.get_data_source_priority(symbol)
+        ctx = self.symbol_processor.build_context(symbol)
+        return self._get_daily_data(ctx, start_date, end_date)
+
+    def _get_daily_data(
+        self, ctx: SymbolContext, start_date: str, end_date: str
+    ) -> pd.DataFrame:
+        """按股票上下文获取日线数据（带缓存和智能降级）"""
+        symbol = ctx.symbol
+        cache_key = (symbol, start_date, end_date)
+        cached = self._get_from_cache(cache_key)
+        if cached is not None:
+            logger.debug(f"✅ 命中缓存: {symbol} ({start_date} 到 {end_date})")
+            return cached.copy()
+
+        # 获取数据源链
+        fetchers = self._market_dispatch[ctx.market]
 
         logger.info(f"📊 获取 {symbol} 的市场数据 ({start_date} 到 {end_date})")
-        logger.info(f"🔄 数据源优先级: {data_sources}")
+        logger.info(f"🔄 数据源优先级: {[source for source, _ in fetchers]}")
 
         last_error = None
-        for source in data_sources:
-            if source not in self.services:
+        for source, fetch in fetchers:
+            if self._service(source) is None:
                 continue
 
             try:
                 logger.info(f"🔄 尝试从 {source} 获取数据...")
-                data = self._get_data_from_source(source, symbol, start_date, end_date)
+                data = self._call_source(source, fetch, ctx, start_date, end_date)
 
                 if data is not None and not data.empty:
                     logger.info(f"✅ 成功从 {source} 获取 {len(data)} 条数据")
-                    return self._standardize_data(data, source)
+                    data = self._standardize_data(data, source)
+                    self._set_cache(cache_key, data)
+                    return data.copy()
 
             except Exception as e:
                 last_error = e
@@ -128,40 +277,151 @@ class MarketDataService:
             f"无法从任何数据源获取 {symbol} 的数据。最后错误: {last_error}"
         )
 
-    def _get_data_from_source(
-        self, source: str, symbol: str, start_date: str, end_date: str
+    async def warm_cache(self, symbols: List[str], days: int = 30) -> Dict[str, bool]:
+        """
+        预热自选股日线缓存，避免首个请求承担冷启动延迟
+
+        Args:
+            symbols: 股票代码列表
+            days: 回溯天数
+
+        Returns:
+            Dict[str, bool]: 每个股票是否预热成功
+        """
+        if not symbols:
+            return {}
+
+        end_date = datetime.now().strftime("%Y-%m-%d")
+        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+
+        logger.info(f"🔥 开始预热缓存: {len(symbols)} 只股票, 回溯 {days} 天")
+        results = await asyncio.gather(
+            *[
+                asyncio.to_thread(self.get_stock_daily_data, s, start_date, end_date)
+                for s in symbols
+            ],
+            return_exceptions=True,
+        )
+
+        status = {}
+        for symbol, result in zip(symbols, results):
+            status[symbol] = not isinstance(result, BaseException)
+            if not status[symbol]:
+                logger.warning(f"⚠️ 预热 {symbol} 失败: {result}")
+
+        logger.info(f"✅ 缓存预热完成: {sum(status.values())}/{len(symbols)} 成功")
+        return status
+
+    def _get_from_cache(self, key) -> Optional[pd.DataFrame]:
+        """从缓存获取数据（过期条目视为不存在）"""
+        return self.cache.get(key)
+
+    def _set_cache(self, key, data: pd.DataFrame):
+        """写入缓存"""
+        self.cache.set(key, data)
+
+    def _call_source(
+        self, source: str, fetch, ctx: SymbolContext, start_date: str, end_date: str
     ) -> Optional[pd.DataFrame]:
-        """从指定数据源获取数据"""
-        service = self.services.get(source)
-        if not service:
-            return None
+        """
+        调用数据源：熔断期间直接跳过；瞬时故障按指数退避+抖动重试，
+        重试耗尽后计入连续失败次数，达到阈值后熔断该数据源。
+        超时不重试：超时的线程无法取消，重试只会继续占用线程池和并发名额
+        """
+        with self._circuit_lock:
+            if time.monotonic() < self._opened_until.get(source, 0):
+                logger.info(f"⛔ {source} 处于熔断状态，跳过")
+                return None
 
-        classification = self.symbol_processor.classifier.classify_stock(symbol)
+        for attempt in range(SOURCE_RETRY_COUNT + 1):
+            try:
+                data = self._call_source_once(source, fetch, ctx, start_date, end_date)
+                with self._circuit_lock:
+                    self._failures[source] = 0
+                return data
+            except Exception as e:
+                if (
+                    attempt < SOURCE_RETRY_COUNT
+                    and not isinstance(e, TimeoutError)
+                    and _is_transient_error(e)
+                ):
+                    delay = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_INITIAL * 2**attempt)
+                    delay = random.uniform(0, delay)
+                    logger.info(
+                        f"🔁 {source} 瞬时故障，{delay:.2f}s 后重试 ({attempt + 1}/{SOURCE_RETRY_COUNT}): {e}"
+                    )
+                    time.sleep(delay)
+                    continue
+
+                self._record_failure(source)
+                raise
+
+    def _record_failure(self, source: str):
+        """记录一次失败（含超时），连续失败达到阈值时熔断该数据源"""
+        with self._circuit_lock:
+            self._failures[source] += 1
+            if self._failures[source] < CIRCUIT_FAILURE_THRESHOLD:
+                return
+            self._opened_until[source] = time.monotonic() + CIRCUIT_OPEN_SECONDS
+            self._failures[source] = 0
+        logger.warning(
+            f"⛔ {source} 连续失败 {CIRCUIT_FAILURE_THRESHOLD} 次，熔断 {CIRCUIT_OPEN_SECONDS} 秒"
+        )
 
-        if source == "tushare":
-            # Tushare优化服务
-            return service.get_stock_daily(symbol, start_date, end_date)
+    def _call_source_once(
+        self, source: str, fetch, ctx: SymbolContext, start_date: str, end_date: str
+    ) -> Optional[pd.DataFrame]:
+        """在并发上限、限流和超时约束下调用一次数据源"""
+        future = self._executor.submit(
+            self._run_limited, source, fetch, ctx, start_date, end_date
+        )
+        timeout = SOURCE_TIMEOUT.get(source, 10)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            # 已在运行的任务无法取消，这里仅放弃等待，由调用方计入熔断
+            raise TimeoutError(f"{source} 请求超时 ({timeout}秒)")
+
+    def _run_limited(
+        self, source: str, fetch, ctx: SymbolContext, start_date: str, end_date: str
+    ) -> Optional[pd.DataFrame]:
+        """在并发上限和限流约束下执行取数"""
+        limiter = self._rate_limiters.get(source)
+        if limiter:
+            limiter.acquire()
+
+        semaphore = self._semaphores.get(source)
+        if semaphore is None:
+            return fetch(ctx, start_date, end_date)
+        with semaphore:
+            return fetch(ctx, start_date, end_date)
+
+    # ==================== 各数据源取数方法 ====================
+
+    def _fetch_tushare(self, ctx: SymbolContext, start_date: str, end_date: str):
+        return self._service("tushare").get_stock_daily(
+            ctx.symbol, start_date, end_date
+        )
+
+    def _fetch_akshare_china(self, ctx: SymbolContext, start_date: str, end_date: str):
+        return self._service("akshare").get_stock_daily(
+            ctx.symbol, start_date, end_date
+        )
 
-        elif source == "akshare":
-            # AKShare优化服务
-            if classification["is_china"]:
-                return service.get_stock_daily(symbol, start_date, end_date)
-            elif classification["is_hk"]:
-                return service.get_hk_daily(symbol, start_date, end_date)
-            elif classification["is_us"]:
-                return service.get_us_daily(symbol, start_date, end_date)
+    def _fetch_akshare_hk(self, ctx: SymbolContext, start_date: str, end_date: str):
+        return self._service("akshare").get_hk_daily(ctx.symbol, start_date, end_date)
 
-        elif source == "tdx":
-            # 通达信服务（仅支持A股）
-            if classification["is_china"]:
-                return service.get_stock_daily(symbol, start_date, end_date)
+    def _fetch_akshare_us(self, ctx: SymbolContext, start_date: str, end_date: str):
+        return self._service("akshare").get_us_daily(ctx.symbol, start_date, end_date)
 
-        elif source == "yfinance":
-            # YFinance服务
-            yf_symbol = self.symbol_processor.get_yfinance_format(symbol)
-            return service.get_stock_daily(yf_symbol, start_date, end_date)
+    def _fetch_tdx(self, ctx: SymbolContext, start_date: str, end_date: str):
+        # 通达信服务（仅支持A股）
+        return self._service("tdx").get_stock_daily(ctx.symbol, start_date, end_date)
 
-        return None
+    def _fetch_yfinance(self, ctx: SymbolContext, start_date: str, end_date: str):
+        return self._service("yfinance").get_stock_daily(
+            ctx.yfinance_symbol, start_date, end_date
+        )
 
     def _standardize_data(self, data: pd.DataFrame, source: str) -> pd.DataFrame:
         """标准化数据格式"""
@@ -192,12 +452,15 @@ class MarketDataService:
         if "date" in data.columns:
             data["date"] = pd.to_datetime(data["date"])
 
-        # 排序
-        if "date" in data.columns:
-            data = data.sort_values("date")
+        # 排序（上游数据通常已按日期升序，此时跳过排序）
+        if "date" in data.columns and not data["date"].is_monotonic_increasing:
+            data = data.sort_values("date", kind="mergesort")
 
         # 添加数据源标识
-        data["source"] = source
+        data["source"] = pd.Categorical.from_codes(
+            np.full(len(data), _SOURCE_DTYPE.categories.get_loc(source), dtype=np.int8),
+            dtype=_SOURCE_DTYPE,
+        )
 
         return data
 
@@ -308,14 +571,25 @@ class MarketDataService:
             str: Markdown格式的分析报告
         """
         try:
+            # 设置默认日期
+            if end_date is None:
+                end_date = datetime.now().strftime("%Y-%m-%d")
+            if start_date is None:
+                start_date = (datetime.now() - timedelta(days=180)).strftime(
+                    "%Y-%m-%d"
+                )
+
+            # 只分类一次，贯穿取数与报告生成
+            ctx = self.symbol_processor.build_context(symbol)
+
             # 获取股票数据
-            data = self.get_stock_daily_data(symbol, start_date, end_date)
+            data = self._get_daily_data(ctx, start_date, end_date)
 
             if data.empty:
                 return f"❌ 无法获取 {symbol} 的市场数据"
 
             # 获取股票分类信息
-            classification = self.symbol_processor.classifier.classify_stock(symbol)
+            classification = ctx.classification
 
             # 计算技术指标
             indicators = self.calculate_technical_indicators(data)
@@ -342,17 +616,25 @@ class MarketDataService:
     ) -> str:
         """格式化市场分析报告"""
 
-        # 基本信息
-        latest = data.iloc[-1]
-        earliest = data.iloc[0]
+        # 基本信息：一次性取出 numpy 数组，避免逐次构造 Series
+        closes = data["close"].to_numpy(dtype=np.float64)
+        opens = data["open"].to_numpy(dtype=np.float64)
+        highs = data["high"].to_numpy(dtype=np.float64)
+        lows = data["low"].to_numpy(dtype=np.float64)
+        volumes = data["volume"].to_numpy(dtype=np.float64)
+        latest_close = closes[-1]
+        earliest_close = closes[0]
 
         # 计算涨跌幅
-        price_change = latest["close"] - earliest["close"]
-        price_change_pct = (price_change / earliest["close"]) * 100
+        price_change = latest_close - earliest_close
+        price_change_pct = (price_change / earliest_close) * 100
 
-        # 计算波动率
-        returns = data["close"].pct_change().dropna()
-        volatility = returns.std() * np.sqrt(252) * 100  # 年化波动率
+        # 计算波动率（与 pandas std 一致使用 ddof=1）
+        returns = closes[1:] / closes[:-1] - 1
+        returns = returns[~np.isnan(returns)]
+        volatility = (
+            returns.std(ddof=1) * np.sqrt(252) * 100 if len(returns) > 1 else np.nan
+        )  # 年化波动率
 
         report = f"""
 # {symbol} 股票技术分析报告
@@ -365,23 +647,23 @@ class MarketDataService:
 - **板块**: {classification['board']}
 - **币种**: {classification['currency']}
 - **分析期间**: {start_date} 至 {end_date}
-- **数据来源**: {data['source'].iloc[-1]}
+- **数据来源**: {data['source'].iat[-1]}
 
 ---
 
 ## 二、价格趋势分析
 
 ### 2.1 价格概览
-- **最新价格**: {latest['close']:.2f} {classification['currency']}
-- **开盘价**: {latest['open']:.2f}
-- **最高价**: {latest['high']:.2f}
-- **最低价**: {latest['low']:.2f}
-- **成交量**: {latest['volume']:,.0f}
+- **最新价格**: {latest_close:.2f} {classification['currency']}
+- **开盘价**: {opens[-1]:.2f}
+- **最高价**: {highs[-1]:.2f}
+- **最低价**: {lows[-1]:.2f}
+- **成交量**: {volumes[-1]:,.0f}
 
 ### 2.2 期间表现
-- **期初价格**: {earliest['close']:.2f}
-- **期间最高**: {data['high'].max():.2f}
-- **期间最低**: {data['low'].min():.2f}
+- **期初价格**: {earliest_close:.2f}
+- **期间最高**: {np.nanmax(highs):.2f}
+- **期间最低**: {np.nanmin(lows):.2f}
 - **期间涨跌**: {price_change:+.2f} ({price_change_pct:+.2f}%)
 - **年化波动率**: {volatility:.2f}%
 
@@ -393,7 +675,7 @@ class MarketDataService:
 ## 三、技术指标分析
 
 ### 3.1 移动平均线系统
-{self._analyze_moving_averages(indicators, latest['close'])}
+{self._analyze_moving_averages(indicators, latest_close)}
 
 ### 3.2 动量指标
 {self._analyze_momentum_indicators(indicators)}
@@ -402,7 +684,7 @@ class MarketDataService:
 {self._analyze_trend_indicators(indicators)}
 
 ### 3.4 波动性指标
-{self._analyze_volatility_indicators(indicators, latest['close'])}
+{self._analyze_volatility_indicators(indicators, latest_close)}
 
 ---
 
@@ -440,7 +722,7 @@ class MarketDataService:
 
     def _analyze_trend(self, data: pd.DataFrame, indicators: Dict) -> str:
         """分析价格趋势"""
-        latest_close = data["close"].iloc[-1]
+        latest_close = data["close"].iat[-1]
 
         trend_signals = []
 
@@ -595,8 +877,9 @@ class MarketDataService:
 
     def _analyze_volume(self, data: pd.DataFrame) -> str:
         """分析成交量"""
-        recent_volume = data["volume"].iloc[-5:].mean()
-        avg_volume = data["volume"].mean()
+        volumes = data["volume"].to_numpy(dtype=np.float64)
+        recent_volume = np.nanmean(volumes[-5:])
+        avg_volume = np.nanmean(volumes)
 
         volume_ratio = recent_volume / avg_volume if avg_volume > 0 else 0
 
@@ -618,23 +901,18 @@ class MarketDataService:
 
     def _analyze_support_resistance(self, data: pd.DataFrame) -> str:
         """分析支撑位和阻力位"""
-        recent_data = data.tail(20)
-
         # 计算关键价位
         resistance_levels = []
         support_levels = []
 
         # 最近高点作为阻力位
-        high_max = recent_data["high"].max()
+        high_max = np.nanmax(data["high"].to_numpy(dtype=np.float64)[-20:])
         resistance_levels.append(high_max)
 
         # 最近低点作为支撑位
-        low_min = recent_data["low"].min()
+        low_min = np.nanmin(data["low"].to_numpy(dtype=np.float64)[-20:])
         support_levels.append(low_min)
 
-        # 添加均线作为动态支撑/阻力
-        current_price = data["close"].iloc[-1]
-
         analysis = f"""
 ### 静态支撑与阻力
 - **阻力位1**: {resistance_levels[0]:.2f} (近期高点)
@@ -675,7 +953,7 @@ class MarketDataService:
                 score -= 15
 
         # 均线信号
-        current_price = data["close"].iloc[-1]
+        current_price = data["close"].iat[-1]
         if indicators.get("MA20"):
             if current_price > indicators["MA20"]:
                 signals.append("✅ 价格位于MA20上方")
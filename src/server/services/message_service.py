@@ -3,17 +3,346 @@
 处理 JSON-RPC 请求和业务逻辑调用
 """
 
-import json
+import asyncio
+import contextvars
 import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 
+import numpy as np
+
 from .akshare_service import AkshareService
 from .fundamentals_service import FundamentalsService
 from .new_service import get_news_service
+from ..utils.ttl_cache import TTLCache
+from ..utils import json_utils
 
 logger = logging.getLogger(__name__)
 
+# 批量行情请求的代码数量上限与并发度
+_MAX_BATCH_SYMBOLS = 200
+_BATCH_CONCURRENCY = 32
+
+# 阻塞型服务调用统一放到有界线程池执行，避免阻塞事件循环；
+# 线程池由所有 MessageService 实例共享，实例被丢弃时不会遗留未关闭的线程
+_RPC_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="rpc")
+
+# 可用方法列表（运行期不变，模块加载时构建一次）
+_AVAILABLE_METHODS = (
+    {
+        "name": "get_stock_quote",
+        "description": "获取股票实时行情",
+        "params": {
+            "symbol": {
+                "type": "string",
+                "required": True,
+                "description": "股票代码",
+            }
+        },
+    },
+    {
+        "name": "get_stock_quotes",
+        "description": "批量获取股票实时行情",
+        "params": {
+            "symbols": {
+                "type": "array",
+                "required": True,
+                "description": f"股票代码列表（最多{_MAX_BATCH_SYMBOLS}个）",
+            }
+        },
+    },
+    {
+        "name": "get_stock_analysis",
+        "description": "获取股票分析",
+        "params": {
+            "symbol": {
+                "type": "string",
+                "required": True,
+                "description": "股票代码",
+            },
+            "type": {
+                "type": "string",
+                "required": False,
+                "description": "分析类型: fundamental/technical/all",
+            },
+        },
+    },
+    {
+        "name": "get_market_overview",
+        "description": "获取市场概览",
+        "params": {
+            "market": {
+                "type": "string",
+                "required": False,
+                "description": "市场类型: china/hk/us",
+            }
+        },
+    },
+    {
+        "name": "get_stock_news",
+        "description": "获取股票相关新闻",
+        "params": {
+            "symbol": {
+                "type": "string",
+                "required": True,
+                "description": "股票代码",
+            },
+            "days": {
+                "type": "integer",
+                "required": False,
+                "description": "天数",
+            },
+        },
+    },
+    {
+        "name": "get_market_sentiment",
+        "description": "获取市场情绪分析",
+        "params": {
+            "symbol": {
+                "type": "string",
+                "required": True,
+                "description": "股票代码",
+            }
+        },
+    },
+    {
+        "name": "refresh_cache",
+        "description": "刷新数据缓存",
+        "params": {
+            "market": {
+                "type": "string",
+                "required": False,
+                "description": "市场类型: china/hk/us/all",
+            }
+        },
+    },
+    {"name": "get_system_status", "description": "获取系统状态", "params": {}},
+)
+# 各方法响应缓存时间（秒），未列出的方法不缓存
+_RESPONSE_CACHE_TTL = {
+    "get_stock_quote": 1,
+    "get_market_overview": 3,
+    "get_system_status": 5,
+    "get_stock_news": 30,
+}
+# 命中响应缓存时需要刷新为本次请求时间的字段
+_RESPONSE_TS_FIELDS = ("timestamp", "system_time")
+
+_AVAILABLE_METHODS_JSON = json_utils.dumps(_AVAILABLE_METHODS)
+
+
+# 时间戳字符串缓存（100ms 精度），避免每次响应都格式化 datetime
+_TIMESTAMP_RESOLUTION = 0.1
+_ts_cache = {"t": 0.0, "s": ""}
+
+
+def _now_iso() -> str:
+    """返回当前时间的 ISO 字符串（100ms 内复用同一结果）"""
+    t = time.monotonic()
+    if t - _ts_cache["t"] > _TIMESTAMP_RESOLUTION:
+        _ts_cache["s"] = datetime.now().isoformat()
+        _ts_cache["t"] = t
+    return _ts_cache["s"]
+
+
+# 当前 RPC 请求的统一时间戳，由 handle_jsonrpc_request 设置
+_rpc_ts: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "rpc_ts", default=None
+)
+
+
+def _request_ts() -> str:
+    """返回当前请求的时间戳（未处于 RPC 上下文时取当前时间）"""
+    return _rpc_ts.get() or _now_iso()
+
+
+def _format_news_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """将新闻条目转换为响应格式（正文截断为200字）"""
+    content = item.get("content") or ""
+    return {
+        "title": item.get("title", ""),
+        "content": content if len(content) <= 200 else content[:200] + "...",
+        "source": item.get("source"),
+        "published_at": item.get("publish_time"),
+        "url": item.get("url"),
+    }
+
+
+def _change_stats(changes: np.ndarray) -> tuple:
+    """
+    涨跌统计：剔除 NaN 后一次 sign + bincount 得到涨/跌家数，并计算平均涨跌幅
+
+    Returns:
+        (上涨家数, 下跌家数, 平均涨跌幅)
+    """
+    valid = changes[~np.isnan(changes)]
+    if valid.size == 0:
+        return 0, 0, float("nan")
+    counts = np.bincount((np.sign(valid) + 1).astype(np.int8), minlength=3)
+    return int(counts[2]), int(counts[0]), float(valid.mean())
+
+
+# ==================== 参数校验 ====================
+
+_REQUIRED = object()
+# 参数中文名称（用于错误提示）
+_PARAM_LABELS = {"symbol": "股票代码", "symbols": "股票代码列表"}
+
+# 各方法参数规格：(参数名, 类型, 默认值或 _REQUIRED)
+_QUOTE_SPEC = (("symbol", str, _REQUIRED),)
+_QUOTES_SPEC = (("symbols", list, _REQUIRED),)
+_ANALYSIS_SPEC = (("symbol", str, _REQUIRED), ("type", str, "fundamental"))
+_OVERVIEW_SPEC = (("market", str, "china"),)
+_NEWS_SPEC = (("symbol", str, _REQUIRED), ("days", int, 7))
+_SENTIMENT_SPEC = (("symbol", str, _REQUIRED),)
+_REFRESH_SPEC = (("market", str, "all"),)
+# 缓存覆盖的市场
+_MARKETS = ("china", "hk", "us")
+
+
+def _extract(params: Optional[Dict[str, Any]], spec: tuple) -> tuple:
+    """
+    按规格一次性提取并校验参数
+
+    Args:
+        params: 请求参数
+        spec: 参数规格
+
+    Returns:
+        tuple: 按规格顺序排列的参数值
+
+    Raises:
+        ValueError: 缺少必填参数或类型不符
+    """
+    params = params or {}
+    values = []
+    for name, expected, default in spec:
+        value = params.get(name)
+        if value is None or value == "" or value == []:
+            if default is _REQUIRED:
+                raise ValueError(f"缺少{_PARAM_LABELS.get(name, name)}参数")
+            values.append(default)
+            continue
+        if not isinstance(value, expected):
+            if expected not in (str, int) or isinstance(value, (list, dict)):
+                raise ValueError(f"参数 {name} 类型错误，应为 {expected.__name__}")
+            try:
+                value = expected(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"参数 {name} 类型错误，应为 {expected.__name__}")
+        values.append(value)
+    return tuple(values)
+
+
+# 情绪词典：词条 -> 权重（正为利好，负为利空）
+_SENTIMENT_LEXICON = {
+    "上涨": 1.0,
+    "大涨": 1.5,
+    "涨停": 2.0,
+    "增长": 1.0,
+    "利好": 1.5,
+    "盈利": 1.0,
+    "超预期": 1.5,
+    "增持": 1.0,
+    "回购": 1.0,
+    "突破": 0.8,
+    "新高": 1.0,
+    "下跌": -1.0,
+    "大跌": -1.5,
+    "跌停": -2.0,
+    "下滑": -1.0,
+    "利空": -1.5,
+    "亏损": -1.5,
+    "不及预期": -1.5,
+    "减持": -1.0,
+    "违规": -1.5,
+    "处罚": -1.5,
+    "新低": -1.0,
+    "beat": 1.0,
+    "surge": 1.5,
+    "rally": 1.0,
+    "upgrade": 1.0,
+    "record high": 1.0,
+    "growth": 0.8,
+    "miss": -1.0,
+    "plunge": -1.5,
+    "downgrade": -1.0,
+    "lawsuit": -1.0,
+    "loss": -1.0,
+    "decline": -1.0,
+}
+
+
+def _lexicon_pattern(term: str) -> str:
+    """
+    生成单个词条的正则片段
+
+    英文词条要求前后不紧邻字母（允许 s/es/d/ed/ing 词尾），
+    避免 miss 命中 mission、beat 命中 beaten；中文词条按原样匹配
+    """
+    escaped = re.escape(term)
+    if not term.isascii():
+        return escaped
+    return rf"(?<![a-z]){escaped}(?=(?:s|es|d|ed|ing)?(?![a-z]))"
+
+
+# 所有词条编译为一个正则，一次扫描命中全部词条；零宽前瞻保证相互重叠的词条都能计数
+_SENTIMENT_RE = re.compile(
+    "(?=(" + "|".join(map(_lexicon_pattern, _SENTIMENT_LEXICON)) + "))",
+    re.IGNORECASE,
+)
+# 判定为利好/利空的平均得分阈值
+_SENTIMENT_THRESHOLD = 0.15
+
+
+def _score_docs(docs: List[str]) -> np.ndarray:
+    """
+    按情绪词典为每篇文本打分
+
+    每篇文本用预编译的 _SENTIMENT_RE 逐字符扫描一次（英文词条带词边界），
+    按命中词条查表累加权重，最后用 tanh 压缩到 (-1, 1)
+    """
+    weight = _SENTIMENT_LEXICON.__getitem__
+    raw = np.fromiter(
+        (
+            sum(map(weight, map(str.lower, _SENTIMENT_RE.findall(doc))))
+            for doc in docs
+        ),
+        dtype=np.float64,
+        count=len(docs),
+    )
+    return np.tanh(raw)
+
+
+# 各市场股票代码格式
+_CHINA_SYMBOL_RE = re.compile(r"\d{6}")
+_HK_SYMBOL_RE = re.compile(r"\d{5}")
+_US_SYMBOL_RE = re.compile(r"[A-Z][A-Z0-9.\-]{0,9}", re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def _classify_symbol(symbol: str) -> tuple:
+    """
+    判断股票所属市场
+
+    Returns:
+        (市场名称, market_cache 上对应的取数方法名)
+
+    Raises:
+        ValueError: 代码不符合任何市场格式
+    """
+    if _CHINA_SYMBOL_RE.fullmatch(symbol):
+        return "A股", "get_china_stock_data"
+    if _HK_SYMBOL_RE.fullmatch(symbol):
+        return "港股", "get_hk_stock_data"
+    if _US_SYMBOL_RE.fullmatch(symbol):
+        return "美股", "get_us_stock_data"
+    raise ValueError(f"无效股票代码: {symbol}")
+
 
 class MessageService:
     """消息处理服务"""
@@ -24,14 +353,14 @@ class MessageService:
             self.akshare_service = AkshareService()
             logger.info("✅ AkShare服务已初始化")
         except Exception as e:
-            logger.error(f"❌ AkShare服务初始化失败: {e}")
+            logger.error("❌ AkShare服务初始化失败: %s", e)
             self.akshare_service = None
 
         try:
             self.fundamentals_service = FundamentalsService()
             logger.info("✅ 基本面服务已初始化")
         except Exception as e:
-            logger.error(f"❌ 基本面服务初始化失败: {e}")
+            logger.error("❌ 基本面服务初始化失败: %s", e)
             self.fundamentals_service = None
 
         try:
@@ -43,9 +372,27 @@ class MessageService:
             self.news_service = get_news_service(use_proxy=use_proxy)
             logger.info("✅ 新闻服务已初始化")
         except Exception as e:
-            logger.error(f"❌ 新闻服务初始化失败: {e}")
+            logger.error("❌ 新闻服务初始化失败: %s", e)
             self.news_service = None
 
+        # JSON-RPC 方法路由表
+        self._dispatch = {
+            "get_stock_quote": self._handle_stock_quote,
+            "get_stock_quotes": self._handle_stock_quotes,
+            "get_stock_analysis": self._handle_stock_analysis,
+            "get_market_overview": self._handle_market_overview,
+            "get_stock_news": self._handle_stock_news,
+            "get_market_sentiment": self._handle_market_sentiment,
+            "refresh_cache": self._handle_refresh_cache,
+            "get_system_status": self._handle_system_status,
+        }
+        # 情绪分析结果缓存 (symbol, 日期) -> 结果
+        self._sentiment_cache = TTLCache(maxsize=512, ttl=600)
+        # 进行中的请求（单飞合并），key -> Future
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # 短时响应缓存，吸收仪表盘等高频重复请求
+        self._response_cache = TTLCache(maxsize=1024, ttl=5)
+
     async def handle_jsonrpc_request(
         self, method: str, params: Dict[str, Any], request_id: Optional[str] = None
     ) -> Any:
@@ -60,53 +407,101 @@ class MessageService:
         Returns:
             处理结果
         """
-        logger.info(f"处理JSON-RPC请求: {method}")
+        logger.info("处理JSON-RPC请求: %s", method)
+        token = _rpc_ts.set(_now_iso())
 
         try:
             # 根据方法名路由到对应的处理函数
-            if method == "get_stock_quote":
-                return await self._handle_stock_quote(params)
-            elif method == "get_stock_analysis":
-                return await self._handle_stock_analysis(params)
-            elif method == "get_market_overview":
-                return await self._handle_market_overview(params)
-            elif method == "get_stock_news":
-                return await self._handle_stock_news(params)
-            elif method == "get_market_sentiment":
-                return await self._handle_market_sentiment(params)
-            elif method == "refresh_cache":
-                return await self._handle_refresh_cache(params)
-            elif method == "get_system_status":
-                return await self._handle_system_status(params)
-            else:
+            handler = self._dispatch.get(method)
+            if handler is None:
                 raise ValueError(f"未知的方法: {method}")
 
+            ttl = _RESPONSE_CACHE_TTL.get(method)
+            if ttl is None:
+                return await handler(params)
+
+            try:
+                cache_key = (method, tuple(sorted((params or {}).items())))
+                hash(cache_key)
+            except TypeError:
+                # 参数不可哈希（如列表），不走缓存
+                return await handler(params)
+
+            # 缓存序列化后的字节，命中与未命中都返回反序列化出的新对象：
+            # 两条路径的返回类型一致，调用方修改也不会污染缓存
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                result = json_utils.loads(cached)
+                if isinstance(result, dict):
+                    for field in _RESPONSE_TS_FIELDS:
+                        if field in result:
+                            result[field] = _request_ts()
+                return result
+
+            result = await handler(params)
+            try:
+                encoded = json_utils.dumps(result)
+            except (TypeError, ValueError, OverflowError) as e:
+                # 结果无法序列化时不缓存，直接返回原始结果
+                logger.warning("响应无法序列化，跳过缓存 %s: %s", method, e)
+                return result
+
+            self._response_cache.set(cache_key, encoded, ttl=ttl)
+            return json_utils.loads(encoded)
+
         except Exception as e:
-            logger.error(f"处理JSON-RPC请求失败 {method}: {e}")
+            logger.error("处理JSON-RPC请求失败 %s: %s", method, e)
+            raise
+        finally:
+            _rpc_ts.reset(token)
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        """在线程池中执行阻塞调用"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _RPC_EXECUTOR, partial(func, *args, **kwargs)
+        )
+
+    async def _singleflight(self, key: str, coro_factory):
+        """
+        合并并发的相同请求：首个调用者执行，其余调用者等待同一结果
+
+        Args:
+            key: 请求标识
+            coro_factory: 返回协程的无参函数
+        """
+        fut = self._inflight.get(key)
+        if fut is not None:
+            return await asyncio.shield(fut)
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            result = await coro_factory()
+            fut.set_result(result)
+            return result
+        except BaseException as e:
+            fut.set_exception(e)
+            # 标记异常已被获取，避免无等待者时的告警
+            fut.exception()
             raise
+        finally:
+            self._inflight.pop(key, None)
 
     async def _handle_stock_quote(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理股票行情请求"""
-        symbol = params.get("symbol")
-        if not symbol:
-            raise ValueError("缺少股票代码参数")
+        (symbol,) = _extract(params, _QUOTE_SPEC)
+
+        # 先校验代码格式，无效代码不进入缓存层
+        market, attr = _classify_symbol(symbol)
 
         if not self.akshare_service:
             raise RuntimeError("AkShare服务不可用")
 
-        # 判断市场类型并获取数据
-        if len(symbol) == 6 and symbol.isdigit():
-            # A股
-            data = self.akshare_service.market_cache.get_china_stock_data(symbol)
-            market = "A股"
-        elif len(symbol) == 5 and symbol.isdigit():
-            # 港股
-            data = self.akshare_service.market_cache.get_hk_stock_data(symbol)
-            market = "港股"
-        else:
-            # 美股
-            data = self.akshare_service.market_cache.get_us_stock_data(symbol)
-            market = "美股"
+        # 获取数据
+        data = await self._run_blocking(
+            getattr(self.akshare_service.market_cache, attr), symbol
+        )
 
         if not data:
             raise ValueError(f"未找到股票 {symbol} 的行情数据")
@@ -115,78 +510,125 @@ class MessageService:
             "symbol": symbol,
             "market": market,
             "quote": data,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _request_ts(),
         }
 
-    async def _handle_stock_analysis(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """处理股票分析请求"""
-        symbol = params.get("symbol")
-        analysis_type = params.get("type", "fundamental")
+    async def _handle_stock_quotes(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """处理批量股票行情请求"""
+        (symbols,) = _extract(params, _QUOTES_SPEC)
+        if len(symbols) > _MAX_BATCH_SYMBOLS:
+            raise ValueError(f"股票代码数量超过上限 {_MAX_BATCH_SYMBOLS}")
 
-        if not symbol:
-            raise ValueError("缺少股票代码参数")
+        semaphore = asyncio.Semaphore(_BATCH_CONCURRENCY)
 
-        result = {}
+        async def _bounded(symbol: str):
+            async with semaphore:
+                return await self._handle_stock_quote({"symbol": symbol})
 
-        if analysis_type in ["fundamental", "all"]:
-            if self.fundamentals_service:
-                try:
-                    fundamental_data = self.fundamentals_service.get_fundamental_data(symbol)
-                    if fundamental_data:
-                        basic_info = fundamental_data.get("basic_info", {})
-                        ratios = self.fundamentals_service.calculate_financial_ratios(fundamental_data)
-                        result["fundamental"] = {
-                            "pe_ratio": ratios.get("pe_ratio"),
-                            "pb_ratio": ratios.get("pb_ratio"),
-                            "roe": ratios.get("roe"),
-                            "market_cap": basic_info.get("market_cap") or basic_info.get("marketCap"),
-                            "eps": ratios.get("eps"),
-                            "source": fundamental_data.get("source"),
-                        }
-                except Exception as e:
-                    logger.warning(f"获取基本面数据失败: {e}")
-                    result["fundamental"] = {"error": str(e)}
+        outcomes = await asyncio.gather(
+            *[_bounded(symbol) for symbol in symbols], return_exceptions=True
+        )
+
+        quotes = []
+        for symbol, outcome in zip(symbols, outcomes):
+            if isinstance(outcome, Exception):
+                quotes.append({"symbol": symbol, "error": str(outcome)})
+            else:
+                quotes.append(outcome)
+
+        return {
+            "count": len(quotes),
+            "success_count": sum(1 for q in quotes if "error" not in q),
+            "quotes": quotes,
+            "timestamp": _request_ts(),
+        }
 
+    async def _handle_stock_analysis(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """处理股票分析请求"""
+        symbol, analysis_type = _extract(params, _ANALYSIS_SPEC)
+
+        # 按分析类型构建协程并并发执行，单个分支失败不影响其他分支
+        branches = {}
+        if analysis_type in ["fundamental", "all"] and self.fundamentals_service:
+            branches["fundamental"] = self._run_blocking(
+                self._fundamental_analysis, symbol
+            )
         if analysis_type in ["technical", "all"]:
-            # 技术分析可以在这里扩展
-            result["technical"] = {"message": "技术分析功能开发中"}
+            branches["technical"] = self._technical_analysis(symbol)
+
+        outcomes = await asyncio.gather(*branches.values(), return_exceptions=True)
+
+        result = {}
+        for name, outcome in zip(branches, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning("获取%s分析数据失败: %s", name, outcome)
+                result[name] = {"error": str(outcome)}
+            elif outcome is not None:
+                result[name] = outcome
 
         return {
             "symbol": symbol,
             "analysis_type": analysis_type,
             "analysis": result,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _request_ts(),
+        }
+
+    def _fundamental_analysis(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """基本面分析（阻塞调用，在线程中执行）"""
+        fundamental_data = self.fundamentals_service.get_fundamental_data(symbol)
+        if not fundamental_data:
+            return None
+
+        basic_info = fundamental_data.get("basic_info", {})
+        ratios = self.fundamentals_service.calculate_financial_ratios(fundamental_data)
+        return {
+            "pe_ratio": ratios.get("pe_ratio"),
+            "pb_ratio": ratios.get("pb_ratio"),
+            "roe": ratios.get("roe"),
+            "market_cap": basic_info.get("market_cap") or basic_info.get("marketCap"),
+            "eps": ratios.get("eps"),
+            "source": fundamental_data.get("source"),
         }
 
+    async def _technical_analysis(self, symbol: str) -> Dict[str, Any]:
+        """技术分析（可以在这里扩展）"""
+        return {"message": "技术分析功能开发中"}
+
     async def _handle_market_overview(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理市场概览请求"""
-        market = params.get("market", "china")
+        (market,) = _extract(params, _OVERVIEW_SPEC)
 
         if not self.akshare_service:
             raise RuntimeError("AkShare服务不可用")
 
         if market == "china":
-            market_data = self.akshare_service.market_cache.get_china_market_data()
+            fetch = self.akshare_service.market_cache.get_china_market_data
             market_name = "A股"
         elif market == "hk":
-            market_data = self.akshare_service.market_cache.get_hk_market_data()
+            fetch = self.akshare_service.market_cache.get_hk_market_data
             market_name = "港股"
         elif market == "us":
-            market_data = self.akshare_service.market_cache.get_us_market_data()
+            fetch = self.akshare_service.market_cache.get_us_market_data
             market_name = "美股"
         else:
             raise ValueError("不支持的市场类型")
 
-        if market_data is None or market_data.empty:
+        market_data = await self._singleflight(
+            f"get_market_overview:{market}", lambda: self._run_blocking(fetch)
+        )
+
+        total_stocks = 0 if market_data is None else len(market_data)
+        if not total_stocks:
             raise ValueError(f"无法获取{market_name}市场数据")
 
         # 计算市场统计
-        total_stocks = len(market_data)
         stats = {"total_stocks": total_stocks}
 
-        if "涨跌幅" in market_data.columns:
-            rising = len(market_data[market_data["涨跌幅"] > 0])
-            falling = len(market_data[market_data["涨跌幅"] < 0])
+        columns = market_data.columns
+        if "涨跌幅" in columns:
+            # 直接在 ndarray 上统计，避免构造过滤后的 DataFrame
+            changes = market_data["涨跌幅"].to_numpy(dtype=np.float64, na_value=np.nan)
+            rising, falling, avg_change = _change_stats(changes)
             unchanged = total_stocks - rising - falling
 
             stats.update(
@@ -194,31 +636,30 @@ class MessageService:
                     "rising": rising,
                     "falling": falling,
                     "unchanged": unchanged,
-                    "avg_change": float(market_data["涨跌幅"].mean()),
+                    "avg_change": avg_change,
                 }
             )
 
         return {
             "market": market_name,
             "stats": stats,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _request_ts(),
         }
 
     async def _handle_stock_news(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理股票新闻请求"""
-        symbol = params.get("symbol")
-        days = params.get("days", 7)
-
-        if not symbol:
-            raise ValueError("缺少股票代码参数")
+        symbol, days = _extract(params, _NEWS_SPEC)
 
         if not self.news_service:
             raise RuntimeError("新闻服务不可用")
 
         try:
             # 使用多数据源新闻服务，按天数回溯获取新闻
-            result = self.news_service.get_news_for_date(
-                symbol, target_date=None, days_before=int(days)
+            result = await self._run_blocking(
+                self.news_service.get_news_for_date,
+                symbol,
+                target_date=None,
+                days_before=days,
             )
 
             if not result.get("success", True):
@@ -227,68 +668,101 @@ class MessageService:
             raw_news = result.get("news", [])
 
             # 转换为序列化友好的格式（最多返回20条）
-            news_list = []
-            for item in raw_news[:20]:
-                title = item.get("title", "")
-                content = item.get("content", "")
-                news_list.append(
-                    {
-                        "title": title,
-                        "content": content[:200] + ("..." if len(content) > 200 else ""),
-                        "source": item.get("source"),
-                        "published_at": item.get("publish_time"),
-                        "url": item.get("url"),
-                    }
-                )
+            news_list = [_format_news_item(item) for item in raw_news[:20]]
 
             return {
                 "symbol": symbol,
                 "days": days,
                 "news_count": len(news_list),
                 "news": news_list,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _request_ts(),
             }
 
         except Exception as e:
-            logger.error(f"获取股票新闻失败: {e}")
+            logger.error("获取股票新闻失败: %s", e)
             raise RuntimeError(f"获取新闻失败: {str(e)}")
 
     async def _handle_market_sentiment(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理市场情绪分析请求"""
-        symbol = params.get("symbol")
-
-        if not symbol:
-            raise ValueError("缺少股票代码参数")
+        (symbol,) = _extract(params, _SENTIMENT_SPEC)
 
         if not self.news_service:
             raise RuntimeError("新闻服务不可用")
 
         try:
-            # 获取情绪分析（这里可以扩展更复杂的情绪分析逻辑）
+            cache_key = (symbol, datetime.now().strftime("%Y-%m-%d"))
+            cached = self._sentiment_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            # 基于近3日新闻标题与摘要做词典情绪打分
+            result = await self._run_blocking(
+                self.news_service.get_news_for_date,
+                symbol,
+                target_date=None,
+                days_before=3,
+            )
+            news = result.get("news", []) if result.get("success", True) else []
+            docs = [
+                f"{item.get('title', '')} {item.get('content', '')}" for item in news
+            ]
+
+            if docs:
+                scores = _score_docs(docs)
+                overall = float(scores.mean())
+                positive = int(np.count_nonzero(scores > _SENTIMENT_THRESHOLD))
+                negative = int(np.count_nonzero(scores < -_SENTIMENT_THRESHOLD))
+            else:
+                overall, positive, negative = 0.0, 0, 0
+
+            if overall > _SENTIMENT_THRESHOLD:
+                label = "positive"
+            elif overall < -_SENTIMENT_THRESHOLD:
+                label = "negative"
+            else:
+                label = "neutral"
+
+            # 样本越多、方向越一致，置信度越高
+            neutral = len(docs) - positive - negative
+            agreeing = {"positive": positive, "negative": negative}.get(label, neutral)
+            confidence = 0.0
+            if docs:
+                agreement = agreeing / len(docs)
+                coverage = min(1.0, len(docs) / 10)
+                confidence = round((0.5 + 0.5 * agreement) * coverage, 2)
+
             sentiment = {
                 "symbol": symbol,
-                "overall_sentiment": "neutral",  # 默认中性
-                "confidence": 0.6,
-                "analysis_time": datetime.now().isoformat(),
-                "note": "基础情绪分析，可扩展更多指标",
+                "overall_sentiment": label,
+                "score": round(overall, 4),
+                "confidence": confidence,
+                "news_count": len(docs),
+                "distribution": {
+                    "positive": positive,
+                    "negative": negative,
+                    "neutral": neutral,
+                },
+                "analysis_time": _request_ts(),
             }
-
+            self._sentiment_cache.set(cache_key, sentiment)
             return sentiment
 
         except Exception as e:
-            logger.error(f"市场情绪分析失败: {e}")
+            logger.error("市场情绪分析失败: %s", e)
             raise RuntimeError(f"情绪分析失败: {str(e)}")
 
     async def _handle_refresh_cache(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理缓存刷新请求"""
-        market = params.get("market", "all")
+        (market,) = _extract(params, _REFRESH_SPEC)
 
         if not self.akshare_service:
             raise RuntimeError("AkShare服务不可用")
 
         try:
             if market == "all":
-                results = self.akshare_service.market_cache.force_refresh()
+                results = await self._singleflight(
+                    "refresh_cache:all", self._refresh_all_markets
+                )
                 success_count = sum(1 for df in results.values() if df is not None)
 
                 return {
@@ -298,23 +772,47 @@ class MessageService:
                     "results": {
                         k: len(v) if v is not None else 0 for k, v in results.items()
                     },
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": _request_ts(),
                 }
             else:
-                results = self.akshare_service.market_cache.force_refresh(market)
+                results = await self._singleflight(
+                    f"refresh_cache:{market}",
+                    lambda: self._run_blocking(
+                        self.akshare_service.market_cache.force_refresh, market
+                    ),
+                )
                 df = results.get(market)
 
                 return {
                     "action": f"refresh_{market}_market",
                     "success": df is not None,
                     "records": len(df) if df is not None else 0,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": _request_ts(),
                 }
 
         except Exception as e:
-            logger.error(f"刷新缓存失败: {e}")
+            logger.error("刷新缓存失败: %s", e)
             raise RuntimeError(f"缓存刷新失败: {str(e)}")
 
+    async def _refresh_all_markets(self) -> Dict[str, Any]:
+        """并发刷新三个市场的缓存（总耗时取决于最慢的市场）"""
+        outcomes = await asyncio.gather(
+            *[
+                self._run_blocking(self.akshare_service.market_cache.force_refresh, m)
+                for m in _MARKETS
+            ],
+            return_exceptions=True,
+        )
+
+        results = {}
+        for market, outcome in zip(_MARKETS, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning("刷新%s市场缓存失败: %s", market, outcome)
+                results[market] = None
+            else:
+                results[market] = outcome.get(market)
+        return results
+
     async def _handle_system_status(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """处理系统状态请求"""
         status = {
@@ -323,17 +821,25 @@ class MessageService:
                 "fundamentals": self.fundamentals_service is not None,
                 "news": self.news_service is not None,
             },
-            "system_time": datetime.now().isoformat(),
+            "system_time": _request_ts(),
             "uptime": "运行中",
         }
 
-        # 获取缓存状态
+        # 获取缓存状态：各市场的 Redis 探测互不依赖，并发执行
         if self.akshare_service:
-            try:
-                cache_info = self.akshare_service.market_cache.get_cache_info()
-                status["cache"] = cache_info
-            except Exception as e:
-                status["cache"] = {"error": str(e)}
+            get_cache_info = self.akshare_service.market_cache.get_cache_info
+            outcomes = await asyncio.gather(
+                *(self._run_blocking(get_cache_info, market) for market in _MARKETS),
+                return_exceptions=True,
+            )
+            status["cache"] = {
+                market: (
+                    {"error": str(outcome)}
+                    if isinstance(outcome, Exception)
+                    else outcome
+                )
+                for market, outcome in zip(_MARKETS, outcomes)
+            }
 
         return status
 
@@ -358,84 +864,8 @@ class MessageService:
 
     async def get_available_methods(self) -> List[Dict[str, Any]]:
         """获取可用的方法列表"""
-        methods = [
-            {
-                "name": "get_stock_quote",
-                "description": "获取股票实时行情",
-                "params": {
-                    "symbol": {
-                        "type": "string",
-                        "required": True,
-                        "description": "股票代码",
-                    }
-                },
-            },
-            {
-                "name": "get_stock_analysis",
-                "description": "获取股票分析",
-                "params": {
-                    "symbol": {
-                        "type": "string",
-                        "required": True,
-                        "description": "股票代码",
-                    },
-                    "type": {
-                        "type": "string",
-                        "required": False,
-                        "description": "分析类型: fundamental/technical/all",
-                    },
-                },
-            },
-            {
-                "name": "get_market_overview",
-                "description": "获取市场概览",
-                "params": {
-                    "market": {
-                        "type": "string",
-                        "required": False,
-                        "description": "市场类型: china/hk/us",
-                    }
-                },
-            },
-            {
-                "name": "get_stock_news",
-                "description": "获取股票相关新闻",
-                "params": {
-                    "symbol": {
-                        "type": "string",
-                        "required": True,
-                        "description": "股票代码",
-                    },
-                    "days": {
-                        "type": "integer",
-                        "required": False,
-                        "description": "天数",
-                    },
-                },
-            },
-            {
-                "name": "get_market_sentiment",
-                "description": "获取市场情绪分析",
-                "params": {
-                    "symbol": {
-                        "type": "string",
-                        "required": True,
-                        "description": "股票代码",
-                    }
-                },
-            },
-            {
-                "name": "refresh_cache",
-                "description": "刷新数据缓存",
-                "params": {
-                    "market": {
-                        "type": "string",
-                        "required": False,
-                        "description": "市场类型: china/hk/us/all",
-                    }
-                },
-            },
-            {"name": "get_system_status", "description": "获取系统状态", "params": {}},
-        ]
+        return list(_AVAILABLE_METHODS)
 
-        return methods
+    def get_available_methods_json_bytes(self) -> bytes:
+        """获取可用方法列表的预编码 JSON（供传输层直接输出）"""
+        return _AVAILABLE_METHODS_JSON
@@ -16,15 +16,24 @@
 - 统一的数据返回格式
 """
 
+import asyncio
+import heapq
 import os
+import re
+from collections import Counter, defaultdict
+from operator import attrgetter
 import requests
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 import sys
+import threading
+import time
 from pathlib import Path
 
 # 添加项目根目录到路径
@@ -32,6 +41,11 @@ project_root = Path(__file__).resolve().parents[3]
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 # 导入配置
 from src.config.settings import get_settings
 
@@ -40,13 +54,93 @@ from src.server.services.akshare_service import AkshareService
 
 # 导入工具
 from src.server.utils.symbol_processor import get_symbol_processor
+from src.server.utils.ttl_cache import TTLCache
+from src.server.utils.redis_cache import get_redis_cache
+from src.server.utils import json_utils
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("new_service")
 
+_publish_time = attrgetter("publish_time")
+_BANNER = "=" * 80
+
+# 单个数据源的新闻缓存：已发布新闻基本不变，短时间内重复查询直接命中内存
+NEWS_CACHE_MAXSIZE = 256
+NEWS_CACHE_TTL = 600
+
+# Redis 共享缓存：新鲜期由各数据源的 shared_cache_ttl 决定，
+# 过期后再保留 NEWS_STALE_TTL 秒，上游失败时作为兜底数据返回
+NEWS_STALE_TTL = 3600
+
+# HTTP 数据源的公共请求头：声明只接受 JSON，并显式协商压缩传输
+# (requests/httpx 会自动解压 gzip/deflate；br 需安装 brotli，这里不强制依赖)
+HTTP_NEWS_HEADERS = {
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+# ETag / Last-Modified 校验信息的保留时间，过期后重新完整请求
+NEWS_VALIDATOR_TTL = 3600
+
+# 近似重复标题：归一化标题的 5 字符 shingle 集合 Jaccard 相似度达到阈值即视为同一条新闻
+NEAR_DUP_SHINGLE_SIZE = 5
+NEAR_DUP_THRESHOLD = 0.8
+# 同一天已保留的新闻不超过该数量时逐条比较，超过后按最小的几个 shingle 哈希分桶取候选
+NEAR_DUP_LINEAR_LIMIT = 32
+NEAR_DUP_BUCKET_HASHES = 4
+
+_TITLE_STRIP_RE = re.compile(r"[\W_]+")
+
+
+def _title_shingles(title: str) -> frozenset:
+    """标题归一化（小写、去掉标点与空白）后切分为字符 shingle 的哈希集合"""
+    normalized = _TITLE_STRIP_RE.sub("", title.lower())
+    size = NEAR_DUP_SHINGLE_SIZE
+    if len(normalized) <= size:
+        return frozenset((hash(normalized),))
+    return frozenset(
+        hash(normalized[i : i + size]) for i in range(len(normalized) - size + 1)
+    )
+
+
+class _NearDupIndex:
+    """近似重复标题索引：少量条目线性比较，条目多时用最小哈希分桶缩小候选范围"""
 
-@dataclass
+    __slots__ = ("_kept", "_buckets")
+
+    def __init__(self):
+        self._kept: List[frozenset] = []
+        self._buckets: Dict[int, List[int]] = defaultdict(list)
+
+    def add_if_new(self, shingles: frozenset) -> bool:
+        """与已保留标题都不近似时加入索引并返回 True，否则返回 False"""
+        anchors = heapq.nsmallest(NEAR_DUP_BUCKET_HASHES, shingles)
+        if len(self._kept) <= NEAR_DUP_LINEAR_LIMIT:
+            candidates = self._kept
+        else:
+            # 相似度 ≥ 阈值的两个集合，最小的几个哈希几乎必然有交集
+            indexes = {i for h in anchors for i in self._buckets.get(h, ())}
+            candidates = [self._kept[i] for i in indexes]
+
+        size = len(shingles)
+        for other in candidates:
+            other_size = len(other)
+            # 集合大小相差过大时 Jaccard 不可能达到阈值，跳过求交集
+            if min(size, other_size) < NEAR_DUP_THRESHOLD * max(size, other_size):
+                continue
+            common = len(shingles & other)
+            if common >= NEAR_DUP_THRESHOLD * (size + other_size - common):
+                return False
+
+        position = len(self._kept)
+        self._kept.append(shingles)
+        for h in anchors:
+            self._buckets[h].append(position)
+        return True
+
+
+@dataclass(slots=True)
 class NewsArticle:
     """统一的新闻文章数据结构"""
 
@@ -60,17 +154,58 @@ class NewsArticle:
     sentiment: str = "neutral"  # positive, negative, neutral
 
     def to_dict(self) -> Dict:
-        """转换为字典格式"""
-        return asdict(self)
+        """转换为字典格式（字段均为标量，无需 asdict 的递归拷贝）"""
+        return {
+            "title": self.title,
+            "content": self.content,
+            "source": self.source,
+            "publish_time": self.publish_time,
+            "url": self.url,
+            "symbol": self.symbol,
+            "relevance_score": self.relevance_score,
+            "sentiment": self.sentiment,
+        }
+
+
+# 各数据源使用的股票代码格式（对应 symbol_processor 的 formats 键）
+SOURCE_FORMAT_KEY = {
+    "finnhub": "yfinance",  # FinnHub使用类似yfinance格式
+    "alphavantage": "yfinance",
+    "newsapi": "news_api",
+    "eastmoney": "akshare",
+}
 
 
 class NewsDataSource:
     """新闻数据源基类"""
 
+    # Redis 缓存的新鲜期（秒），子类按数据更新频率覆盖
+    shared_cache_ttl = 120
+
     def __init__(self, name: str, enabled: bool = True):
         self.name = name
         self.enabled = enabled
         self.settings = get_settings()
+        self.session = self._create_session()
+        self._cache = TTLCache(NEWS_CACHE_MAXSIZE, NEWS_CACHE_TTL)
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """创建带连接池和重试的 HTTP 会话，复用 keep-alive 连接"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET"],
+            ),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
 
     def is_available(self) -> bool:
         """检查数据源是否可用"""
@@ -82,30 +217,270 @@ class NewsDataSource:
         """获取新闻数据 - 子类实现"""
         raise NotImplementedError
 
+    async def afetch_news(
+        self,
+        client: Optional["httpx.AsyncClient"],
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> List[NewsArticle]:
+        """异步获取新闻数据，默认在线程中执行同步实现"""
+        return await asyncio.to_thread(self.fetch_news, symbol, start_date, end_date)
+
+    def _cache_key(self, symbol: str, start_date: datetime, end_date: datetime):
+        return (self.name, symbol, start_date.date(), end_date.date())
+
+    @property
+    def _memory_ttl(self) -> float:
+        """进程内缓存不超过数据源的新鲜期"""
+        return min(NEWS_CACHE_TTL, self.shared_cache_ttl)
+
+    def _load_shared(self, key) -> Tuple[Optional[List], Optional[List]]:
+        """从 Redis 读取缓存，返回 (新鲜数据, 过期兜底数据)"""
+        redis_cache = get_redis_cache()
+        if not redis_cache.connected:
+            return None, None
+
+        entry = redis_cache.get_news_data(":".join(map(str, key)))
+        if not entry:
+            return None, None
+
+        news_list = [NewsArticle(**item) for item in entry["data"]]
+        if time.time() - entry["cached_at"] <= self.shared_cache_ttl:
+            return news_list, None
+        return None, news_list
+
+    def _store_shared(self, key, news_list: List[NewsArticle]):
+        """写入 Redis 缓存"""
+        redis_cache = get_redis_cache()
+        if redis_cache.connected:
+            redis_cache.set_news_data(
+                ":".join(map(str, key)),
+                [news.to_dict() for news in news_list],
+                expire_seconds=self.shared_cache_ttl + NEWS_STALE_TTL,
+            )
 
-class FinnHubNewsSource(NewsDataSource):
-    """FinnHub 新闻数据源"""
+    def _fallback(self, symbol: str, news_list: List, stale: Optional[List]):
+        """上游未返回数据时使用过期缓存兜底"""
+        if not news_list and stale:
+            logger.warning(f"[{self.name}] 上游无数据，使用过期缓存: {symbol}")
+            return stale
+        return news_list
 
-    def __init__(self):
-        super().__init__("FinnHub")
-        self.api_key = os.getenv("FINNHUB_API_KEY", "")
-        self.enabled = bool(self.api_key)
+    def get_news_cached(
+        self, symbol: str, start_date: datetime, end_date: datetime
+    ) -> List[NewsArticle]:
+        """
+        带缓存的 fetch_news：进程内 TTL 缓存 -> Redis 共享缓存 -> 上游请求
+
+        仅缓存非空结果；上游失败时返回 Redis 中的过期数据
+        """
+        key = self._cache_key(symbol, start_date, end_date)
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.info(f"[{self.name}] 命中缓存: {symbol}")
+            return list(cached)
+
+        fresh, stale = self._load_shared(key)
+        if fresh is not None:
+            logger.info(f"[{self.name}] 命中Redis缓存: {symbol}")
+            self._cache.set(key, fresh, ttl=self._memory_ttl)
+            return list(fresh)
+
+        news_list = self.fetch_news(symbol, start_date, end_date)
+        if news_list:
+            self._cache.set(key, news_list, ttl=self._memory_ttl)
+            self._store_shared(key, news_list)
+        return self._fallback(symbol, news_list, stale)
+
+    async def aget_news_cached(
+        self,
+        client: Optional["httpx.AsyncClient"],
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> List[NewsArticle]:
+        """get_news_cached 的异步版本，Redis 读写在线程中执行"""
+        key = self._cache_key(symbol, start_date, end_date)
+        cached = self._cache.get(key)
+        if cached is not None:
+            logger.info(f"[{self.name}] 命中缓存: {symbol}")
+            return list(cached)
+
+        fresh, stale = await asyncio.to_thread(self._load_shared, key)
+        if fresh is not None:
+            logger.info(f"[{self.name}] 命中Redis缓存: {symbol}")
+            self._cache.set(key, fresh, ttl=self._memory_ttl)
+            return list(fresh)
+
+        news_list = await self.afetch_news(client, symbol, start_date, end_date)
+        if news_list:
+            self._cache.set(key, news_list, ttl=self._memory_ttl)
+            await asyncio.to_thread(self._store_shared, key, news_list)
+        return self._fallback(symbol, news_list, stale)
 
-    def is_available(self) -> bool:
-        return self.enabled and bool(self.api_key)
+
+class HTTPNewsSource(NewsDataSource):
+    """基于 HTTP API 的新闻数据源：请求构造与响应解析分离，同步/异步共用"""
+
+    proxies: Optional[Dict[str, str]] = None
+
+    def __init__(self, name: str, enabled: bool = True):
+        super().__init__(name, enabled)
+        self.session.headers.update(HTTP_NEWS_HEADERS)
+        # (symbol, start, end) -> (etag, last_modified, news_list)
+        self._validators = TTLCache(NEWS_CACHE_MAXSIZE, NEWS_VALIDATOR_TTL)
+
+    def _conditional_headers(self, key) -> Dict[str, str]:
+        """根据上次响应的 ETag / Last-Modified 构造条件请求头"""
+        entry = self._validators.get(key)
+        if entry is None:
+            return {}
+
+        etag, last_modified, _ = entry
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def _handle_response(
+        self, key, response, symbol: str, start_date: datetime, end_date: datetime
+    ) -> List[NewsArticle]:
+        """处理 requests / httpx 响应：304 复用上次结果，200 解析并记录校验信息"""
+        if response.status_code == 304:
+            entry = self._validators.get(key)
+            if entry is not None:
+                logger.info(f"[{self.name}] 内容未变化(304): {symbol}")
+                return list(entry[2])
+
+        data = (
+            json_utils.loads(response.content)
+            if response.status_code == 200
+            else None
+        )
+        news_list = self._parse_response(
+            response.status_code, data, symbol, start_date, end_date
+        )
+
+        if response.status_code == 200:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self._validators.set(key, (etag, last_modified, news_list))
+        return news_list
+
+    def _build_request(
+        self, symbol: str, start_date: datetime, end_date: datetime
+    ) -> Tuple[str, Dict]:
+        """返回 (url, params) - 子类实现"""
+        raise NotImplementedError
+
+    def _parse_response(
+        self,
+        status_code: int,
+        data: Optional[Dict],
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> List[NewsArticle]:
+        """解析响应 - 子类实现"""
+        raise NotImplementedError
+
+    def _log_dropped(self, dropped: int):
+        """批量记录被丢弃的格式异常新闻条数"""
+        if dropped:
+            logger.warning(f"[{self.name}] 丢弃 {dropped} 条格式异常的新闻")
+
+    def _prepare(
+        self, symbol: str, start_date: datetime, end_date: datetime
+    ) -> Tuple[datetime, datetime]:
+        """请求前调整查询范围，默认不变"""
+        return start_date, end_date
 
     def fetch_news(
         self, symbol: str, start_date: datetime, end_date: datetime
     ) -> List[NewsArticle]:
-        """从 FinnHub 获取新闻"""
         if not self.is_available():
             logger.warning(f"[{self.name}] API密钥未配置，跳过")
             return []
 
+        start_date, end_date = self._prepare(symbol, start_date, end_date)
+        logger.info(
+            f"[{self.name}] 获取 {symbol} 的新闻: {start_date.date()} 到 {end_date.date()}"
+        )
+        url, params = self._build_request(symbol, start_date, end_date)
+        key = (symbol, start_date.date(), end_date.date())
+
+        try:
+            response = self.session.get(
+                url,
+                params=params,
+                headers=self._conditional_headers(key),
+                proxies=self.proxies,
+                timeout=10,
+            )
+            return self._handle_response(
+                key, response, symbol, start_date, end_date
+            )
+        except Exception as e:
+            logger.error(f"[{self.name}] 请求异常: {e}")
+            return []
+
+    async def afetch_news(
+        self,
+        client: Optional["httpx.AsyncClient"],
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> List[NewsArticle]:
+        # 无异步客户端或需要代理时走同步会话
+        if client is None or self.proxies:
+            return await super().afetch_news(client, symbol, start_date, end_date)
+
+        if not self.is_available():
+            logger.warning(f"[{self.name}] API密钥未配置，跳过")
+            return []
+
+        start_date, end_date = self._prepare(symbol, start_date, end_date)
         logger.info(
             f"[{self.name}] 获取 {symbol} 的新闻: {start_date.date()} 到 {end_date.date()}"
         )
+        url, params = self._build_request(symbol, start_date, end_date)
+        key = (symbol, start_date.date(), end_date.date())
+
+        try:
+            response = await client.get(
+                url,
+                params=params,
+                headers=self._conditional_headers(key),
+                timeout=10,
+            )
+            return self._handle_response(
+                key, response, symbol, start_date, end_date
+            )
+        except Exception as e:
+            logger.error(f"[{self.name}] 请求异常: {e}")
+            return []
+
+
+class FinnHubNewsSource(HTTPNewsSource):
+    """FinnHub 新闻数据源"""
+
+    shared_cache_ttl = 30
+
+    def __init__(self):
+        super().__init__("FinnHub")
+        self.api_key = os.getenv("FINNHUB_API_KEY", "")
+        self.enabled = bool(self.api_key)
 
+    def is_available(self) -> bool:
+        return self.enabled and bool(self.api_key)
+
+    def _build_request(
+        self, symbol: str, start_date: datetime, end_date: datetime
+    ) -> Tuple[str, Dict]:
         url = "https://finnhub.io/api/v1/company-news"
         params = {
             "symbol": symbol,
@@ -113,53 +488,64 @@ class FinnHubNewsSource(NewsDataSource):
             "to": end_date.strftime("%Y-%m-%d"),
             "token": self.api_key,
         }
+        return url, params
 
-        try:
-            response = requests.get(url, params=params, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-                if not data:
-                    logger.info(f"[{self.name}] 未找到 {symbol} 的新闻数据")
-                    return []
-
-                news_list = []
-                for item in data:
-                    try:
-                        news = NewsArticle(
-                            title=item.get("headline", ""),
-                            content=item.get("summary", ""),
-                            source=self.name,
-                            publish_time=datetime.fromtimestamp(
-                                item.get("datetime", 0)
-                            ).isoformat(),
-                            url=item.get("url", ""),
-                            symbol=symbol,
-                            relevance_score=0.8,  # FinnHub数据质量较高
-                        )
-                        news_list.append(news)
-                    except Exception as e:
-                        logger.warning(f"[{self.name}] 解析新闻项失败: {e}")
-                        continue
-
-                logger.info(f"[{self.name}] ✅ 获取到 {len(news_list)} 条新闻")
-                return news_list
-
-            elif response.status_code == 401:
-                logger.error(f"[{self.name}] API密钥无效")
-                return []
-            else:
-                logger.error(f"[{self.name}] 请求失败: {response.status_code}")
-                return []
+    def _parse_response(
+        self,
+        status_code: int,
+        data: Optional[Dict],
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> List[NewsArticle]:
+        """解析 FinnHub 响应"""
+        if status_code == 401:
+            logger.error(f"[{self.name}] API密钥无效")
+            return []
+        if status_code != 200:
+            logger.error(f"[{self.name}] 请求失败: {status_code}")
+            return []
 
-        except Exception as e:
-            logger.error(f"[{self.name}] 请求异常: {e}")
+        if not data:
+            logger.info(f"[{self.name}] 未找到 {symbol} 的新闻数据")
             return []
 
+        news_list = []
+        # 循环内用到的属性和方法提前绑定为局部变量
+        append = news_list.append
+        name = self.name
+        dropped = 0
+        # 先用整数时间戳过滤早于开始时间的新闻，再做 datetime 转换
+        start_ts = start_date.timestamp()
+        for item in data:
+            timestamp = item.get("datetime")
+            if not isinstance(timestamp, (int, float)) or timestamp <= 0:
+                dropped += 1
+                continue
+            if timestamp < start_ts:
+                continue
+
+            news = NewsArticle(
+                title=item.get("headline", ""),
+                content=item.get("summary", ""),
+                source=name,
+                publish_time=datetime.fromtimestamp(timestamp).isoformat(),
+                url=item.get("url", ""),
+                symbol=symbol,
+                relevance_score=0.8,  # FinnHub数据质量较高
+            )
+            append(news)
+
+        self._log_dropped(dropped)
+        logger.info(f"[{self.name}] ✅ 获取到 {len(news_list)} 条新闻")
+        return news_list
+
 
-class AlphaVantageNewsSource(NewsDataSource):
+class AlphaVantageNewsSource(HTTPNewsSource):
     """Alpha Vantage 新闻数据源"""
 
+    shared_cache_ttl = 120  # 免费额度很低，缓存更久
+
     def __init__(self):
         super().__init__("AlphaVantage")
         self.api_key = os.getenv("ALPHA_VANTAGE_API_KEY", "")
@@ -168,89 +554,99 @@ class AlphaVantageNewsSource(NewsDataSource):
     def is_available(self) -> bool:
         return self.enabled and bool(self.api_key)
 
-    def fetch_news(
+    def _build_request(
         self, symbol: str, start_date: datetime, end_date: datetime
-    ) -> List[NewsArticle]:
-        """从 Alpha Vantage 获取新闻"""
-        if not self.is_available():
-            logger.warning(f"[{self.name}] API密钥未配置，跳过")
-            return []
-
-        logger.info(
-            f"[{self.name}] 获取 {symbol} 的新闻: {start_date.date()} 到 {end_date.date()}"
-        )
-
+    ) -> Tuple[str, Dict]:
         url = "https://www.alphavantage.co/query"
         params = {
             "function": "NEWS_SENTIMENT",
             "tickers": symbol,
             "apikey": self.api_key,
             "limit": 100,
+            # 由服务端按时间范围过滤，减少传输和解析的条目
+            "time_from": start_date.strftime("%Y%m%dT0000"),
+            "time_to": end_date.strftime("%Y%m%dT2359"),
         }
+        return url, params
 
-        try:
-            response = requests.get(url, params=params, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-
-                if "feed" not in data:
-                    logger.info(f"[{self.name}] 未找到 {symbol} 的新闻数据")
-                    return []
-
-                news_list = []
-                for item in data.get("feed", []):
-                    try:
-                        # 解析时间
-                        time_str = item.get("time_published", "")
-                        if time_str:
-                            pub_time = datetime.strptime(time_str, "%Y%m%dT%H%M%S")
-                        else:
-                            pub_time = datetime.now()
-
-                        # 过滤时间范围
-                        if not (start_date <= pub_time <= end_date):
-                            continue
-
-                        # 获取情感分析
-                        sentiment_score = item.get("overall_sentiment_score", 0)
-                        if sentiment_score > 0.15:
-                            sentiment = "positive"
-                        elif sentiment_score < -0.15:
-                            sentiment = "negative"
-                        else:
-                            sentiment = "neutral"
-
-                        news = NewsArticle(
-                            title=item.get("title", ""),
-                            content=item.get("summary", ""),
-                            source=self.name,
-                            publish_time=pub_time.isoformat(),
-                            url=item.get("url", ""),
-                            symbol=symbol,
-                            relevance_score=abs(sentiment_score),
-                            sentiment=sentiment,
-                        )
-                        news_list.append(news)
-
-                    except Exception as e:
-                        logger.warning(f"[{self.name}] 解析新闻项失败: {e}")
-                        continue
-
-                logger.info(f"[{self.name}] ✅ 获取到 {len(news_list)} 条新闻")
-                return news_list
-            else:
-                logger.error(f"[{self.name}] 请求失败: {response.status_code}")
-                return []
+    def _parse_response(
+        self,
+        status_code: int,
+        data: Optional[Dict],
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> List[NewsArticle]:
+        """解析 Alpha Vantage 响应"""
+        if status_code != 200:
+            logger.error(f"[{self.name}] 请求失败: {status_code}")
+            return []
 
-        except Exception as e:
-            logger.error(f"[{self.name}] 请求异常: {e}")
+        if "feed" not in data:
+            logger.info(f"[{self.name}] 未找到 {symbol} 的新闻数据")
             return []
 
+        news_list = []
+        # 循环内用到的属性和方法提前绑定为局部变量
+        append = news_list.append
+        name = self.name
+        dropped = 0
+        # YYYYMMDD 字符串可直接按字典序比较，范围外的条目跳过 strptime
+        start_day = start_date.strftime("%Y%m%d")
+        end_day = end_date.strftime("%Y%m%d")
+        # 缺少时间的条目统一使用本批次的解析时间
+        now = datetime.now()
+        for item in data.get("feed", []):
+            # 解析时间（格式固定为 YYYYMMDDTHHMMSS，长度 15）
+            time_str = item.get("time_published", "")
+            if not time_str:
+                pub_time = now
+            elif len(time_str) == 15 and time_str[8] == "T":
+                if not (start_day <= time_str[:8] <= end_day):
+                    continue
+                pub_time = datetime.strptime(time_str, "%Y%m%dT%H%M%S")
+            else:
+                dropped += 1
+                continue
+
+            # 兜底过滤时间范围（服务端已按 time_from/time_to 过滤）
+            if not (start_date <= pub_time <= end_date):
+                continue
+
+            # 获取情感分析
+            sentiment_score = item.get("overall_sentiment_score", 0)
+            if not isinstance(sentiment_score, (int, float)):
+                dropped += 1
+                continue
+            if sentiment_score > 0.15:
+                sentiment = "positive"
+            elif sentiment_score < -0.15:
+                sentiment = "negative"
+            else:
+                sentiment = "neutral"
+
+            news = NewsArticle(
+                title=item.get("title", ""),
+                content=item.get("summary", ""),
+                source=name,
+                publish_time=pub_time.isoformat(),
+                url=item.get("url", ""),
+                symbol=symbol,
+                relevance_score=abs(sentiment_score),
+                sentiment=sentiment,
+            )
+            append(news)
+
+        self._log_dropped(dropped)
+        logger.info(f"[{self.name}] ✅ 获取到 {len(news_list)} 条新闻")
+        return news_list
+
 
-class NewsAPISource(NewsDataSource):
+class NewsAPISource(HTTPNewsSource):
     """NewsAPI 新闻数据源"""
 
+    shared_cache_ttl = 30
+
     def __init__(self, use_proxy: bool = False):
         super().__init__("NewsAPI")
         self.api_key = os.getenv("NEWSAPI_KEY", "")
@@ -266,24 +662,19 @@ class NewsAPISource(NewsDataSource):
     def is_available(self) -> bool:
         return self.enabled and bool(self.api_key)
 
-    def fetch_news(
+    def _prepare(
         self, symbol: str, start_date: datetime, end_date: datetime
-    ) -> List[NewsArticle]:
-        """从 NewsAPI 获取新闻"""
-        if not self.is_available():
-            logger.warning(f"[{self.name}] API密钥未配置，跳过")
-            return []
-
+    ) -> Tuple[datetime, datetime]:
         # NewsAPI 免费版只支持最近30天
         days_diff = (end_date - start_date).days
         if days_diff > 30:
             logger.warning(f"[{self.name}] 免费版仅支持30天内数据，调整查询范围")
             start_date = end_date - timedelta(days=30)
+        return start_date, end_date
 
-        logger.info(
-            f"[{self.name}] 获取 {symbol} 的新闻: {start_date.date()} 到 {end_date.date()}"
-        )
-
+    def _build_request(
+        self, symbol: str, start_date: datetime, end_date: datetime
+    ) -> Tuple[str, Dict]:
         # 构建查询关键词
         query = f"{symbol}"
 
@@ -296,69 +687,107 @@ class NewsAPISource(NewsDataSource):
             "to": end_date.strftime("%Y-%m-%d"),
             "apiKey": self.api_key,
         }
+        return url, params
 
-        try:
-            response = requests.get(
-                url, params=params, proxies=self.proxies, timeout=10
-            )
+    def _parse_response(
+        self,
+        status_code: int,
+        data: Optional[Dict],
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> List[NewsArticle]:
+        """解析 NewsAPI 响应"""
+        if status_code == 426:
+            logger.warning(f"[{self.name}] 需要升级订阅以访问历史数据")
+            return []
+        if status_code != 200:
+            logger.error(f"[{self.name}] 请求失败: {status_code}")
+            return []
 
-            if response.status_code == 200:
-                data = response.json()
-
-                if data.get("status") != "ok" or not data.get("articles"):
-                    logger.info(f"[{self.name}] 未找到 {symbol} 的新闻数据")
-                    return []
-
-                news_list = []
-                for item in data.get("articles", []):
-                    try:
-                        pub_time_str = item.get("publishedAt", "")
-                        if pub_time_str:
-                            pub_time = datetime.fromisoformat(
-                                pub_time_str.replace("Z", "+00:00")
-                            )
-                        else:
-                            pub_time = datetime.now()
-
-                        news = NewsArticle(
-                            title=item.get("title", ""),
-                            content=item.get("description", "")
-                            or item.get("content", ""),
-                            source=self.name,
-                            publish_time=pub_time.isoformat(),
-                            url=item.get("url", ""),
-                            symbol=symbol,
-                            relevance_score=0.7,
-                        )
-                        news_list.append(news)
-
-                    except Exception as e:
-                        logger.warning(f"[{self.name}] 解析新闻项失败: {e}")
-                        continue
-
-                logger.info(f"[{self.name}] ✅ 获取到 {len(news_list)} 条新闻")
-                return news_list
-
-            elif response.status_code == 426:
-                logger.warning(f"[{self.name}] 需要升级订阅以访问历史数据")
-                return []
+        if data.get("status") != "ok" or not data.get("articles"):
+            logger.info(f"[{self.name}] 未找到 {symbol} 的新闻数据")
+            return []
+
+        news_list = []
+        # 循环内用到的属性和方法提前绑定为局部变量
+        append = news_list.append
+        name = self.name
+        dropped = 0
+        # 缺少时间的条目统一使用本批次的解析时间
+        now = datetime.now()
+        for item in data.get("articles", []):
+            # publishedAt 形如 2024-01-01T08:00:00Z
+            pub_time_str = item.get("publishedAt") or ""
+            if not pub_time_str:
+                pub_time = now
+            elif len(pub_time_str) >= 19 and pub_time_str[10] == "T":
+                if pub_time_str.endswith("Z"):
+                    pub_time_str = pub_time_str[:-1] + "+00:00"
+                pub_time = datetime.fromisoformat(pub_time_str)
             else:
-                logger.error(f"[{self.name}] 请求失败: {response.status_code}")
-                return []
+                dropped += 1
+                continue
 
-        except Exception as e:
-            logger.error(f"[{self.name}] 请求异常: {e}")
-            return []
+            news = NewsArticle(
+                title=item.get("title") or "",
+                content=item.get("description") or item.get("content") or "",
+                source=name,
+                publish_time=pub_time.isoformat(),
+                url=item.get("url") or "",
+                symbol=symbol,
+                relevance_score=0.7,
+            )
+            append(news)
+
+        self._log_dropped(dropped)
+        logger.info(f"[{self.name}] ✅ 获取到 {len(news_list)} 条新闻")
+        return news_list
+
+
+# 东方财富新闻条数：按查询天数估算，限制在 [MIN, MAX] 区间
+EASTMONEY_MIN_NEWS = 50
+EASTMONEY_MAX_NEWS = 500
+EASTMONEY_NEWS_PER_DAY = 5
+
+# 东方财富新闻字段可能出现的列名（按优先级）
+EASTMONEY_COLUMN_ALIASES = {
+    "time": ("发布时间", "时间", "日期", "date", "publish_time"),
+    "title": ("新闻标题", "标题", "title"),
+    "content": ("新闻内容", "内容", "content"),
+    "url": ("新闻链接", "链接", "url"),
+}
 
 
 class EastMoneyNewsSource(NewsDataSource):
     """东方财富(AkShare) 新闻数据源"""
 
+    shared_cache_ttl = 300
+
+    @staticmethod
+    def _resolve_columns(columns) -> Dict[str, Optional[str]]:
+        """按别名表一次性解析各字段对应的列名，缺失字段为 None"""
+        present = set(columns)
+        return {
+            field: next((c for c in aliases if c in present), None)
+            for field, aliases in EASTMONEY_COLUMN_ALIASES.items()
+        }
+
     def __init__(self):
         super().__init__("EastMoney")
-        self.akshare_service = AkshareService()
+        self._akshare_service = None
+        self._akshare_lock = threading.Lock()
         self.enabled = True  # 免费服务，默认启用
 
+    @property
+    def akshare_service(self) -> AkshareService:
+        """首次获取新闻时才初始化 AkshareService"""
+        if self._akshare_service is None:
+            with self._akshare_lock:
+                if self._akshare_service is None:
+                    self._akshare_service = AkshareService()
+        return self._akshare_service
+
     def is_available(self) -> bool:
         return self.enabled
 
@@ -371,19 +800,21 @@ class EastMoneyNewsSource(NewsDataSource):
         )
 
         try:
-            # 获取新闻数据
-            df = self.akshare_service.get_stock_news_em(symbol, max_news=100)
+            # 获取新闻数据，条数随查询天数缩放，窄窗口不必处理 100 条
+            days = max((end_date - start_date).days, 1)
+            max_news = min(
+                EASTMONEY_MAX_NEWS,
+                max(EASTMONEY_MIN_NEWS, days * EASTMONEY_NEWS_PER_DAY),
+            )
+            df = self.akshare_service.get_stock_news_em(symbol, max_news=max_news)
 
             if df is None or df.empty:
                 logger.info(f"[{self.name}] 未找到 {symbol} 的新闻数据")
                 return []
 
-            # 查找时间列
-            time_column = None
-            for col in ["发布时间", "时间", "日期", "date", "publish_time"]:
-                if col in df.columns:
-                    time_column = col
-                    break
+            # 一次性解析所需列名
+            columns = self._resolve_columns(df.columns)
+            time_column = columns["time"]
 
             if not time_column:
                 logger.warning(
@@ -391,51 +822,32 @@ class EastMoneyNewsSource(NewsDataSource):
                 )
                 return []
 
-            # 过滤时间范围
-            news_list = []
-            for _, row in df.iterrows():
-                try:
-                    # 解析时间
-                    time_str = str(row[time_column])
-                    try:
-                        pub_time = pd.to_datetime(time_str)
-                    except Exception:
-                        # 尝试其他格式
-                        pub_time = datetime.strptime(time_str, "%Y-%m-%d %H:%M:%S")
-
-                    # 时区处理
-                    if pub_time.tzinfo is None:
-                        pub_time = pub_time.replace(tzinfo=None)
-                    else:
-                        pub_time = pub_time.replace(tzinfo=None)
-
-                    # 过滤时间范围
-                    if not (start_date <= pub_time <= end_date):
-                        continue
-
-                    # 提取标题和内容 (使用东方财富的实际列名)
-                    title = str(
-                        row.get("新闻标题", row.get("标题", row.get("title", "")))
-                    )
-                    content = str(
-                        row.get("新闻内容", row.get("内容", row.get("content", "")))
-                    )
-                    url = str(row.get("新闻链接", row.get("链接", row.get("url", ""))))
-
-                    news = NewsArticle(
-                        title=title,
-                        content=content,
-                        source=self.name,
-                        publish_time=pub_time.isoformat(),
-                        url=url,
-                        symbol=symbol,
-                        relevance_score=0.9,  # 东方财富针对性强
-                    )
-                    news_list.append(news)
-
-                except Exception as e:
-                    logger.warning(f"[{self.name}] 解析新闻项失败: {e}")
-                    continue
+            # 向量化解析时间并过滤时间范围（无法解析的时间为 NaT，自动被过滤）
+            pub_times = pd.to_datetime(df[time_column], errors="coerce")
+            if pub_times.dt.tz is not None:
+                pub_times = pub_times.dt.tz_localize(None)
+            mask = pub_times.between(start_date, end_date)
+
+            # 提取标题和内容 (使用东方财富的实际列名)，缺失列填充空字符串
+            filtered = pd.DataFrame({"pub_time": pub_times[mask]})
+            for field in ("title", "content", "url"):
+                column = columns[field]
+                filtered[field] = (
+                    df.loc[mask, column].astype(str) if column is not None else ""
+                )
+
+            news_list = [
+                NewsArticle(
+                    title=rec.title,
+                    content=rec.content,
+                    source=self.name,
+                    publish_time=rec.pub_time.isoformat(),
+                    url=rec.url,
+                    symbol=symbol,
+                    relevance_score=0.9,  # 东方财富针对性强
+                )
+                for rec in filtered.itertuples(index=False)
+            ]
 
             logger.info(f"[{self.name}] ✅ 获取到 {len(news_list)} 条新闻")
             return news_list
@@ -472,6 +884,16 @@ class MultiSourceNewsService:
             "美股": ["finnhub", "alphavantage", "newsapi"],  # FinnHub最优
         }
 
+        # 共享线程池：多股票 × 多数据源并发时控制总并发量
+        self._pool = ThreadPoolExecutor(
+            max_workers=min(32, 4 * len(self.sources)),
+            thread_name_prefix="news",
+        )
+
+        # 异步 HTTP 客户端绑定到创建它的事件循环
+        self._async_client = None
+        self._async_client_loop = None
+
         logger.info("✅ 多数据源新闻服务初始化成功")
         self._log_available_sources()
 
@@ -490,7 +912,11 @@ class MultiSourceNewsService:
             logger.warning(f"⚠️ 不可用数据源: {', '.join(unavailable)}")
 
     def get_news_for_date(
-        self, symbol: str, target_date: Optional[str] = None, days_before: int = 30
+        self,
+        symbol: str,
+        target_date: Optional[str] = None,
+        days_before: int = 30,
+        top_k: Optional[int] = None,
     ) -> Dict:
         """
         获取指定日期的股票新闻
@@ -499,30 +925,80 @@ class MultiSourceNewsService:
             symbol: 股票代码
             target_date: 目标日期 (YYYY-MM-DD)，默认为当前日期
             days_before: 向前查询的天数，默认30天
+            top_k: 只返回最新的 K 条，默认全部返回
 
         Returns:
             Dict: 包含新闻列表和元数据的字典
         """
-        # 处理目标日期
+        date_range = self._resolve_date_range(target_date, days_before)
+        if date_range is None:
+            return {"success": False, "error": "日期格式错误", "symbol": symbol}
+
+        return self.get_news(symbol, *date_range, top_k=top_k)
+
+    def get_news_batch_for_date(
+        self,
+        symbols: List[str],
+        target_date: Optional[str] = None,
+        days_before: int = 30,
+    ) -> Dict[str, Dict]:
+        """
+        批量获取多只股票在指定日期前的新闻（组合扫描用）
+
+        Args:
+            symbols: 股票代码列表
+            target_date: 目标日期 (YYYY-MM-DD)，默认为当前日期
+            days_before: 向前查询的天数，默认30天
+
+        Returns:
+            Dict: {symbol: 与 get_news_for_date 相同结构的结果}
+        """
+        date_range = self._resolve_date_range(target_date, days_before)
+        if date_range is None:
+            return {
+                symbol: {"success": False, "error": "日期格式错误", "symbol": symbol}
+                for symbol in dict.fromkeys(symbols)
+            }
+
+        return self.get_news_batch(symbols, *date_range)
+
+    async def aget_news_for_date(
+        self,
+        symbol: str,
+        target_date: Optional[str] = None,
+        days_before: int = 30,
+        top_k: Optional[int] = None,
+    ) -> Dict:
+        """get_news_for_date 的异步版本，供事件循环内的调用方使用"""
+        date_range = self._resolve_date_range(target_date, days_before)
+        if date_range is None:
+            return {"success": False, "error": "日期格式错误", "symbol": symbol}
+
+        return await self.aget_news(symbol, *date_range, top_k=top_k)
+
+    @staticmethod
+    def _resolve_date_range(
+        target_date: Optional[str], days_before: int
+    ) -> Optional[Tuple[datetime, datetime]]:
+        """解析目标日期，返回 (start_date, end_date)，格式错误时返回 None"""
         if target_date:
             try:
                 end_date = datetime.strptime(target_date, "%Y-%m-%d")
             except ValueError:
                 logger.error(f"日期格式错误: {target_date}，应为 YYYY-MM-DD")
-                return {
-                    "success": False,
-                    "error": "日期格式错误",
-                    "symbol": symbol,
-                }
+                return None
         else:
             end_date = datetime.now()
 
-        # 计算开始日期
-        start_date = end_date - timedelta(days=days_before)
+        return end_date - timedelta(days=days_before), end_date
 
-        return self.get_news(symbol, start_date, end_date)
-
-    def get_news(self, symbol: str, start_date: datetime, end_date: datetime) -> Dict:
+    def get_news(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        top_k: Optional[int] = None,
+    ) -> Dict:
         """
         获取指定时间范围的股票新闻
 
@@ -530,18 +1006,60 @@ class MultiSourceNewsService:
             symbol: 股票代码
             start_date: 开始日期
             end_date: 结束日期
+            top_k: 只返回最新的 K 条，默认全部返回
 
         Returns:
             Dict: 包含新闻列表和元数据的字典
         """
+        plan = self._plan_request(symbol, start_date, end_date)
+        if "error" in plan:
+            return plan
+
+        # 同步调用走共享线程池 + 各数据源复用的 requests.Session 连接池
+        all_news = self._fetch_from_multiple_sources(
+            plan["sources"], plan["symbols"], start_date, end_date
+        )
+
+        return self._build_result(
+            symbol, plan["market"], start_date, end_date, all_news, top_k
+        )
+
+    async def aget_news(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        top_k: Optional[int] = None,
+    ) -> Dict:
+        """get_news 的异步版本，复用绑定当前事件循环的 HTTP 客户端"""
+        plan = self._plan_request(symbol, start_date, end_date)
+        if "error" in plan:
+            return plan
+
+        all_news = await self._afetch_from_multiple_sources(
+            plan["sources"],
+            plan["symbols"],
+            start_date,
+            end_date,
+            await self._get_async_client(),
+        )
+        return self._build_result(
+            symbol, plan["market"], start_date, end_date, all_news, top_k
+        )
+
+    def _plan_request(
+        self, symbol: str, start_date: datetime, end_date: datetime
+    ) -> Dict:
+        """确定市场、数据源及各数据源的代码格式；不支持的市场返回错误字典"""
         # 分析股票代码
         symbol_info = self.symbol_processor.process_symbol(symbol)
         market = symbol_info["market"]
 
-        logger.info("=" * 80)
-        logger.info(f"📰 获取新闻: {symbol} ({market})")
-        logger.info(f"📅 时间范围: {start_date.date()} 到 {end_date.date()}")
-        logger.info("=" * 80)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(_BANNER)
+            logger.info(f"📰 获取新闻: {symbol} ({market})")
+            logger.info(f"📅 时间范围: {start_date.date()} 到 {end_date.date()}")
+            logger.info(_BANNER)
 
         # 获取该市场的数据源优先级列表
         source_priority = self.priority_strategy.get(market, [])
@@ -560,25 +1078,43 @@ class MultiSourceNewsService:
             symbol, symbol_info, source_priority
         )
 
-        # 并行获取所有数据源的新闻
-        all_news = self._fetch_from_multiple_sources(
-            source_priority, formatted_symbols, start_date, end_date
-        )
+        return {
+            "market": market,
+            "sources": source_priority,
+            "symbols": formatted_symbols,
+        }
 
+    def _build_result(
+        self,
+        symbol: str,
+        market: str,
+        start_date: datetime,
+        end_date: datetime,
+        all_news: List[NewsArticle],
+        top_k: Optional[int] = None,
+    ) -> Dict:
+        """去重、排序并组装返回结果，指定 top_k 时只取最新的 K 条"""
         # 去重和排序
         unique_news = self._deduplicate_news(all_news)
-        sorted_news = sorted(unique_news, key=lambda x: x.publish_time, reverse=True)
+        if top_k is not None and top_k < len(unique_news):
+            sorted_news = heapq.nlargest(top_k, unique_news, key=_publish_time)
+        else:
+            sorted_news = sorted(unique_news, key=_publish_time, reverse=True)
 
-        # 统计信息
-        source_stats = {}
+        # 统计信息与序列化合并为一次遍历
+        source_stats = Counter()
+        news_dicts = []
         for news in sorted_news:
-            source_stats[news.source] = source_stats.get(news.source, 0) + 1
-
-        logger.info("=" * 80)
-        logger.info(f"✅ 新闻获取完成: 共 {len(sorted_news)} 条")
-        for source, count in source_stats.items():
-            logger.info(f"   - {source}: {count} 条")
-        logger.info("=" * 80)
+            source_stats[news.source] += 1
+            news_dicts.append(news.to_dict())
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(_BANNER)
+            logger.info(
+                f"✅ 新闻获取完成: 共 {len(sorted_news)} 条"
+                + "".join(f"\n   - {s}: {c} 条" for s, c in source_stats.items())
+            )
+            logger.info(_BANNER)
 
         return {
             "success": True,
@@ -586,9 +1122,9 @@ class MultiSourceNewsService:
             "market": market,
             "start_date": start_date.isoformat(),
             "end_date": end_date.isoformat(),
-            "total_count": len(sorted_news),
-            "source_stats": source_stats,
-            "news": [news.to_dict() for news in sorted_news],
+            "total_count": len(unique_news),
+            "source_stats": dict(source_stats),
+            "news": news_dicts,
         }
 
     def _get_formatted_symbols(
@@ -600,24 +1136,13 @@ class MultiSourceNewsService:
         Returns:
             Dict: {source_name: formatted_symbol}
         """
-        formatted = {}
         formats = symbol_info["formats"]
+        formatted = {
+            name: formats.get(SOURCE_FORMAT_KEY.get(name, ""), original_symbol)
+            for name in source_priority
+        }
 
-        for source_name in source_priority:
-            if source_name == "finnhub":
-                formatted[source_name] = formats[
-                    "yfinance"
-                ]  # FinnHub使用类似yfinance格式
-            elif source_name == "alphavantage":
-                formatted[source_name] = formats["yfinance"]
-            elif source_name == "newsapi":
-                formatted[source_name] = formats["news_api"]
-            elif source_name == "eastmoney":
-                formatted[source_name] = formats["akshare"]
-            else:
-                formatted[source_name] = original_symbol
-
-        logger.info(f"📝 代码格式化: {formatted}")
+        logger.debug("📝 代码格式化: %s", formatted)
         return formatted
 
     def _fetch_from_multiple_sources(
@@ -641,30 +1166,173 @@ class MultiSourceNewsService:
         """
         all_news = []
 
-        # 使用线程池并行获取
-        with ThreadPoolExecutor(max_workers=len(source_names)) as executor:
-            future_to_source = {}
+        # 使用共享线程池并行获取
+        future_to_source = {}
+        for source_name in source_names:
+            future = self._submit_fetch(
+                source_name, formatted_symbols, start_date, end_date
+            )
+            if future is not None:
+                future_to_source[future] = source_name
 
-            for source_name in source_names:
-                source = self.sources.get(source_name)
-                if not source or not source.is_available():
-                    logger.warning(f"⚠️ 数据源 {source_name} 不可用，跳过")
-                    continue
+        # 收集结果
+        for future in as_completed(future_to_source):
+            source_name = future_to_source[future]
+            try:
+                news_list = future.result()
+                all_news.extend(news_list)
+            except Exception as e:
+                logger.error(f"❌ 数据源 {source_name} 获取失败: {e}")
+
+        return all_news
 
-                symbol = formatted_symbols.get(source_name, "")
-                future = executor.submit(
-                    source.fetch_news, symbol, start_date, end_date
+    def _submit_fetch(
+        self,
+        source_name: str,
+        formatted_symbols: Dict[str, str],
+        start_date: datetime,
+        end_date: datetime,
+    ):
+        """向共享线程池提交单个数据源的获取任务，数据源不可用时返回 None"""
+        source = self.sources.get(source_name)
+        if not source or not source.is_available():
+            logger.warning(f"⚠️ 数据源 {source_name} 不可用，跳过")
+            return None
+
+        symbol = formatted_symbols.get(source_name, "")
+        return self._pool.submit(source.get_news_cached, symbol, start_date, end_date)
+
+    def get_news_batch(
+        self, symbols: List[str], start_date: datetime, end_date: datetime
+    ) -> Dict[str, Dict]:
+        """
+        批量获取多只股票的新闻
+
+        所有 (股票, 数据源) 组合一次性提交到共享线程池并发执行，
+        再按原始股票代码分组去重排序
+
+        Args:
+            symbols: 股票代码列表
+            start_date: 开始日期
+            end_date: 结束日期
+
+        Returns:
+            Dict: {symbol: 与 get_news 相同结构的结果}
+        """
+        results: Dict[str, Dict] = {}
+        plans: Dict[str, Dict] = {}
+        future_to_key = {}
+
+        for symbol in dict.fromkeys(symbols):
+            plan = self._plan_request(symbol, start_date, end_date)
+            if "error" in plan:
+                results[symbol] = plan
+                continue
+
+            plans[symbol] = plan
+            for source_name in plan["sources"]:
+                future = self._submit_fetch(
+                    source_name, plan["symbols"], start_date, end_date
                 )
-                future_to_source[future] = source_name
+                if future is not None:
+                    future_to_key[future] = (symbol, source_name)
+
+        fetched: Dict[Tuple[str, str], List[NewsArticle]] = {}
+        for future in as_completed(future_to_key):
+            symbol, source_name = future_to_key[future]
+            try:
+                fetched[(symbol, source_name)] = future.result()
+            except Exception as e:
+                logger.error(f"❌ 数据源 {source_name} 获取 {symbol} 失败: {e}")
+
+        # 按数据源优先级顺序合并，去重时保留高优先级数据源的条目
+        for symbol, plan in plans.items():
+            all_news = [
+                news
+                for source_name in plan["sources"]
+                for news in fetched.get((symbol, source_name), ())
+            ]
+            results[symbol] = self._build_result(
+                symbol, plan["market"], start_date, end_date, all_news
+            )
+
+        return {symbol: results[symbol] for symbol in dict.fromkeys(symbols)}
+
+    async def _get_async_client(self) -> Optional["httpx.AsyncClient"]:
+        """获取绑定当前事件循环的共享异步 HTTP 客户端"""
+        if httpx is None:
+            return None
+
+        loop = asyncio.get_running_loop()
+        if self._async_client is not None and self._async_client_loop is not loop:
+            # 事件循环已更换：先关闭旧客户端，释放其连接池
+            await self._close_async_client()
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                headers=HTTP_NEWS_HEADERS,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+                timeout=10,
+            )
+            self._async_client_loop = loop
+        return self._async_client
+
+    async def _close_async_client(self):
+        """关闭当前的异步 HTTP 客户端（旧事件循环仍在运行时交由其关闭）"""
+        client, loop = self._async_client, self._async_client_loop
+        self._async_client = None
+        self._async_client_loop = None
+        if client is None:
+            return
+
+        current = asyncio.get_running_loop()
+        if loop is not None and loop is not current and loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug("关闭异步HTTP客户端失败: %s", e)
 
-            # 收集结果
-            for future in as_completed(future_to_source):
-                source_name = future_to_source[future]
-                try:
-                    news_list = future.result()
-                    all_news.extend(news_list)
-                except Exception as e:
-                    logger.error(f"❌ 数据源 {source_name} 获取失败: {e}")
+    async def aclose(self):
+        """关闭异步 HTTP 客户端和共享线程池，供应用关闭时调用"""
+        await self._close_async_client()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _afetch_from_multiple_sources(
+        self,
+        source_names: List[str],
+        formatted_symbols: Dict[str, str],
+        start_date: datetime,
+        end_date: datetime,
+        client: Optional["httpx.AsyncClient"],
+    ) -> List[NewsArticle]:
+        """
+        在事件循环中并发从多个数据源获取新闻
+
+        HTTP 数据源直接使用异步客户端，东方财富等同步数据源在线程中执行
+        """
+        names = []
+        tasks = []
+        for source_name in source_names:
+            source = self.sources.get(source_name)
+            if not source or not source.is_available():
+                logger.warning(f"⚠️ 数据源 {source_name} 不可用，跳过")
+                continue
+
+            symbol = formatted_symbols.get(source_name, "")
+            names.append(source_name)
+            tasks.append(
+                source.aget_news_cached(client, symbol, start_date, end_date)
+            )
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        all_news = []
+        for source_name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                logger.error(f"❌ 数据源 {source_name} 获取失败: {result}")
+                continue
+            all_news.extend(result)
 
         return all_news
 
@@ -675,45 +1343,52 @@ class MultiSourceNewsService:
         策略:
         1. 优先基于URL去重
         2. 其次基于标题+发布时间组合去重
-        3. 保留有标题的新闻
+        3. 同一天内标题近似（各数据源改写标点、措辞的转载）的只保留第一条
+        4. 保留有标题的新闻
         """
         if not news_list:
             return []
 
+        # URL 与 标题+日期 两类键共用一个集合（带类型前缀区分），每条新闻最多两次查找
         unique_news = []
-        seen_urls = set()
-        seen_combinations = set()
+        seen = set()
+        near_dup_by_day: Dict[str, _NearDupIndex] = defaultdict(_NearDupIndex)
 
         for news in news_list:
-            # 策略1: URL去重（最可靠）
-            if news.url and news.url.strip():
-                url_key = news.url.strip().lower()
-                if url_key in seen_urls:
-                    continue
-                seen_urls.add(url_key)
-
-            # 策略2: 标题+时间组合去重
-            title_key = news.title.lower().strip()
-            time_key = news.publish_time[:10] if news.publish_time else ""
-            combination_key = f"{title_key}|{time_key}"
+            title_key = news.title.strip().lower()
+            url = news.url.strip()
+            url_key = ("url", url.lower()) if url else None
+            if url_key is not None and url_key in seen:
+                continue
+            combination_key = ("title", title_key, news.publish_time[:10])
 
             # 跳过空标题或已见过的组合
-            if not title_key or combination_key in seen_combinations:
+            if not title_key or combination_key in seen:
+                continue
+
+            day_index = near_dup_by_day[news.publish_time[:10]]
+            if not day_index.add_if_new(_title_shingles(title_key)):
                 continue
 
-            seen_combinations.add(combination_key)
+            if url_key is not None:
+                seen.add(url_key)
+            seen.add(combination_key)
             unique_news.append(news)
 
-        logger.info(f"📊 去重: {len(news_list)} 条 -> {len(unique_news)} 条")
+        logger.debug("📊 去重: %d 条 -> %d 条", len(news_list), len(unique_news))
         return unique_news
 
 
 # ============ 便捷函数 ============
 
 
+_news_services: Dict[bool, MultiSourceNewsService] = {}
+_news_services_lock = threading.Lock()
+
+
 def get_news_service(use_proxy: bool = False) -> MultiSourceNewsService:
     """
-    获取新闻服务实例
+    获取新闻服务实例（进程内单例，复用 HTTP 会话与缓存）
 
     Args:
         use_proxy: NewsAPI是否使用代理
@@ -721,7 +1396,23 @@ def get_news_service(use_proxy: bool = False) -> MultiSourceNewsService:
     Returns:
         MultiSourceNewsService: 新闻服务实例
     """
-    return MultiSourceNewsService(use_proxy_for_newsapi=use_proxy)
+    service = _news_services.get(use_proxy)
+    if service is None:
+        with _news_services_lock:
+            service = _news_services.get(use_proxy)
+            if service is None:
+                service = MultiSourceNewsService(use_proxy_for_newsapi=use_proxy)
+                _news_services[use_proxy] = service
+    return service
+
+
+async def close_news_services():
+    """关闭已创建的新闻服务实例（应用关闭时调用）"""
+    with _news_services_lock:
+        services = list(_news_services.values())
+        _news_services.clear()
+    for service in services:
+        await service.aclose()
 
 
 def get_stock_news(
@@ -729,6 +1420,7 @@ def get_stock_news(
     target_date: Optional[str] = None,
     days_before: int = 30,
     use_proxy: bool = False,
+    top_k: Optional[int] = None,
 ) -> Dict:
     """
     获取股票新闻的便捷函数
@@ -738,12 +1430,37 @@ def get_stock_news(
         target_date: 目标日期 (YYYY-MM-DD)，默认为当前日期
         days_before: 向前查询的天数，默认30天
         use_proxy: NewsAPI是否使用代理
+        top_k: 只返回最新的 K 条，默认全部返回
 
     Returns:
         Dict: 新闻数据
     """
     service = get_news_service(use_proxy=use_proxy)
-    return service.get_news_for_date(symbol, target_date, days_before)
+    return service.get_news_for_date(symbol, target_date, days_before, top_k=top_k)
+
+
+def get_stock_news_batch(
+    symbols: List[str],
+    target_date: Optional[str] = None,
+    days_before: int = 30,
+    use_proxy: bool = False,
+) -> Dict[str, Dict]:
+    """
+    批量获取多只股票新闻的便捷函数
+
+    所有 (股票, 数据源) 组合在共享线程池中并发请求
+
+    Args:
+        symbols: 股票代码列表
+        target_date: 目标日期 (YYYY-MM-DD)，默认为当前日期
+        days_before: 向前查询的天数，默认30天
+        use_proxy: NewsAPI是否使用代理
+
+    Returns:
+        Dict: {symbol: 新闻数据}
+    """
+    service = get_news_service(use_proxy=use_proxy)
+    return service.get_news_batch_for_date(symbols, target_date, days_before)
 
 
 def get_stock_news_range(
@@ -8,6 +8,9 @@
 - 利用 Redis 缓存（特别是 AKShareMarketCache）来提高性能。
 """
 
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from decimal import Decimal, InvalidOperation
 from typing import Optional, Dict, List
 import pandas as pd
@@ -20,6 +23,14 @@ from ..utils.symbol_processor import get_symbol_processor
 # 导入AKShare市场数据缓存管理器
 from ..utils.redis_cache import AKShareMarketCache
 
+logger = logging.getLogger("quote_service")
+
+# 批量行情中缓存未命中的股票并发走 YFinance/Tushare 降级。
+# 路由层按请求创建 QuoteService，线程池放在模块级由所有实例共享，避免每个实例各开一个池而泄漏线程
+_FALLBACK_EXECUTOR = ThreadPoolExecutor(
+    max_workers=16, thread_name_prefix="quote-source"
+)
+
 
 class StockMarketDataDTO(BaseModel):
     """
@@ -39,7 +50,17 @@ class StockMarketDataDTO(BaseModel):
 class QuoteService:
     """股票实时行情服务"""
 
+    # 各市场的数据源优先级，对于实时行情，AKShare的缓存通常是最高效的
+    _DATA_SOURCES = {
+        "china": ("akshare", "tushare"),
+        "hk": ("yfinance", "akshare", "tushare"),
+        "us": ("yfinance", "akshare"),
+    }
+
     def __init__(self):
+        # 代码处理器为单例且 process_symbol 已按代码缓存，这里只保留引用
+        self._processor = get_symbol_processor()
+
         # 初始化数据源服务
         self.services: Dict[str, object] = {}
         self._init_data_sources()
@@ -47,31 +68,46 @@ class QuoteService:
         # 初始化AKShare市场数据缓存管理器，这是获取实时数据的主要来源
         self.market_cache = AKShareMarketCache(cache_duration=3600)  # 1小时缓存
 
+        # 按市场预先绑定 (数据源, 取数方法) 链，只包含初始化成功的数据源
+        fetchers = {
+            "akshare": self._get_from_akshare_cache,
+            "yfinance": self._get_from_yfinance,
+            "tushare": self._get_from_tushare,
+        }
+        self._source_chains = {
+            market: tuple(
+                (source, fetchers[source])
+                for source in sources
+                if source in self.services
+            )
+            for market, sources in self._DATA_SOURCES.items()
+        }
+
     def _init_data_sources(self):
         """初始化底层数据源服务"""
         try:
             from .tushare_service import TushareService
 
             self.services["tushare"] = TushareService()
-            print("✅ [QuoteService] Tushare数据源已启用")
+            logger.info("✅ [QuoteService] Tushare数据源已启用")
         except Exception as e:
-            print(f"⚠️ [QuoteService] Tushare数据源初始化失败: {e}")
+            logger.warning("⚠️ [QuoteService] Tushare数据源初始化失败: %s", e)
 
         try:
             from .akshare_service import AkshareService
 
             self.services["akshare"] = AkshareService()
-            print("✅ [QuoteService] AKShare数据源已启用")
+            logger.info("✅ [QuoteService] AKShare数据源已启用")
         except Exception as e:
-            print(f"⚠️ [QuoteService] AKShare数据源初始化失败: {e}")
+            logger.warning("⚠️ [QuoteService] AKShare数据源初始化失败: %s", e)
 
         try:
             from .yfinance_service import YFinanceService
 
             self.services["yfinance"] = YFinanceService()
-            print("✅ [QuoteService] YFinance数据源已启用")
+            logger.info("✅ [QuoteService] YFinance数据源已启用")
         except Exception as e:
-            print(f"⚠️ [QuoteService] YFinance数据源初始化失败: {e}")
+            logger.warning("⚠️ [QuoteService] YFinance数据源初始化失败: %s", e)
 
     def get_stock_quote(self, symbol: str) -> StockMarketDataDTO:
         """
@@ -83,47 +119,50 @@ class QuoteService:
         Returns:
             StockMarketDataDTO: 包含行情数据的DTO对象
         """
-        processor = get_symbol_processor()
-        symbol_info = processor.process_symbol(symbol)
+        symbol_info = self._processor.process_symbol(symbol)
+        return self._resolve_quote(symbol_info)
+
+    def _resolve_quote(
+        self, symbol_info: Dict, skip_sources: tuple = ()
+    ) -> StockMarketDataDTO:
+        """
+        按市场对应的数据源优先级依次尝试，返回第一个成功的结果
+
+        Args:
+            symbol_info: process_symbol 的返回结果
+            skip_sources: 已经尝试过、需要跳过的数据源
+        """
         ticker_symbol = symbol_info["formats"]["cache_key"]
 
-        # 根据市场决定数据源的优先级
-        # 对于实时行情，AKShare的缓存通常是最高效的
-        if symbol_info["is_china"]:
-            data_sources = ["akshare", "tushare"]
-        elif symbol_info["is_hk"]:
-            data_sources = ["yfinance", "akshare", "tushare"]
-        else:  # 美股
-            data_sources = ["yfinance", "akshare"]
+        # 非A股、非港股的代码按美股处理
+        chain = self._source_chains.get(
+            symbol_info["market_simple_name"], self._source_chains["us"]
+        )
 
-        print(f"🔍 [QuoteService] 开始获取 {ticker_symbol} 的行情数据")
-        print(f"📊 [QuoteService] 数据源策略: {' → '.join(data_sources)}")
+        logger.debug(
+            "🔍 [QuoteService] 开始获取 %s 的行情数据 (市场: %s)",
+            ticker_symbol,
+            symbol_info["market_simple_name"],
+        )
 
-        last_error = None
-        for source in data_sources:
+        for source, fetch in chain:
+            if source in skip_sources:
+                continue
             try:
-                print(f"🔄 [QuoteService] 尝试从 {source} 获取数据...")
-                quote_data = None
-                if source == "akshare" and "akshare" in self.services:
-                    quote_data = self._get_from_akshare_cache(symbol_info)
-                elif source == "yfinance" and "yfinance" in self.services:
-                    quote_data = self._get_from_yfinance(symbol_info)
-                elif source == "tushare" and "tushare" in self.services:
-                    quote_data = self._get_from_tushare(symbol_info)
+                logger.debug("🔄 [QuoteService] 尝试从 %s 获取数据...", source)
+                quote_data = fetch(symbol_info)
 
                 if quote_data:
-                    print(
-                        f"✅ [QuoteService] 成功从 {source} 获取到 {ticker_symbol} 的数据"
+                    logger.debug(
+                        "✅ [QuoteService] 成功从 %s 获取到 %s 的数据", source, ticker_symbol
                     )
                     return quote_data
 
             except Exception as e:
-                print(f"❌ [QuoteService] 从 {source} 获取数据失败: {e}")
-                last_error = e
-                continue
+                logger.warning("❌ [QuoteService] 从 %s 获取数据失败: %s", source, e)
 
-        print(
-            f"⚠️ [QuoteService] 所有数据源均无法获取 {ticker_symbol} 的行情，返回空数据。"
+        logger.warning(
+            "⚠️ [QuoteService] 所有数据源均无法获取 %s 的行情，返回空数据。", ticker_symbol
         )
         return StockMarketDataDTO(ticker=ticker_symbol, source="fallback")
 
@@ -131,24 +170,81 @@ class QuoteService:
         """
         批量获取多个股票的行情数据。
 
+        先按市场分组，通过一次 Redis pipeline 从AKShare全市场缓存中批量命中，
+        只有未命中的股票才逐个降级到其他数据源。
+
         Args:
             symbols: 包含多个股票代码的列表 (e.g., ["600519", "00700", "AAPL"])
 
         Returns:
-            List[StockMarketDataDTO]: 包含多个行情数据的DTO对象列表
+            List[StockMarketDataDTO]: 包含多个行情数据的DTO对象列表，顺序与输入一致
         """
-        print(f"📦 [QuoteService] 开始批量获取 {len(symbols)} 个股票的行情数据")
-        quotes = []
-        for symbol in symbols:
-            # 依次调用单次获取方法
-            quotes.append(self.get_stock_quote(symbol))
+        logger.info("📦 [QuoteService] 开始批量获取 %d 个股票的行情数据", len(symbols))
+        process_symbol = self._processor.process_symbol
+        symbol_infos = [process_symbol(symbol) for symbol in symbols]
+
+        cached: Dict[str, Dict[str, dict]] = {}
+        if "akshare" in self.services:
+            keys_by_market: Dict[str, List[str]] = {}
+            for info in symbol_infos:
+                market = info["market_simple_name"]
+                if market in ("china", "hk", "us"):
+                    keys_by_market.setdefault(market, []).append(
+                        info["formats"]["cache_key"]
+                    )
+            try:
+                cached = self.market_cache.get_stocks_data_batch(keys_by_market)
+            except Exception as e:
+                logger.warning("❌ [QuoteService] 批量读取AKShare缓存失败: %s", e)
+
+        quotes: List[Optional[StockMarketDataDTO]] = [None] * len(symbol_infos)
+        misses = []
+        for index, info in enumerate(symbol_infos):
+            market_data = cached.get(info["market_simple_name"], {}).get(
+                info["formats"]["cache_key"]
+            )
+            if market_data:
+                quotes[index] = self._akshare_record_to_dto(info, market_data)
+            else:
+                misses.append(index)
+
+        # 未命中的股票并发降级，每只股票内部仍保持原有的数据源顺序
+        future_to_index = {
+            _FALLBACK_EXECUTOR.submit(
+                self._resolve_quote, symbol_infos[index], ("akshare",)
+            ): index
+            for index in misses
+        }
+        for future in as_completed(future_to_index):
+            index = future_to_index[future]
+            try:
+                quotes[index] = future.result()
+            except Exception as e:
+                ticker = symbol_infos[index]["formats"]["cache_key"]
+                logger.warning("❌ [QuoteService] 获取 %s 行情失败: %s", ticker, e)
+                quotes[index] = StockMarketDataDTO(ticker=ticker, source="fallback")
+
+        logger.info(
+            "📦 [QuoteService] 批量行情完成: 缓存命中 %d，降级 %d",
+            len(symbols) - len(misses),
+            len(misses),
+        )
         return quotes
 
     def _safe_decimal(
         self, value: any, default: Optional[Decimal] = None
     ) -> Optional[Decimal]:
         """安全地将值转换为Decimal，处理无效操作和None"""
-        if value is None or value == "" or pd.isna(value):
+        if value is None:
+            return default
+        # 快速路径：行情数据绝大多数是 float/int（含 numpy.float64），无需走 pandas
+        if isinstance(value, float):
+            if math.isnan(value):
+                return default
+            return Decimal(str(value))
+        if isinstance(value, int) and not isinstance(value, bool):
+            return Decimal(value)
+        if value == "" or pd.isna(value):
             return default
         try:
             # AKShare返回的可能是字符串'--'
@@ -176,7 +272,12 @@ class QuoteService:
         if not market_data:
             return None
 
-        # 将AKShare返回的字典映射到DTO
+        return self._akshare_record_to_dto(symbol_info, market_data)
+
+    def _akshare_record_to_dto(
+        self, symbol_info: Dict, market_data: Dict
+    ) -> StockMarketDataDTO:
+        """将AKShare全市场数据中的单行记录映射到DTO"""
         return StockMarketDataDTO(
             ticker=symbol_info["formats"]["cache_key"],
             currentPrice=self._safe_decimal(market_data.get("最新价")),
@@ -236,7 +337,7 @@ class QuoteService:
 
         # 如果Tushare返回的不是当天的数据，则认为获取失败，触发降级
         if not market_data.get("is_today", False):
-            print(f"ℹ️ [QuoteService] Tushare 未能获取到当天数据，将尝试下一个数据源。")
+            logger.debug("ℹ️ [QuoteService] Tushare 未能获取到当天数据，将尝试下一个数据源。")
             return None
 
         # Tushare数据映射
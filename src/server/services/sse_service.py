@@ -5,21 +5,52 @@ SSE (Server-Sent Events) 服务
 
 import asyncio
 import logging
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, Optional, Union
+
+from ..utils import json_utils
 
 logger = logging.getLogger(__name__)
 
+# 每个连接最多积压的消息数，慢客户端超出后丢弃最旧的消息
+SSE_QUEUE_MAXSIZE = 256
+
+
+@dataclass(frozen=True, slots=True)
+class SSEPayload:
+    """预先序列化的消息，广播时所有连接共享同一份编码结果"""
+
+    event: str
+    data: str
+
+    @classmethod
+    def from_message(cls, message: Dict[str, Any]) -> "SSEPayload":
+        return cls(
+            event=message.get("event", "message"), data=json_utils.dumps_str(message)
+        )
+
 
 class SSEConnection:
     """SSE 连接对象"""
 
-    def __init__(self, client_id: str, request):
+    def __init__(
+        self,
+        client_id: str,
+        request,
+        on_close: Optional[Callable[[str], None]] = None,
+    ):
         self.client_id = client_id
         self.request = request
         self.connected_at = datetime.now()
         self.last_ping = datetime.now()
-        self.message_queue = asyncio.Queue()
+        self.message_queue = asyncio.Queue(maxsize=SSE_QUEUE_MAXSIZE)
+        self.dropped_count = 0
+        # 投递计数和最近活跃时间由连接自身维护，热路径上无需加锁或查表
+        self.message_count = 0
+        self.last_activity = time.time()
+        self._on_close = on_close
         self._closed = False
 
     @property
@@ -27,20 +58,37 @@ class SSEConnection:
         return self._closed
 
     def close(self):
-        """关闭连接"""
+        """关闭连接，并通知管理器回收"""
+        if self._closed:
+            return
         self._closed = True
+        if self._on_close is not None:
+            self._on_close(self.client_id)
 
-    async def send_message(self, message: Dict[str, Any]) -> bool:
-        """发送消息到客户端"""
+    async def send_message(self, message: Union[Dict[str, Any], SSEPayload]) -> bool:
+        """发送消息到客户端（原始字典或预先序列化的 SSEPayload）"""
         if self._closed:
             return False
 
         try:
-            await self.message_queue.put(message)
+            queue = self.message_queue
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # 队列已满：丢弃最旧的一条，避免慢客户端拖住广播并无限占用内存
+                queue.get_nowait()
+                queue.put_nowait(message)
+                self.dropped_count += 1
+                if self.dropped_count == 1 or self.dropped_count % 100 == 0:
+                    logger.warning(
+                        f"⚠️ {self.client_id} 消费过慢，已丢弃 {self.dropped_count} 条旧消息"
+                    )
+            self.message_count += 1
+            self.last_activity = time.time()
             return True
         except Exception as e:
             logger.error(f"发送消息到 {self.client_id} 失败: {e}")
-            self._closed = True
+            self.close()
             return False
 
 
@@ -60,6 +108,8 @@ class SSEManager:
             self.connections: Dict[str, SSEConnection] = {}
             self.client_stats: Dict[str, Dict[str, Any]] = {}
             self._lock = asyncio.Lock()
+            # 连接关闭时推入 client_id，清理任务按需回收，无需定时全量扫描
+            self._closed_queue: asyncio.Queue = asyncio.Queue()
             self._cleanup_task = None
             SSEManager._initialized = True
             logger.info("🔧 SSE管理器初始化完成")
@@ -74,21 +124,19 @@ class SSEManager:
                 logger.warning(f"⚠️ 替换已存在的连接: {client_id}")
 
             # 创建新连接
-            connection = SSEConnection(client_id, request)
+            connection = SSEConnection(
+                client_id, request, on_close=self._closed_queue.put_nowait
+            )
             self.connections[client_id] = connection
 
             # 记录客户端统计
-            self.client_stats[client_id] = {
-                "connected_at": datetime.now(),
-                "message_count": 0,
-                "last_activity": datetime.now(),
-            }
+            self.client_stats[client_id] = {"connected_at": datetime.now()}
 
             logger.info(
                 f"✅ 添加SSE连接: {client_id} (总连接数: {len(self.connections)})"
             )
 
-            # 启动清理任务
+            # 首次连接时启动清理任务，之后在管理器生命周期内常驻
             if self._cleanup_task is None or self._cleanup_task.done():
                 self._cleanup_task = asyncio.create_task(self._cleanup_connections())
 
@@ -103,8 +151,7 @@ class SSEManager:
                 del self.connections[client_id]
 
                 # 保留统计信息一段时间
-                if client_id in self.client_stats:
-                    self.client_stats[client_id]["disconnected_at"] = datetime.now()
+                self._archive_stats(client_id, connection)
 
                 logger.info(
                     f"🔌 移除SSE连接: {client_id} (总连接数: {len(self.connections)})"
@@ -117,56 +164,56 @@ class SSEManager:
         self, client_id: str, message: Dict[str, Any]
     ) -> bool:
         """向指定客户端发送消息"""
-        async with self._lock:
-            if client_id not in self.connections:
-                logger.warning(f"⚠️ 客户端不存在: {client_id}")
-                return False
-
-            connection = self.connections[client_id]
-            if connection.is_closed:
-                logger.warning(f"⚠️ 连接已关闭: {client_id}")
-                return False
+        # 只读查找，单线程事件循环中无需加锁；锁只保护连接的增删
+        connection = self.connections.get(client_id)
+        if connection is None:
+            logger.warning(f"⚠️ 客户端不存在: {client_id}")
+            return False
 
-            success = await connection.send_message(message)
+        if connection.is_closed:
+            logger.warning(f"⚠️ 连接已关闭: {client_id}")
+            return False
 
-            if success and client_id in self.client_stats:
-                self.client_stats[client_id]["message_count"] += 1
-                self.client_stats[client_id]["last_activity"] = datetime.now()
+        return await connection.send_message(message)
 
-            return success
+    def _archive_stats(self, client_id: str, connection: SSEConnection):
+        """连接移除时把连接上的计数归档到 client_stats"""
+        stats = self.client_stats.get(client_id)
+        if stats is not None:
+            stats["message_count"] = connection.message_count
+            stats["last_activity"] = datetime.fromtimestamp(connection.last_activity)
+            stats["disconnected_at"] = datetime.now()
 
     async def broadcast_message(self, message: Dict[str, Any]) -> int:
         """向所有连接的客户端广播消息"""
-        success_count = 0
-
-        # 获取当前连接列表的副本，避免在迭代时修改
-        async with self._lock:
-            client_ids = list(self.connections.keys())
+        # 取连接快照，避免在迭代时被增删修改
+        connections = tuple(self.connections.values())
+        # 只序列化一次，所有连接共享同一份编码结果
+        payload = SSEPayload.from_message(message)
 
-        # 并发发送消息
-        tasks = []
-        for client_id in client_ids:
-            task = self.send_message_to_client(client_id, message)
-            tasks.append(task)
-
-        if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            success_count = sum(1 for result in results if result is True)
+        # 入队是非阻塞的，顺序投递即可，无需为每个连接创建协程任务
+        success_count = 0
+        for connection in connections:
+            if connection.is_closed:
+                continue
+            try:
+                if await connection.send_message(payload):
+                    success_count += 1
+            except Exception as e:
+                logger.error(f"广播消息到 {connection.client_id} 失败: {e}")
 
         logger.info(
-            f"📢 广播消息完成: {success_count}/{len(client_ids)} 客户端接收成功"
+            f"📢 广播消息完成: {success_count}/{len(connections)} 客户端接收成功"
         )
         return success_count
 
-    async def get_message_for_client(self, client_id: str) -> Optional[Dict[str, Any]]:
+    async def get_message_for_client(
+        self, client_id: str
+    ) -> Optional[Union[Dict[str, Any], SSEPayload]]:
         """获取客户端的待发送消息"""
-        async with self._lock:
-            if client_id not in self.connections:
-                return None
-
-            connection = self.connections[client_id]
-            if connection.is_closed:
-                return None
+        connection = self.connections.get(client_id)
+        if connection is None or connection.is_closed:
+            return None
 
         try:
             # 使用超时避免阻塞
@@ -185,66 +232,58 @@ class SSEManager:
         result = {}
         for client_id, connection in self.connections.items():
             if not connection.is_closed:
-                stats = self.client_stats.get(client_id, {})
                 result[client_id] = {
                     "connected_at": connection.connected_at.isoformat(),
                     "last_ping": connection.last_ping.isoformat(),
-                    "message_count": stats.get("message_count", 0),
-                    "last_activity": stats.get(
-                        "last_activity", datetime.now()
+                    "message_count": connection.message_count,
+                    "dropped_count": connection.dropped_count,
+                    "last_activity": datetime.fromtimestamp(
+                        connection.last_activity
                     ).isoformat(),
                 }
         return result
 
     async def get_connection_stats(self) -> Dict[str, Any]:
         """获取连接统计信息"""
-        async with self._lock:
-            active_count = len(
-                [c for c in self.connections.values() if not c.is_closed]
-            )
-            total_messages = sum(
-                stats.get("message_count", 0) for stats in self.client_stats.values()
-            )
+        active_count = len([c for c in self.connections.values() if not c.is_closed])
+        # 在线连接读自身计数，已断开的读归档统计
+        total_messages = sum(c.message_count for c in self.connections.values()) + sum(
+            stats.get("message_count", 0)
+            for client_id, stats in self.client_stats.items()
+            if client_id not in self.connections
+        )
 
-            return {
-                "active_connections": active_count,
-                "total_connections": len(self.connections),
-                "total_messages_sent": total_messages,
-                "connection_details": self.get_active_connections(),
-            }
+        return {
+            "active_connections": active_count,
+            "total_connections": len(self.connections),
+            "total_messages_sent": total_messages,
+            "connection_details": self.get_active_connections(),
+        }
 
     async def _cleanup_connections(self):
-        """清理已断开的连接"""
+        """
+        清理已断开的连接（由连接关闭事件驱动）
+
+        空闲时阻塞在关闭事件队列上，不占用 CPU；任务在管理器生命周期内常驻，
+        由 shutdown 取消
+        """
         while True:
             try:
-                await asyncio.sleep(30)  # 每30秒清理一次
+                client_id = await self._closed_queue.get()
 
                 async with self._lock:
-                    # 查找需要清理的连接
-                    to_remove = []
-                    for client_id, connection in self.connections.items():
-                        if connection.is_closed:
-                            to_remove.append(client_id)
-
-                    # 移除断开的连接
-                    for client_id in to_remove:
+                    # 同一 client_id 可能已被新连接替换，只回收仍处于关闭状态的连接
+                    connection = self.connections.get(client_id)
+                    if connection is not None and connection.is_closed:
                         del self.connections[client_id]
-                        if client_id in self.client_stats:
-                            self.client_stats[client_id][
-                                "disconnected_at"
-                            ] = datetime.now()
-
-                    if to_remove:
-                        logger.info(f"🧹 清理了 {len(to_remove)} 个断开的连接")
+                        self._archive_stats(client_id, connection)
+                        logger.info(f"🧹 清理断开的连接: {client_id}")
 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.error(f"连接清理任务错误: {e}")
 
-            # 如果没有活跃连接，停止清理任务
-            if not self.connections:
-                logger.info("📴 没有活跃连接，停止清理任务")
-                break
-
     async def ping_all_clients(self):
         """向所有客户端发送心跳"""
         ping_message = {
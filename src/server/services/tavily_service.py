@@ -2,13 +2,33 @@
 Tavily 搜索引擎服务
 """
 
+import copy
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 
+import requests
+from requests.adapters import HTTPAdapter
+
 from ...config.settings import Settings
+from ..utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# 搜索结果缓存：相同（或仅大小写/标点/空白不同的）查询在有效期内直接复用
+SEARCH_CACHE_MAXSIZE = 256
+SEARCH_CACHE_TTL = 3600
+
+_QUERY_TOKEN_RE = re.compile(r"\w+")
+
+# 批量搜索的最大并发数，同时作为对 Tavily API 的限流
+SEARCH_MAX_CONCURRENCY = 4
+# 进程内所有 TavilyService 共享的线程池（线程按需创建），总并发不超过上限
+_SEARCH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=SEARCH_MAX_CONCURRENCY, thread_name_prefix="tavily"
+)
+
 try:
     from tavily import TavilyClient
 except ImportError:
@@ -27,6 +47,7 @@ class TavilyService:
         """
         self.api_key = settings.tavily_api_key
         self.client = None
+        self._search_cache = TTLCache(SEARCH_CACHE_MAXSIZE, SEARCH_CACHE_TTL)
 
         if TavilyClient is None:
             logger.warning("⚠️ Tavily 客户端库未安装 (pip install tavily-python)")
@@ -37,20 +58,49 @@ class TavilyService:
         else:
             try:
                 self.client = TavilyClient(api_key=self.api_key)
+                self._enable_keep_alive(self.client)
                 logger.info("✅ Tavily 服务初始化成功")
             except Exception as e:
                 logger.error(f"❌ Tavily 客户端初始化失败: {e}")
 
+    @staticmethod
+    def _enable_keep_alive(client) -> None:
+        """
+        为客户端内部的 requests.Session 挂载更大的连接池，复用 TCP/TLS 连接
+
+        不同版本的 tavily-python 暴露的属性名不同，未暴露 Session 时保持原样
+        """
+        for attr in ("session", "_session"):
+            session = getattr(client, attr, None)
+            if isinstance(session, requests.Session):
+                adapter = HTTPAdapter(pool_connections=10, pool_maxsize=32)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                logger.debug(f"🔗 [Tavily] 已为 client.{attr} 启用连接池")
+                return
+        logger.debug("ℹ️ [Tavily] 客户端未暴露 requests.Session，使用其默认连接方式")
+
     def is_available(self) -> bool:
         """检查服务是否可用"""
         return self.client is not None
 
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """
+        查询归一化：小写、去标点并合并空白，保留词序
+
+        仅大小写、标点或空白不同的查询得到相同的键；词序不同的查询
+        （如 "apple buys" 与 "buys apple"）语义可能不同，不合并
+        """
+        return " ".join(_QUERY_TOKEN_RE.findall(query.lower()))
+
     def search(
         self,
         query: str,
         search_depth: str = "basic",
         max_results: int = 5,
         include_answer: bool = True,
+        use_cache: bool = True,
     ) -> Optional[Dict[str, Any]]:
         """
         执行 Tavily 搜索
@@ -60,6 +110,7 @@ class TavilyService:
             search_depth: 搜索深度 ("basic" 或 "advanced")
             max_results: 返回的最大结果数
             include_answer: 是否包含 AI 生成的答案
+            use_cache: 是否使用结果缓存（突发新闻等需要最新结果时传 False）
 
         Returns:
             搜索结果字典，如果服务不可用或搜索失败则返回 None
@@ -68,6 +119,19 @@ class TavilyService:
             logger.error("Tavily 服务不可用，无法执行搜索")
             return None
 
+        cache_key = (
+            self._normalize_query(query),
+            search_depth,
+            max_results,
+            include_answer,
+        )
+        if use_cache:
+            cached = self._search_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"📦 [Tavily] 命中搜索缓存: '{query}'")
+                # 返回副本，避免调用方修改共享的缓存条目
+                return copy.deepcopy(cached)
+
         try:
             logger.info(f"🔍 [Tavily] 正在执行搜索: '{query}' (深度: {search_depth})")
             response = self.client.search(
@@ -79,7 +143,42 @@ class TavilyService:
             logger.info(
                 f"✅ [Tavily] 搜索完成，获取到 {len(response.get('results', []))} 条结果"
             )
+            if response:
+                self._search_cache.set(cache_key, copy.deepcopy(response))
             return response
         except Exception as e:
             logger.error(f"❌ [Tavily] 搜索失败: {e}")
             return None
+
+    def search_batch(
+        self,
+        queries: List[str],
+        search_depth: str = "basic",
+        max_results: int = 5,
+        include_answer: bool = True,
+        use_cache: bool = True,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        并发执行多个相互独立的搜索
+
+        在共享线程池中执行，并发数受 SEARCH_MAX_CONCURRENCY 限制，
+        结果顺序与 queries 一致
+
+        Returns:
+            与 queries 一一对应的搜索结果列表，失败的查询为 None
+        """
+        if not queries:
+            return []
+
+        return list(
+            _SEARCH_EXECUTOR.map(
+                lambda query: self.search(
+                    query,
+                    search_depth=search_depth,
+                    max_results=max_results,
+                    include_answer=include_answer,
+                    use_cache=use_cache,
+                ),
+                queries,
+            )
+        )
@@ -3,6 +3,7 @@
 基于 cankao/tdx_utils.py 的功能，集成连接池和健康检查
 """
 
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
@@ -21,6 +22,12 @@ from ..core.connection_registry import get_connection_registry
 logger = logging.getLogger("tdx_service")
 warnings.filterwarnings("ignore")
 
+# get_security_quotes 单次请求最多支持的股票数量
+TDX_QUOTES_BATCH_SIZE = 80
+
+# K线周期到 get_security_bars category 参数的映射（9=日线, 5=周线, 6=月线）
+TDX_BAR_CATEGORIES = {"D": 9, "W": 5, "M": 6}
+
 
 class DataNotFoundError(Exception):
     """当API调用成功但未返回任何数据时引发的自定义异常"""
@@ -62,6 +69,20 @@ class TdxService:
         except Exception:
             return False
 
+    def _get_checked_api(self):
+        """
+        一次注册表查找完成健康检查并返回 TDX API 客户端
+
+        get_tdx 内部已做健康检查（必要时重连），无需再单独检查 connected
+        """
+        try:
+            api = self.connection_registry.get_tdx()
+        except Exception as e:
+            raise ConnectionError("通达信未连接") from e
+        if api is None:
+            raise ConnectionError("通达信未连接")
+        return api
+
     def _get_market_code(self, symbol: str) -> int:
         """
         根据股票代码判断市场
@@ -93,17 +114,16 @@ class TdxService:
         Returns:
             pd.DataFrame: 标准化后的历史行情数据
         """
-        if not self.connected or not self.api:
-            raise ConnectionError("通达信未连接")
+        api = self._get_checked_api()
 
         try:
             market_code = self._get_market_code(symbol)
             logger.info(f"🔄 通达信获取 {symbol} 数据 ({start_date} 到 {end_date})")
 
-            # 计算需要获取的数据量
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-            end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-            days_diff = (end_dt - start_dt).days
+            # 计算需要获取的数据量（兼容 YYYY-MM-DD 与 YYYYMMDD）
+            start_ts = pd.Timestamp(start_date)
+            end_ts = pd.Timestamp(end_date).normalize()
+            days_diff = (end_ts - start_ts).days
 
             # 根据周期调整数据量，并增加buffer
             if period == "D":
@@ -116,61 +136,70 @@ class TdxService:
                 count = 800
 
             # 获取K线数据
-            category_map = {"D": 9, "W": 5, "M": 6}
-            category = category_map.get(period.upper(), 9)
+            category = TDX_BAR_CATEGORIES.get(period.upper(), 9)
 
-            data = self.api.get_security_bars(category, market_code, symbol, 0, count)
+            data = api.get_security_bars(category, market_code, symbol, 0, count)
 
             if not data:
                 logger.warning(f"⚠️ 通达信返回空数据: {symbol}")
                 raise DataNotFoundError(f"未获取到 {symbol} 的历史数据")
 
-            # 转换为DataFrame并进行处理
-            df = pd.DataFrame(data)
-            df["datetime"] = pd.to_datetime(df["datetime"])
-            df = df.set_index("datetime")
-            df = df.sort_index()
-
-            # 筛选日期范围
-            df = df[start_date:end_date]
+            # 单次遍历拆成按列的数组，避免 list[dict] 构造 DataFrame 的装箱开销
+            dates, opens, highs, lows, closes, volumes, turnovers = (
+                [] for _ in range(7)
+            )
+            for bar in data:
+                dates.append(bar["datetime"])
+                opens.append(bar["open"])
+                highs.append(bar["high"])
+                lows.append(bar["low"])
+                closes.append(bar["close"])
+                volumes.append(bar["vol"])
+                turnovers.append(bar["amount"])
+
+            datetimes = pd.to_datetime(
+                dates, format="%Y-%m-%d %H:%M", cache=True
+            ).values
+            # pytdx 按时间升序返回，仅在异常情况下才排序
+            order = None
+            if len(datetimes) > 1 and (datetimes[1:] < datetimes[:-1]).any():
+                order = np.argsort(datetimes, kind="stable")
+                datetimes = datetimes[order]
+
+            # 二分查找日期范围，结束日期包含当天
+            lo = np.searchsorted(datetimes, start_ts.to_datetime64(), "left")
+            hi = np.searchsorted(
+                datetimes, (end_ts + pd.Timedelta(days=1)).to_datetime64(), "left"
+            )
 
-            if df.empty:
+            if lo >= hi:
                 raise DataNotFoundError(
                     f"在指定日期范围 {start_date} 到 {end_date} 内未找到 {symbol} 的数据"
                 )
 
-            # 标准化列名
-            df = df.rename(
-                columns={
-                    "open": "open",
-                    "high": "high",
-                    "low": "low",
-                    "close": "close",
-                    "vol": "volume",
-                    "amount": "turnover",
+            def column(values: list) -> np.ndarray:
+                array = np.asarray(values, dtype=np.float64)
+                if order is not None:
+                    array = array[order]
+                return array[lo:hi]
+
+            # 一次性由 numpy 数组构造标准化后的结果
+            df = pd.DataFrame(
+                {
+                    "date": datetimes[lo:hi],
+                    "code": symbol,
+                    "open": column(opens),
+                    "high": column(highs),
+                    "low": column(lows),
+                    "close": column(closes),
+                    "volume": column(volumes),
+                    "turnover": column(turnovers),
+                    "source": "tdx",
                 }
             )
-            df.index.name = "date"
-            df.reset_index(inplace=True)
-
-            # 添加股票代码和来源
-            df["code"] = symbol
-            df["source"] = "tdx"
 
             logger.info(f"✅ 获取 {symbol} 数据成功: {len(df)} 条")
-            return df[
-                [
-                    "date",
-                    "code",
-                    "open",
-                    "high",
-                    "low",
-                    "close",
-                    "volume",
-                    "turnover",
-                    "source",
-                ]
-            ]
+            return df
 
         except Exception as e:
             logger.error(f"❌ 获取 {symbol} 数据失败: {e}")
@@ -181,13 +210,12 @@ class TdxService:
         获取股票基本信息（主要为股票名称）
         通达信接口限制较多，主要用于获取名称。
         """
-        if not self.connected or not self.api:
-            raise ConnectionError("通达信未连接")
+        api = self._get_checked_api()
 
         try:
             market_code = self._get_market_code(symbol)
             # get_security_list 接口不稳定且信息有限，这里使用 get_security_quotes 获取实时快照中的名称
-            data = self.api.get_security_quotes([(market_code, symbol)])
+            data = api.get_security_quotes([(market_code, symbol)])
 
             if not data:
                 raise DataNotFoundError(f"无法从通达信获取 {symbol} 的信息")
@@ -211,42 +239,79 @@ class TdxService:
 
     def get_stock_quote(self, symbol: str) -> Dict[str, Any]:
         """获取股票实时行情快照"""
-        if not self.connected or not self.api:
-            raise ConnectionError("通达信未连接")
+        api = self._get_checked_api()
 
         try:
             market_code = self._get_market_code(symbol)
-            data = self.api.get_security_quotes([(market_code, symbol)])
+            data = api.get_security_quotes([(market_code, symbol)])
 
             if not data:
                 raise DataNotFoundError(f"未获取到 {symbol} 的实时行情")
 
-            quote = data[0]
-            last_close = quote.get("last_close", 0)
-            price = quote.get("price", 0)
-            change_percent = (
-                ((price - last_close) / last_close * 100) if last_close > 0 else 0
-            )
-
-            return {
-                "code": symbol,
-                "name": quote.get("name", f"股票{symbol}"),
-                "price": price,
-                "last_close": last_close,
-                "open": quote.get("open", 0),
-                "high": quote.get("high", 0),
-                "low": quote.get("low", 0),
-                "volume": quote.get("vol", 0),
-                "turnover": quote.get("amount", 0),
-                "change": price - last_close,
-                "change_percent": change_percent,
-                "update_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "source": "tdx",
-            }
+            return self._format_quote(symbol, data[0])
         except Exception as e:
             logger.error(f"❌ 获取 {symbol} 实时行情失败: {e}")
             raise
 
+    def get_stock_quotes_bulk(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        批量获取多只股票的实时行情快照
+
+        每 TDX_QUOTES_BATCH_SIZE 只股票合并为一次 get_security_quotes 请求
+
+        Args:
+            symbols: 股票代码列表 (e.g., ["600519", "000001"])
+
+        Returns:
+            Dict[str, Dict]: {symbol: 行情快照}，获取失败的股票不出现在结果中
+        """
+        api = self._get_checked_api()
+        symbols = list(dict.fromkeys(symbols))
+        results: Dict[str, Dict[str, Any]] = {}
+        for offset in range(0, len(symbols), TDX_QUOTES_BATCH_SIZE):
+            chunk = symbols[offset : offset + TDX_QUOTES_BATCH_SIZE]
+            pairs = [(self._get_market_code(symbol), symbol) for symbol in chunk]
+            try:
+                data = api.get_security_quotes(pairs)
+            except Exception as e:
+                logger.error(f"❌ 批量获取实时行情失败 ({len(chunk)} 只): {e}")
+                continue
+
+            # 按返回的代码回填，避免服务端遗漏个别股票时错位
+            requested = set(chunk)
+            for quote in data or []:
+                symbol = quote.get("code")
+                if symbol in results or symbol not in requested:
+                    continue
+                results[symbol] = self._format_quote(symbol, quote)
+
+        logger.info(f"✅ 批量获取实时行情: {len(results)}/{len(symbols)} 成功")
+        return results
+
+    def _format_quote(self, symbol: str, quote: Dict[str, Any]) -> Dict[str, Any]:
+        """将 get_security_quotes 的单条结果转换为标准行情快照"""
+        last_close = quote.get("last_close", 0)
+        price = quote.get("price", 0)
+        change_percent = (
+            ((price - last_close) / last_close * 100) if last_close > 0 else 0
+        )
+
+        return {
+            "code": symbol,
+            "name": quote.get("name", f"股票{symbol}"),
+            "price": price,
+            "last_close": last_close,
+            "open": quote.get("open", 0),
+            "high": quote.get("high", 0),
+            "low": quote.get("low", 0),
+            "volume": quote.get("vol", 0),
+            "turnover": quote.get("amount", 0),
+            "change": price - last_close,
+            "change_percent": change_percent,
+            "update_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "source": "tdx",
+        }
+
 
 # ==================== 便捷函数 ====================
 
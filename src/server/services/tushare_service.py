@@ -9,6 +9,7 @@ from typing import Dict, Optional, Any
 from datetime import datetime, timedelta
 import logging
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 try:
     import tushare as ts
@@ -16,12 +17,80 @@ except ImportError:
     ts = None
 
 from ..utils.symbol_processor import get_symbol_processor
+from ..utils.ttl_cache import TTLCache
+from ..utils.tushare_cache import (
+    TUSHARE_DAILY_CACHE_TTL,
+    TUSHARE_FILING_WINDOW_DAYS,
+    TUSHARE_FUNDAMENTALS_CACHE_TTL,
+    TUSHARE_INTRADAY_CACHE_TTL,
+    TUSHARE_RECENT_FUNDAMENTALS_CACHE_TTL,
+    get_tushare_cache,
+)
 from ..exception.exception import DataNotFoundError
 from ..core.connection_registry import get_connection_registry
 
 logger = logging.getLogger("tushare_service")
 warnings.filterwarnings("ignore")
 
+# 日线数据列名标准化映射
+TUSHARE_COLUMN_MAPPING = {
+    "trade_date": "date",
+    "ts_code": "code",
+    "vol": "volume",
+    "amount": "turnover",
+}
+
+# 股票基本信息（名称、行业、上市日期等）几乎不变，进程内缓存
+STOCK_INFO_CACHE_MAXSIZE = 4096
+STOCK_INFO_CACHE_TTL = 86400
+
+# 财务报表接口：结果键 -> (Tushare 接口名, 名称, 字段)
+FUNDAMENTAL_ENDPOINTS = {
+    "balance_sheet": (
+        "balancesheet",
+        "资产负债表",
+        "ts_code,ann_date,f_ann_date,end_date,report_type,"
+        "total_assets,total_liab,total_hldr_eqy_exc_min_int,"
+        "money_cap,accounts_receiv,inventories,fix_assets,"
+        "lt_borr,st_borr,notes_payable,acct_payable,"
+        "cap_rese,surplus_rese,undistr_porfit",
+    ),
+    "income_statement": (
+        "income",
+        "利润表",
+        "ts_code,ann_date,f_ann_date,end_date,report_type,"
+        "total_revenue,revenue,operate_profit,total_profit,"
+        "n_income,n_income_attr_p,basic_eps,diluted_eps,"
+        "total_cogs,sell_exp,admin_exp,fin_exp,"
+        "oper_cost,rd_exp,ebit,ebitda",
+    ),
+    "cash_flow": (
+        "cashflow",
+        "现金流量表",
+        "ts_code,ann_date,f_ann_date,end_date,report_type,"
+        "n_cashflow_act,n_cashflow_inv_act,"
+        "n_cash_flows_fnc_act,c_fr_sale_sg,c_paid_goods_s,"
+        "c_paid_to_for_empl,c_paid_for_taxes,net_profit,"
+        "finan_exp,im_n_incr_cash_equ,free_cashflow",
+    ),
+    "fina_indicator": (
+        "fina_indicator",
+        "财务指标",
+        "ts_code,ann_date,f_ann_date,end_date,"
+        "eps,dt_eps,roe,roe_waa,roe_dt,roa,bps,ocfps,"
+        "gross_margin,current_ratio,quick_ratio,"
+        "debt_to_assets,assets_to_eqt,debt_to_eqt,"
+        "netprofit_margin,grossprofit_margin,"
+        "profit_to_gr,or_yoy,q_sales_yoy,netprofit_yoy",
+    ),
+}
+
+# 财务报表并发请求的线程池：QuoteService 等会直接构造 TushareService，
+# 线程池放在模块级由所有实例共享，避免每个实例各开一个池而泄漏线程
+_FUNDAMENTALS_EXECUTOR = ThreadPoolExecutor(
+    max_workers=len(FUNDAMENTAL_ENDPOINTS), thread_name_prefix="tushare"
+)
+
 
 class TushareService:
     """封装Tushare API的数据服务（使用统一连接管理）"""
@@ -30,6 +99,11 @@ class TushareService:
         """初始化Tushare服务"""
         self.connection_registry = get_connection_registry()
         self.symbol_processor = get_symbol_processor()
+        self._stock_info_cache = TTLCache(
+            STOCK_INFO_CACHE_MAXSIZE, STOCK_INFO_CACHE_TTL
+        )
+        # 日线和财务报表的本地文件缓存
+        self.disk_cache = get_tushare_cache()
 
         # 验证 Tushare 连接是否可用（不强制要求）
         try:
@@ -63,7 +137,7 @@ class TushareService:
 
         try:
             # 标准化股票代码
-            ts_code = self.symbol_processor.get_tushare_format(symbol)
+            ts_code = self._to_ts_code(symbol)
 
             # 设置默认日期
             if end_date is None:
@@ -79,8 +153,13 @@ class TushareService:
             logger.info(f"🔄 Tushare获取{ts_code}数据 ({start_date} 到 {end_date})")
 
             # 获取日线数据
-            data = self.pro.daily(
-                ts_code=ts_code, start_date=start_date, end_date=end_date
+            data = self.disk_cache.call(
+                "daily",
+                self._daily_cache_ttl(end_date),
+                self.pro.daily,
+                ts_code=ts_code,
+                start_date=start_date,
+                end_date=end_date,
             )
 
             if data is None or data.empty:
@@ -104,6 +183,28 @@ class TushareService:
             logger.error(f"❌ 获取{symbol}数据失败: {e}")
             raise
 
+    def _to_ts_code(self, symbol: str) -> str:
+        """转换为Tushare代码格式（复用 process_symbol 的按代码缓存结果）"""
+        return self.symbol_processor.process_symbol(symbol)["formats"]["tushare"]
+
+    @staticmethod
+    def _daily_cache_ttl(end_date: Optional[str]) -> int:
+        """日线缓存时长：区间包含当天时数据仍会变化，只短暂缓存"""
+        if end_date and end_date < datetime.now().strftime("%Y%m%d"):
+            return TUSHARE_DAILY_CACHE_TTL
+        return TUSHARE_INTRADAY_CACHE_TTL
+
+    @staticmethod
+    def _fundamentals_cache_ttl(period: str) -> int:
+        """财报缓存时长：报告期结束后的披露窗口内报表可能新发布或更正，只短暂缓存"""
+        try:
+            period_end = datetime.strptime(period, "%Y%m%d")
+        except ValueError:
+            return TUSHARE_RECENT_FUNDAMENTALS_CACHE_TTL
+        if datetime.now() - period_end > timedelta(days=TUSHARE_FILING_WINDOW_DAYS):
+            return TUSHARE_FUNDAMENTALS_CACHE_TTL
+        return TUSHARE_RECENT_FUNDAMENTALS_CACHE_TTL
+
     def _calculate_forward_adjusted_prices(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         基于pct_chg计算前复权价格
@@ -116,54 +217,40 @@ class TushareService:
             return data
 
         try:
-            # 复制数据避免修改原始数据
-            adjusted_data = data.copy()
-            adjusted_data = adjusted_data.sort_values("trade_date").reset_index(
-                drop=True
+            # 排序本身返回新的DataFrame，无需再额外复制一份
+            adjusted_data = data.sort_values("trade_date", ignore_index=True)
+
+            # 原始价格直接取 numpy 数组，后续计算不再复制整列
+            close_raw = adjusted_data["close"].to_numpy(dtype=np.float64)
+            open_raw = adjusted_data["open"].to_numpy(dtype=np.float64)
+            high_raw = adjusted_data["high"].to_numpy(dtype=np.float64)
+            low_raw = adjusted_data["low"].to_numpy(dtype=np.float64)
+
+            # 从最新的收盘价开始，向前计算前复权价格：
+            # 前一天的前复权收盘价 = 今天的前复权收盘价 / (1 + 今天的涨跌幅)，
+            # 即第 i 天 = 最新收盘价 / prod(1 + pct_chg[i+1:])，用一次反向 cumprod 完成
+            growth = 1.0 + adjusted_data["pct_chg"].to_numpy(dtype=np.float64) / 100.0
+            adjusted_closes = np.empty_like(growth)
+            adjusted_closes[-1] = close_raw[-1]
+            adjusted_closes[:-1] = (
+                adjusted_closes[-1] / np.cumprod(growth[:0:-1])[::-1]
             )
 
-            # 保存原始价格列
-            adjusted_data["close_raw"] = adjusted_data["close"].copy()
-            adjusted_data["open_raw"] = adjusted_data["open"].copy()
-            adjusted_data["high_raw"] = adjusted_data["high"].copy()
-            adjusted_data["low_raw"] = adjusted_data["low"].copy()
-
-            # 从最新的收盘价开始，向前计算前复权价格
-            latest_close = float(adjusted_data.iloc[-1]["close"])
-
-            # 计算前复权收盘价
-            adjusted_closes = [latest_close]
-
-            # 从倒数第二天开始向前计算
-            for i in range(len(adjusted_data) - 2, -1, -1):
-                pct_change = float(adjusted_data.iloc[i + 1]["pct_chg"]) / 100.0
-
-                # 前一天的前复权收盘价 = 今天的前复权收盘价 / (1 + 今天的涨跌幅)
-                prev_close = adjusted_closes[0] / (1 + pct_change)
-                adjusted_closes.insert(0, prev_close)
+            # 按调整比例整体缩放其他价格（原始收盘价为0的行保持不变）
+            adjustment_ratio = np.ones_like(close_raw)
+            np.divide(
+                adjusted_closes, close_raw, out=adjustment_ratio, where=close_raw != 0
+            )
 
-            # 更新收盘价
+            # 保存原始价格列，并写回调整后的价格
+            adjusted_data["close_raw"] = close_raw
+            adjusted_data["open_raw"] = open_raw
+            adjusted_data["high_raw"] = high_raw
+            adjusted_data["low_raw"] = low_raw
             adjusted_data["close"] = adjusted_closes
-
-            # 计算其他价格的调整比例
-            for i in range(len(adjusted_data)):
-                if adjusted_data.iloc[i]["close_raw"] != 0:
-                    # 计算调整比例
-                    adjustment_ratio = (
-                        adjusted_data.iloc[i]["close"]
-                        / adjusted_data.iloc[i]["close_raw"]
-                    )
-
-                    # 应用调整比例到其他价格
-                    adjusted_data.iloc[i, adjusted_data.columns.get_loc("open")] = (
-                        adjusted_data.iloc[i]["open_raw"] * adjustment_ratio
-                    )
-                    adjusted_data.iloc[i, adjusted_data.columns.get_loc("high")] = (
-                        adjusted_data.iloc[i]["high_raw"] * adjustment_ratio
-                    )
-                    adjusted_data.iloc[i, adjusted_data.columns.get_loc("low")] = (
-                        adjusted_data.iloc[i]["low_raw"] * adjustment_ratio
-                    )
+            adjusted_data["open"] = open_raw * adjustment_ratio
+            adjusted_data["high"] = high_raw * adjustment_ratio
+            adjusted_data["low"] = low_raw * adjustment_ratio
 
             # 添加标记
             adjusted_data["price_type"] = "forward_adjusted"
@@ -181,22 +268,17 @@ class TushareService:
             return data
 
         try:
-            # 重命名列
-            column_mapping = {
-                "trade_date": "date",
-                "ts_code": "code",
-                "vol": "volume",
-                "amount": "turnover",
-            }
-
-            for old_col, new_col in column_mapping.items():
-                if old_col in data.columns:
-                    data = data.rename(columns={old_col: new_col})
+            # 重命名列（缺失的列自动忽略，一次完成）
+            data = data.rename(columns=TUSHARE_COLUMN_MAPPING)
 
             # 确保日期格式
             if "date" in data.columns:
                 data["date"] = pd.to_datetime(data["date"])
 
+            # 股票代码在每行重复，转为分类类型以节省内存并加速比较/分组
+            if "code" in data.columns:
+                data["code"] = data["code"].astype("category")
+
             # 计算涨跌幅（如果没有）
             if "pct_chg" not in data.columns and "close" in data.columns:
                 data = data.sort_values("date")
@@ -214,7 +296,11 @@ class TushareService:
             raise ConnectionError("Tushare未连接")
 
         try:
-            ts_code = self.symbol_processor.get_tushare_format(symbol)
+            ts_code = self._to_ts_code(symbol)
+
+            cached = self._stock_info_cache.get(ts_code)
+            if cached is not None:
+                return {**cached, "symbol": symbol}
 
             basic_info = self.pro.stock_basic(
                 ts_code=ts_code,
@@ -225,7 +311,7 @@ class TushareService:
                 raise DataNotFoundError(f"未找到 {ts_code} 的股票信息")
 
             info = basic_info.iloc[0]
-            return {
+            stock_info = {
                 "symbol": symbol,
                 "ts_code": info["ts_code"],
                 "name": info["name"],
@@ -235,6 +321,8 @@ class TushareService:
                 "list_date": info.get("list_date", ""),
                 "source": "tushare",
             }
+            self._stock_info_cache.set(ts_code, stock_info)
+            return dict(stock_info)
 
         except Exception as e:
             logger.error(f"❌ 获取{symbol}股票信息失败: {e}")
@@ -249,7 +337,7 @@ class TushareService:
 
         try:
             # 标准化港股代码
-            ts_code = self.symbol_processor.get_tushare_format(symbol)
+            ts_code = self._to_ts_code(symbol)
 
             # 格式化日期
             start_date_formatted = start_date.replace("-", "") if start_date else None
@@ -260,7 +348,10 @@ class TushareService:
             )
 
             # 获取港股日线数据
-            data = self.pro.hk_daily(
+            data = self.disk_cache.call(
+                "hk_daily",
+                self._daily_cache_ttl(end_date_formatted),
+                self.pro.hk_daily,
                 ts_code=ts_code,
                 start_date=start_date_formatted,
                 end_date=end_date_formatted,
@@ -286,22 +377,17 @@ class TushareService:
             return data
 
         try:
-            # 重命名列
-            column_mapping = {
-                "trade_date": "date",
-                "ts_code": "code",
-                "vol": "volume",
-                "amount": "turnover",
-            }
-
-            for old_col, new_col in column_mapping.items():
-                if old_col in data.columns:
-                    data = data.rename(columns={old_col: new_col})
+            # 重命名列（缺失的列自动忽略，一次完成）
+            data = data.rename(columns=TUSHARE_COLUMN_MAPPING)
 
             # 确保日期格式
             if "date" in data.columns:
                 data["date"] = pd.to_datetime(data["date"])
 
+            # 股票代码在每行重复，转为分类类型以节省内存并加速比较/分组
+            if "code" in data.columns:
+                data["code"] = data["code"].astype("category")
+
             return data
 
         except Exception as e:
@@ -355,7 +441,7 @@ class TushareService:
             logger.info(f"📅 自动选择报告期: {period}")
 
         try:
-            ts_code = self.symbol_processor.get_tushare_format(symbol)
+            ts_code = self._to_ts_code(symbol)
             logger.info(f"📊 获取{ts_code}财务数据，报告期: {period}")
 
             fundamentals = {
@@ -365,6 +451,22 @@ class TushareService:
                 "source": "tushare",
             }
 
+            # 四张报表互不依赖，并发请求；基本信息在当前线程同时获取
+            pro = self.pro
+            cache_ttl = self._fundamentals_cache_ttl(period)
+            future_to_key = {
+                _FUNDAMENTALS_EXECUTOR.submit(
+                    self.disk_cache.call,
+                    endpoint,
+                    cache_ttl,
+                    getattr(pro, endpoint),
+                    ts_code=ts_code,
+                    period=period,
+                    fields=fields,
+                ): key
+                for key, (endpoint, _, fields) in FUNDAMENTAL_ENDPOINTS.items()
+            }
+
             # 获取基本信息
             try:
                 basic_info = self.get_stock_info(symbol)
@@ -373,92 +475,21 @@ class TushareService:
                 logger.warning(f"⚠️ 获取股票基本信息失败: {e}")
                 fundamentals["basic_info"] = {}
 
-            # 获取资产负债表 (balancesheet)
-            try:
-                balance_sheet = self.pro.balancesheet(
-                    ts_code=ts_code,
-                    period=period,
-                    fields="ts_code,ann_date,f_ann_date,end_date,report_type,"
-                    "total_assets,total_liab,total_hldr_eqy_exc_min_int,"
-                    "money_cap,accounts_receiv,inventories,fix_assets,"
-                    "lt_borr,st_borr,notes_payable,acct_payable,"
-                    "cap_rese,surplus_rese,undistr_porfit",
-                )
-                if balance_sheet is not None and not balance_sheet.empty:
-                    fundamentals["balance_sheet"] = balance_sheet.iloc[0].to_dict()
-                    logger.info(f"✅ 获取资产负债表成功")
-                else:
-                    logger.warning(f"⚠️ 资产负债表数据为空")
-                    fundamentals["balance_sheet"] = {}
-            except Exception as e:
-                logger.warning(f"⚠️ 获取资产负债表失败: {e}")
-                fundamentals["balance_sheet"] = {}
-
-            # 获取利润表 (income)
-            try:
-                income_statement = self.pro.income(
-                    ts_code=ts_code,
-                    period=period,
-                    fields="ts_code,ann_date,f_ann_date,end_date,report_type,"
-                    "total_revenue,revenue,operate_profit,total_profit,"
-                    "n_income,n_income_attr_p,basic_eps,diluted_eps,"
-                    "total_cogs,sell_exp,admin_exp,fin_exp,"
-                    "oper_cost,rd_exp,ebit,ebitda",
-                )
-                if income_statement is not None and not income_statement.empty:
-                    fundamentals["income_statement"] = income_statement.iloc[
-                        0
-                    ].to_dict()
-                    logger.info(f"✅ 获取利润表成功")
-                else:
-                    logger.warning(f"⚠️ 利润表数据为空")
-                    fundamentals["income_statement"] = {}
-            except Exception as e:
-                logger.warning(f"⚠️ 获取利润表失败: {e}")
-                fundamentals["income_statement"] = {}
-
-            # 获取现金流量表 (cashflow)
-            try:
-                cash_flow = self.pro.cashflow(
-                    ts_code=ts_code,
-                    period=period,
-                    fields="ts_code,ann_date,f_ann_date,end_date,report_type,"
-                    "n_cashflow_act,n_cashflow_inv_act,"
-                    "n_cash_flows_fnc_act,c_fr_sale_sg,c_paid_goods_s,"
-                    "c_paid_to_for_empl,c_paid_for_taxes,net_profit,"
-                    "finan_exp,im_n_incr_cash_equ,free_cashflow",
-                )
-                if cash_flow is not None and not cash_flow.empty:
-                    fundamentals["cash_flow"] = cash_flow.iloc[0].to_dict()
-                    logger.info(f"✅ 获取现金流量表成功")
-                else:
-                    logger.warning(f"⚠️ 现金流量表数据为空")
-                    fundamentals["cash_flow"] = {}
-            except Exception as e:
-                logger.warning(f"⚠️ 获取现金流量表失败: {e}")
-                fundamentals["cash_flow"] = {}
-
-            # 获取财务指标 (fina_indicator)
-            try:
-                fina_indicator = self.pro.fina_indicator(
-                    ts_code=ts_code,
-                    period=period,
-                    fields="ts_code,ann_date,f_ann_date,end_date,"
-                    "eps,dt_eps,roe,roe_waa,roe_dt,roa,bps,ocfps,"
-                    "gross_margin,current_ratio,quick_ratio,"
-                    "debt_to_assets,assets_to_eqt,debt_to_eqt,"
-                    "netprofit_margin,grossprofit_margin,"
-                    "profit_to_gr,or_yoy,q_sales_yoy,netprofit_yoy",
-                )
-                if fina_indicator is not None and not fina_indicator.empty:
-                    fundamentals["fina_indicator"] = fina_indicator.iloc[0].to_dict()
-                    logger.info(f"✅ 获取财务指标成功")
-                else:
-                    logger.warning(f"⚠️ 财务指标数据为空")
-                    fundamentals["fina_indicator"] = {}
-            except Exception as e:
-                logger.warning(f"⚠️ 获取财务指标失败: {e}")
-                fundamentals["fina_indicator"] = {}
+            # 逐个处理结果，单个报表失败不影响其他报表
+            for future in as_completed(future_to_key):
+                key = future_to_key[future]
+                label = FUNDAMENTAL_ENDPOINTS[key][1]
+                try:
+                    result = future.result()
+                    if result is not None and not result.empty:
+                        fundamentals[key] = result.iloc[0].to_dict()
+                        logger.info(f"✅ 获取{label}成功")
+                    else:
+                        logger.warning(f"⚠️ {label}数据为空")
+                        fundamentals[key] = {}
+                except Exception as e:
+                    logger.warning(f"⚠️ 获取{label}失败: {e}")
+                    fundamentals[key] = {}
 
             # 整合核心财务数据到 financial_data 字段
             financial_data = {}
@@ -573,45 +604,48 @@ class TushareService:
             ts_code = info.get("ts_code", symbol)
             name = info.get("name", symbol)
 
-            # 计算统计数据
-            latest_data = data.iloc[-1]
-            current_price = f"¥{latest_data['close']:.2f}"
+            # 计算统计数据：一次 agg 取区间极值，最近两天收盘价取 numpy 视图
+            stats = data.agg({"high": "max", "low": "min"})
+            last_closes = data["close"].tail(2).to_numpy()
+            current_price = f"¥{last_closes[-1]:.2f}"
 
             # 计算涨跌幅
             change_pct_str = "N/A"
-            if len(data) > 1:
-                prev_close = data.iloc[-2]["close"]
-                change_pct = (latest_data["close"] - prev_close) / prev_close * 100
+            if len(last_closes) == 2:
+                change_pct = (last_closes[-1] / last_closes[-2] - 1) * 100
                 change_pct_str = f"{change_pct:+.2f}%"
 
-            volume = latest_data.get("volume", 0)
+            volume = data["volume"].iat[-1] if "volume" in data.columns else 0
             volume_str = (
                 f"{volume / 10000:.1f}万手" if volume > 10000 else f"{volume:.0f}手"
             )
 
-            # 生成报告
-            report = f"# {name}（{ts_code}）股票数据分析\n\n"
-            report += f"## 📊 实时行情\n"
-            report += f"- 股票代码: {ts_code}\n"
-            report += f"- 股票名称: {name}\n"
-            report += f"- 当前价格: {current_price}\n"
-            report += f"- 涨跌幅: {change_pct_str}\n"
-            report += f"- 成交量: {volume_str}\n"
-            report += f"- 数据来源: Tushare\n\n"
-
-            report += f"## 📈 历史数据概览\n"
-            report += f"- 数据期间: {start_date} 至 {end_date}\n"
-            report += f"- 数据条数: {len(data)}条\n"
-            report += f"- 期间最高: ¥{data['high'].max():.2f}\n"
-            report += f"- 期间最低: ¥{data['low'].min():.2f}\n\n"
-
-            report += "## 📋 最新交易数据 (最近5天)\n"
             display_columns = [
                 c
                 for c in ["date", "open", "high", "low", "close", "volume"]
                 if c in data.columns
             ]
-            report += data[display_columns].tail(5).to_markdown(index=False)
+
+            # 生成报告
+            report = "".join(
+                [
+                    f"# {name}（{ts_code}）股票数据分析\n\n",
+                    "## 📊 实时行情\n",
+                    f"- 股票代码: {ts_code}\n",
+                    f"- 股票名称: {name}\n",
+                    f"- 当前价格: {current_price}\n",
+                    f"- 涨跌幅: {change_pct_str}\n",
+                    f"- 成交量: {volume_str}\n",
+                    "- 数据来源: Tushare\n\n",
+                    "## 📈 历史数据概览\n",
+                    f"- 数据期间: {start_date} 至 {end_date}\n",
+                    f"- 数据条数: {len(data)}条\n",
+                    f"- 期间最高: ¥{stats['high']:.2f}\n",
+                    f"- 期间最低: ¥{stats['low']:.2f}\n\n",
+                    "## 📋 最新交易数据 (最近5天)\n",
+                    data[display_columns].tail(5).to_markdown(index=False),
+                ]
+            )
 
             return report
 
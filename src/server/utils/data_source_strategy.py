@@ -3,12 +3,24 @@
 根据股票类型智能选择和排序数据源优先级
 """
 
-from typing import List, Dict
-from .symbol_processor import get_symbol_processor
+from typing import List, Dict, Tuple
+from .symbol_processor import get_symbol_processor, get_market_key
 import logging
 
 logger = logging.getLogger("data_source_strategy")
 
+# 市场数据(K线、行情)的数据源优先级
+MARKET_DATA_SOURCES: Dict[str, Tuple[str, ...]] = {
+    # A股：Tushare > 通达信 > AKShare
+    "china": ("tushare", "tdx", "akshare"),
+    # 港股：AKShare > Tushare > YFinance
+    "hk": ("akshare", "tushare", "yfinance"),
+    # 美股：YFinance > AKShare
+    "us": ("yfinance", "akshare"),
+    # 未知市场：尝试所有数据源
+    "other": ("yfinance", "akshare", "tushare", "tdx"),
+}
+
 
 class DataSourceStrategy:
     """数据源策略管理器"""
@@ -27,19 +39,7 @@ class DataSourceStrategy:
             List[str]: 数据源优先级列表
         """
         classification = self.symbol_processor.classifier.classify_stock(symbol)
-
-        if classification["is_china"]:
-            # A股：Tushare > 通达信 > AKShare
-            return ["tushare", "tdx", "akshare"]
-        elif classification["is_hk"]:
-            # 港股：AKShare > Tushare > YFinance
-            return ["akshare", "tushare", "yfinance"]
-        elif classification["is_us"]:
-            # 美股：YFinance > AKShare
-            return ["yfinance", "akshare"]
-        else:
-            # 未知市场：尝试所有数据源
-            return ["yfinance", "akshare", "tushare", "tdx"]
+        return list(MARKET_DATA_SOURCES[get_market_key(classification)])
 
     def get_fundamental_data_sources(self, symbol: str) -> List[str]:
         """
@@ -0,0 +1,58 @@
+"""
+JSON 编解码工具
+优先使用 orjson（C 实现，直接输出 bytes），未安装时回退到标准库 json
+"""
+
+import dataclasses
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """处理 JSON 无法直接序列化的类型"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, "isoformat"):
+        # pandas.Timestamp 等
+        return obj.isoformat()
+    if hasattr(obj, "item"):
+        # numpy 标量
+        return obj.item()
+    if hasattr(obj, "tolist"):
+        # numpy 数组
+        return obj.tolist()
+    return str(obj)
+
+
+def dumps(obj: Any) -> bytes:
+    """序列化为 UTF-8 编码的 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+    return json.dumps(obj, ensure_ascii=False, default=_default).encode("utf-8")
+
+
+def dumps_str(obj: Any) -> str:
+    """序列化为 JSON 字符串"""
+    return dumps(obj).decode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """反序列化 JSON（支持 bytes / str）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -300,6 +300,55 @@ class RedisCache:
             logger.error(f"❌ 获取股票信息缓存失败 {symbol}: {e}")
             return None
 
+    def set_news_data(
+        self, identifier: str, news: List[Dict[str, Any]], expire_seconds: int = 3600
+    ) -> bool:
+        """
+        缓存新闻列表
+
+        Args:
+            identifier: 缓存标识（数据源:代码:日期范围）
+            news: 新闻字典列表
+            expire_seconds: Redis中保留时间（秒），应覆盖过期后的兜底窗口
+
+        Returns:
+            bool: 是否缓存成功
+        """
+        try:
+            if not self.connected:
+                return False
+
+            cache_key = self._get_cache_key("news", identifier)
+            payload = {"data": news, "cached_at": time.time()}
+            self.redis_client.setex(
+                cache_key, expire_seconds, json.dumps(payload, ensure_ascii=False)
+            )
+            return True
+        except Exception as e:
+            logger.error(f"❌ 缓存新闻失败 {identifier}: {e}")
+            return False
+
+    def get_news_data(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        获取缓存的新闻列表
+
+        Returns:
+            Optional[Dict]: {"data": 新闻字典列表, "cached_at": 写入时间戳}
+        """
+        try:
+            if not self.connected:
+                return None
+
+            cache_key = self._get_cache_key("news", identifier)
+            cached_data = self.redis_client.get(cache_key)
+
+            if cached_data:
+                return json.loads(cached_data)
+            return None
+        except Exception as e:
+            logger.error(f"❌ 获取新闻缓存失败 {identifier}: {e}")
+            return None
+
     def clear_cache(self, pattern: str = "stock_srv:*") -> int:
         """
         清除缓存
@@ -743,12 +792,8 @@ class AKShareMarketCache:
         if market_data is None or market_data.empty:
             return {}
 
-        results = {}
         try:
-            for symbol in symbols:
-                stock_data = market_data[market_data["代码"] == symbol]
-                if not stock_data.empty:
-                    results[symbol] = stock_data.iloc[0].to_dict()
+            results = self._extract_stocks(market_type, market_data, symbols)
 
             market_name = {"china": "A股", "hk": "港股", "us": "美股"}[market_type]
             logger.info(
@@ -761,6 +806,99 @@ class AKShareMarketCache:
             logger.error(f"❌ 批量获取{market_name}股票数据失败: {e}")
             return {}
 
+    def get_stocks_data_batch(
+        self, keys_by_market: Dict[str, List[str]]
+    ) -> Dict[str, Dict[str, dict]]:
+        """
+        跨市场批量获取股票数据，所需市场的缓存通过一次Redis pipeline读取
+
+        Args:
+            keys_by_market: {市场类型: [缓存键格式的股票代码, ...]}
+
+        Returns:
+            dict: {市场类型: {symbol: stock_data}}，未命中的股票不出现在结果中
+        """
+        markets = [
+            market_type
+            for market_type, symbols in keys_by_market.items()
+            if symbols and market_type in self.cache_keys
+        ]
+        frames = self._get_market_frames_pipelined(markets)
+
+        results = {}
+        for market_type in markets:
+            market_data = frames.get(market_type)
+            if market_data is None:
+                # Redis未命中，走内存备份 / AKShare拉取的常规路径
+                market_data = self._get_market_data_by_type(market_type)
+            if market_data is None or market_data.empty:
+                results[market_type] = {}
+                continue
+            try:
+                results[market_type] = self._extract_stocks(
+                    market_type, market_data, keys_by_market[market_type]
+                )
+            except Exception as e:
+                market_name = {"china": "A股", "hk": "港股", "us": "美股"}[market_type]
+                logger.error(f"❌ 批量提取{market_name}股票数据失败: {e}")
+                results[market_type] = {}
+        return results
+
+    def _get_market_frames_pipelined(
+        self, markets: List[str]
+    ) -> Dict[str, pd.DataFrame]:
+        """一次pipeline往返读取多个市场的缓存数据"""
+        if not markets or not self.redis_cache.connected:
+            return {}
+
+        try:
+            pipe = self.redis_cache.redis_client.pipeline(transaction=False)
+            for market_type in markets:
+                pipe.get(self.cache_keys[market_type])
+            payloads = pipe.execute()
+        except Exception as e:
+            logger.error(f"❌ 批量从Redis获取市场数据失败: {e}")
+            return {}
+
+        frames = {}
+        for market_type, payload in zip(markets, payloads):
+            if not payload:
+                continue
+            try:
+                market_data = self.redis_cache._deserialize_dataframe(payload)
+            except Exception as e:
+                logger.error(f"❌ 反序列化{market_type}市场数据失败: {e}")
+                continue
+            self._memory_backup[market_type] = market_data  # 更新内存备份
+            frames[market_type] = market_data
+        return frames
+
+    @staticmethod
+    def _extract_stocks(
+        market_type: str, market_data: pd.DataFrame, symbols: List[str]
+    ) -> Dict[str, dict]:
+        """
+        用一次向量化的 isin 过滤从全市场数据中取出多只股票
+
+        美股代码格式为 105.AAPL，按点号后的部分或完整代码匹配
+        """
+        wanted = set(symbols)
+        codes = market_data["代码"].astype(str)
+        if market_type == "us":
+            mask = codes.str.rsplit(".", n=1).str[-1].isin(wanted) | codes.isin(wanted)
+        else:
+            mask = codes.isin(wanted)
+
+        results = {}
+        for code, record in zip(codes[mask], market_data[mask].to_dict("records")):
+            if code in wanted:
+                results.setdefault(code, record)
+            if market_type == "us":
+                suffix = code.rsplit(".", 1)[-1]
+                if suffix in wanted:
+                    results.setdefault(suffix, record)
+        return results
+
     def clear_cache(self, market_type: str = None) -> bool:
         """
         清除市场数据缓存
@@ -4,26 +4,59 @@
 """
 
 import re
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Optional, List, Tuple
 from .stock_market_classifier import get_stock_classifier, MarketType, ExchangeType
 
 
+def get_market_key(classification: Dict) -> str:
+    """根据分类结果返回市场键 (china/hk/us/other)"""
+    if classification["is_china"]:
+        return "china"
+    if classification["is_hk"]:
+        return "hk"
+    if classification["is_us"]:
+        return "us"
+    return "other"
+
+
+@dataclass(frozen=True)
+class SymbolContext:
+    """单个股票代码的处理结果，一次分类后在整个调用链中传递"""
+
+    symbol: str
+    market: str
+    classification: Dict
+    tushare_symbol: str
+    akshare_symbol: str
+    yfinance_symbol: str
+
+
 class StockSymbolProcessor:
     """股票代码处理器 - 统一处理股票代码的分类、标准化和转换"""
 
     def __init__(self):
         self.classifier = get_stock_classifier()
+        # 处理结果只取决于代码本身，按代码缓存
+        self._process_cached = lru_cache(maxsize=4096)(self._process_symbol)
 
     def process_symbol(self, symbol: str) -> Dict:
         """
         全面处理股票代码，返回所有相关信息
 
+        结果按代码缓存并在调用方之间共享，调用方应视为只读
+
         Args:
             symbol: 原始股票代码
 
         Returns:
             Dict: 包含分类、标准化后的各种格式
         """
+        return self._process_cached(symbol)
+
+    def _process_symbol(self, symbol: str) -> Dict:
+        """process_symbol 的未缓存实现"""
         # 基础分类
         classification = self.classifier.classify_stock(symbol)
 
@@ -44,6 +77,26 @@ class StockSymbolProcessor:
 
         return result
 
+    def build_context(self, symbol: str) -> SymbolContext:
+        """
+        构建股票代码上下文（只分类一次，预先计算各数据源格式）
+
+        Args:
+            symbol: 原始股票代码
+
+        Returns:
+            SymbolContext: 股票代码上下文
+        """
+        classification = self.classifier.classify_stock(symbol)
+        return SymbolContext(
+            symbol=symbol,
+            market=get_market_key(classification),
+            classification=classification,
+            tushare_symbol=self.get_tushare_format(symbol, classification),
+            akshare_symbol=self.get_akshare_format(symbol, classification),
+            yfinance_symbol=self.get_yfinance_format(symbol, classification),
+        )
+
     def _generate_all_formats(self, symbol: str, classification: Dict) -> Dict:
         """生成所有需要的代码格式"""
         return {
@@ -0,0 +1,133 @@
+"""
+Tushare 接口结果的本地文件缓存
+已发布的日线和财务报表基本不会再变化，按请求参数缓存到本地，避免重复的网络请求和限频消耗
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import pandas as pd
+
+logger = logging.getLogger("tushare_cache")
+
+# 各类接口的缓存时长（秒）
+TUSHARE_DAILY_CACHE_TTL = 86400  # 已收盘的历史日线：1天
+TUSHARE_INTRADAY_CACHE_TTL = 600  # 包含当天的日线：10分钟
+TUSHARE_FUNDAMENTALS_CACHE_TTL = 7 * 86400  # 已过披露期的财务报表：7天
+TUSHARE_RECENT_FUNDAMENTALS_CACHE_TTL = 3600  # 披露期内的财务报表：1小时
+# 报告期结束后的披露窗口（天），窗口内报表可能尚未发布或被更正
+TUSHARE_FILING_WINDOW_DAYS = 120
+
+# 未配置 TUSHARE_CACHE_DIR 时使用项目根目录下的 .cache/tushare
+_DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[3] / ".cache" / "tushare"
+
+
+class TushareDiskCache:
+    """
+    按 (接口名, 请求参数) 缓存 Tushare 返回的 DataFrame
+
+    缓存文件为 JSON（split 格式），读取时不会执行任何代码；
+    目录在首次写入时才创建
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        初始化缓存目录
+
+        Args:
+            cache_dir: 本地缓存目录，默认读取环境变量 TUSHARE_CACHE_DIR，
+                均未设置时使用项目根目录下的 .cache/tushare
+        """
+        cache_dir = cache_dir or os.getenv("TUSHARE_CACHE_DIR")
+        self.cache_dir = (
+            Path(cache_dir).expanduser().resolve() if cache_dir else _DEFAULT_CACHE_DIR
+        )
+
+    def call(
+        self,
+        endpoint: str,
+        ttl: Optional[float],
+        fetch: Callable[..., pd.DataFrame],
+        **params: Any,
+    ) -> pd.DataFrame:
+        """
+        优先读取本地缓存，未命中或过期时调用接口并写入缓存
+
+        Args:
+            endpoint: 接口名（用于缓存子目录）
+            ttl: 缓存时长（秒），None 表示永不过期
+            fetch: 实际的接口调用
+            **params: 接口参数，同时作为缓存键
+
+        Returns:
+            pd.DataFrame: 接口返回的数据
+        """
+        file_path = self._get_path(endpoint, params)
+
+        data = self._load(file_path, ttl)
+        if data is not None:
+            logger.debug(f"📦 命中Tushare文件缓存: {endpoint} {params}")
+            return data
+
+        data = fetch(**params)
+        if data is not None and not data.empty:
+            self._store(file_path, data)
+        return data
+
+    def _get_path(self, endpoint: str, params: dict) -> Path:
+        """生成缓存文件路径"""
+        raw_key = json.dumps(params, sort_keys=True, default=str)
+        digest = hashlib.md5(raw_key.encode("utf-8")).hexdigest()
+        return self.cache_dir / endpoint / f"{digest}.json"
+
+    def _load(self, file_path: Path, ttl: Optional[float]) -> Optional[pd.DataFrame]:
+        """读取未过期的缓存文件"""
+        try:
+            mtime = file_path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+        if ttl is not None and time.time() - mtime > ttl:
+            return None
+
+        try:
+            return pd.read_json(
+                file_path, orient="split", dtype=False, convert_dates=False
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Tushare缓存文件读取失败: {file_path}, {e}")
+            # 损坏的文件，删除
+            try:
+                file_path.unlink()
+            except OSError:
+                pass
+            return None
+
+    def _store(self, file_path: Path, data: pd.DataFrame):
+        """写入缓存文件（先写临时文件再替换，避免并发读到半个文件）"""
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = file_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            data.to_json(tmp_path, orient="split", date_format="iso")
+            os.replace(tmp_path, file_path)
+        except Exception as e:
+            logger.warning(f"⚠️ Tushare缓存文件写入失败: {file_path}, {e}")
+
+
+# ==================== 全局实例 ====================
+
+_global_cache = None
+
+
+def get_tushare_cache() -> TushareDiskCache:
+    """获取 Tushare 文件缓存单例"""
+    global _global_cache
+    if _global_cache is None:
+        _global_cache = TushareDiskCache()
+    return _global_cache
@@ -0,0 +1,10 @@
+"""
+pytest 公共配置：将项目根目录加入 Python 路径，以便以 src.* 方式导入
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
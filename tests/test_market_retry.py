@@ -0,0 +1,106 @@
+"""
+数据源调用重试与熔断测试：只重试瞬时故障，连续失败达到阈值后熔断
+"""
+
+import threading
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+requests = pytest.importorskip("requests")
+market_service = pytest.importorskip("src.server.services.market_service")
+
+
+def _http_error(status):
+    return requests.HTTPError(f"{status}", response=SimpleNamespace(status_code=status))
+
+
+@pytest.fixture
+def service(monkeypatch):
+    # 跳过会创建线程池和数据源的构造函数，只装配熔断状态
+    service = object.__new__(market_service.MarketDataService)
+    service._failures = Counter()
+    service._opened_until = {}
+    service._circuit_lock = threading.Lock()
+    monkeypatch.setattr(market_service.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(market_service.random, "uniform", lambda low, high: 0)
+    return service
+
+
+def _fail_with(monkeypatch, service, errors, result="data"):
+    """依次抛出 errors 中的异常，之后返回 result"""
+    calls = []
+    pending = list(errors)
+
+    def call_once(source, fetch, ctx, start_date, end_date):
+        calls.append(source)
+        if pending:
+            raise pending.pop(0)
+        return result
+
+    monkeypatch.setattr(service, "_call_source_once", call_once)
+    return calls
+
+
+def _call(service):
+    return service._call_source("akshare", None, None, "20240101", "20240131")
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ConnectionError("reset"),
+        requests.ConnectionError("refused"),
+        requests.Timeout("read timeout"),
+        _http_error(429),
+        _http_error(503),
+    ],
+)
+def test_transient_errors_are_retried(monkeypatch, service, error):
+    calls = _fail_with(monkeypatch, service, [error])
+
+    assert _call(service) == "data"
+    assert len(calls) == 2
+    assert service._failures["akshare"] == 0
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ValueError("bad symbol"),
+        FileNotFoundError("missing"),
+        requests.exceptions.InvalidURL("bad url"),
+        _http_error(401),
+        TimeoutError("pool timeout"),
+    ],
+)
+def test_permanent_errors_are_not_retried(monkeypatch, service, error):
+    calls = _fail_with(monkeypatch, service, [error])
+
+    with pytest.raises(type(error)):
+        _call(service)
+    assert len(calls) == 1
+    assert service._failures["akshare"] == 1
+
+
+def test_retries_are_bounded(monkeypatch, service):
+    errors = [ConnectionError("reset")] * (market_service.SOURCE_RETRY_COUNT + 1)
+    calls = _fail_with(monkeypatch, service, errors)
+
+    with pytest.raises(ConnectionError):
+        _call(service)
+    assert len(calls) == market_service.SOURCE_RETRY_COUNT + 1
+
+
+def test_circuit_opens_after_consecutive_failures(monkeypatch, service):
+    threshold = market_service.CIRCUIT_FAILURE_THRESHOLD
+    calls = _fail_with(monkeypatch, service, [ValueError("down")] * threshold)
+
+    for _ in range(threshold):
+        with pytest.raises(ValueError):
+            _call(service)
+
+    assert "akshare" in service._opened_until
+    assert _call(service) is None
+    assert len(calls) == threshold
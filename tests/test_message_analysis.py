@@ -0,0 +1,105 @@
+"""
+股票分析与系统状态测试：各分支/各市场探测并发执行，单个失败不影响整体
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+message_service = pytest.importorskip("src.server.services.message_service")
+
+
+class FakeFundamentals:
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+
+    def get_fundamental_data(self, symbol):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {"basic_info": {"market_cap": 100}, "source": "fake"}
+
+    def calculate_financial_ratios(self, data):
+        return {"pe_ratio": 10.0, "pb_ratio": 2.0, "roe": 0.2, "eps": 1.5}
+
+
+class FakeMarketCache:
+    def __init__(self, delay=0.0, failing=()):
+        self.delay = delay
+        self.failing = failing
+        self.threads = set()
+
+    def get_cache_info(self, market_type=None):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        if market_type in self.failing:
+            raise ConnectionError(f"{market_type} redis down")
+        return {"market_type": market_type}
+
+
+@pytest.fixture
+def make_service():
+    def factory(fundamentals=None, market_cache=None):
+        service = object.__new__(message_service.MessageService)
+        service.fundamentals_service = fundamentals
+        service.akshare_service = (
+            SimpleNamespace(market_cache=market_cache) if market_cache else None
+        )
+        service.news_service = None
+        return service
+
+    return factory
+
+
+def test_analysis_all_runs_both_branches(make_service):
+    service = make_service(fundamentals=FakeFundamentals())
+
+    result = asyncio.run(
+        service._handle_stock_analysis({"symbol": "600519", "type": "all"})
+    )
+
+    assert result["analysis"]["fundamental"]["pe_ratio"] == 10.0
+    assert result["analysis"]["fundamental"]["market_cap"] == 100
+    assert result["analysis"]["technical"] == {"message": "技术分析功能开发中"}
+
+
+def test_analysis_builds_branches_by_type(make_service):
+    service = make_service(fundamentals=FakeFundamentals())
+
+    technical = asyncio.run(
+        service._handle_stock_analysis({"symbol": "600519", "type": "technical"})
+    )
+    fundamental = asyncio.run(service._handle_stock_analysis({"symbol": "600519"}))
+
+    assert list(technical["analysis"]) == ["technical"]
+    assert list(fundamental["analysis"]) == ["fundamental"]
+
+
+def test_analysis_branch_failure_is_isolated(make_service):
+    service = make_service(fundamentals=FakeFundamentals(error=RuntimeError("down")))
+
+    result = asyncio.run(
+        service._handle_stock_analysis({"symbol": "600519", "type": "all"})
+    )
+
+    assert result["analysis"]["fundamental"] == {"error": "down"}
+    assert "message" in result["analysis"]["technical"]
+
+
+def test_system_status_probes_markets_concurrently(make_service):
+    cache = FakeMarketCache(delay=0.2, failing=("hk",))
+    service = make_service(market_cache=cache)
+
+    started = time.perf_counter()
+    status = asyncio.run(service._handle_system_status({}))
+    elapsed = time.perf_counter() - started
+
+    assert status["cache"]["china"] == {"market_type": "china"}
+    assert status["cache"]["us"] == {"market_type": "us"}
+    assert status["cache"]["hk"] == {"error": "hk redis down"}
+    assert len(cache.threads) == 3
+    assert elapsed < 0.5
@@ -0,0 +1,150 @@
+"""
+JSON-RPC 短时响应缓存测试：命中缓存时返回独立副本并刷新时间戳
+"""
+
+import asyncio
+import itertools
+from decimal import Decimal
+
+import pytest
+
+message_service = pytest.importorskip("src.server.services.message_service")
+
+from src.server.utils import json_utils
+from src.server.utils.ttl_cache import TTLCache
+
+
+def _make_service(handlers):
+    # 跳过会初始化各数据源的构造函数，只装配缓存与路由表
+    service = object.__new__(message_service.MessageService)
+    service._dispatch = handlers
+    service._response_cache = TTLCache(maxsize=16, ttl=5)
+    return service
+
+
+@pytest.fixture
+def ticking_clock(monkeypatch):
+    ticks = (f"2024-01-02T09:30:{second:02d}" for second in itertools.count())
+    monkeypatch.setattr(message_service, "_now_iso", lambda: next(ticks))
+
+
+@pytest.fixture
+def quote_service(ticking_clock):
+    calls = []
+
+    async def handle_quote(params):
+        calls.append(params)
+        return {
+            "symbol": params["symbol"],
+            "quote": {"price": 1688.0, "tags": ["a"]},
+            "timestamp": message_service._request_ts(),
+        }
+
+    return _make_service({"get_stock_quote": handle_quote}), calls
+
+
+def _call(service, method, params):
+    return asyncio.run(service.handle_jsonrpc_request(method, params))
+
+
+def test_cache_hit_skips_handler(quote_service):
+    service, calls = quote_service
+
+    first = _call(service, "get_stock_quote", {"symbol": "600519"})
+    second = _call(service, "get_stock_quote", {"symbol": "600519"})
+
+    assert len(calls) == 1
+    assert second["quote"] == first["quote"]
+
+
+def test_cache_hit_returns_independent_copy(quote_service):
+    service, _ = quote_service
+
+    first = _call(service, "get_stock_quote", {"symbol": "600519"})
+    first["quote"]["price"] = 0
+    first["quote"]["tags"].append("mutated")
+
+    second = _call(service, "get_stock_quote", {"symbol": "600519"})
+    assert second is not first
+    assert second["quote"] == {"price": 1688.0, "tags": ["a"]}
+
+    second["symbol"] = "changed"
+    third = _call(service, "get_stock_quote", {"symbol": "600519"})
+    assert third["symbol"] == "600519"
+
+
+def test_cache_hit_restamps_timestamp(quote_service):
+    service, _ = quote_service
+
+    first = _call(service, "get_stock_quote", {"symbol": "600519"})
+    second = _call(service, "get_stock_quote", {"symbol": "600519"})
+
+    assert first["timestamp"] != second["timestamp"]
+
+
+def test_params_are_part_of_cache_key(quote_service):
+    service, calls = quote_service
+
+    _call(service, "get_stock_quote", {"symbol": "600519"})
+    _call(service, "get_stock_quote", {"symbol": "000001"})
+
+    assert len(calls) == 2
+
+
+def test_uncached_methods_always_call_handler(ticking_clock):
+    calls = []
+
+    async def handle_analysis(params):
+        calls.append(params)
+        return {"analysis": {}, "timestamp": message_service._request_ts()}
+
+    service = _make_service({"get_stock_analysis": handle_analysis})
+    _call(service, "get_stock_analysis", {"symbol": "600519"})
+    _call(service, "get_stock_analysis", {"symbol": "600519"})
+
+    assert len(calls) == 2
+
+
+def test_miss_and_hit_return_same_types(ticking_clock):
+    async def handle_quote(params):
+        return {"price": Decimal("1688.50"), "range": (1, 2)}
+
+    service = _make_service({"get_stock_quote": handle_quote})
+    miss = _call(service, "get_stock_quote", {"symbol": "600519"})
+    hit = _call(service, "get_stock_quote", {"symbol": "600519"})
+
+    assert miss == hit == {"price": 1688.5, "range": [1, 2]}
+    assert type(miss["price"]) is type(hit["price"]) is float
+
+
+def test_unserializable_result_is_returned_uncached(ticking_clock):
+    calls = []
+
+    async def handle_quote(params):
+        calls.append(params)
+        result = {"symbol": params["symbol"]}
+        result["self"] = result
+        return result
+
+    service = _make_service({"get_stock_quote": handle_quote})
+    first = _call(service, "get_stock_quote", {"symbol": "600519"})
+    _call(service, "get_stock_quote", {"symbol": "600519"})
+
+    assert first["self"] is first
+    assert len(calls) == 2
+
+
+def test_unknown_method_raises():
+    service = _make_service({})
+
+    with pytest.raises(ValueError):
+        _call(service, "no_such_method", {})
+
+
+def test_available_methods_json_bytes_matches_list():
+    service = _make_service({})
+
+    encoded = service.get_available_methods_json_bytes()
+
+    assert isinstance(encoded, bytes)
+    assert json_utils.loads(encoded) == asyncio.run(service.get_available_methods())
@@ -0,0 +1,81 @@
+"""
+股票代码校验测试：格式无效的代码在访问行情缓存之前即被拒绝
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+message_service = pytest.importorskip("src.server.services.message_service")
+
+
+class RecordingMarketCache:
+    """记录每次行情缓存访问的假缓存"""
+
+    def __init__(self):
+        self.calls = []
+
+    def _record(self, method, symbol):
+        self.calls.append((method, symbol))
+        return {"price": 1.0}
+
+    def get_china_stock_data(self, symbol):
+        return self._record("china", symbol)
+
+    def get_hk_stock_data(self, symbol):
+        return self._record("hk", symbol)
+
+    def get_us_stock_data(self, symbol):
+        return self._record("us", symbol)
+
+
+@pytest.fixture
+def service():
+    service = object.__new__(message_service.MessageService)
+    service.akshare_service = SimpleNamespace(market_cache=RecordingMarketCache())
+    return service
+
+
+@pytest.mark.parametrize(
+    "symbol, market, method",
+    [
+        ("600519", "A股", "china"),
+        ("00700", "港股", "hk"),
+        ("AAPL", "美股", "us"),
+        ("BRK.B", "美股", "us"),
+    ],
+)
+def test_valid_symbols_are_routed_by_market(service, symbol, market, method):
+    result = asyncio.run(service._handle_stock_quote({"symbol": symbol}))
+
+    assert result["market"] == market
+    assert service.akshare_service.market_cache.calls == [(method, symbol)]
+
+
+@pytest.mark.parametrize(
+    "symbol", ["6005190", "1234", "../etc", "AAPL;DROP", "中国平安", " "]
+)
+def test_invalid_symbols_never_reach_cache(service, symbol):
+    with pytest.raises(ValueError, match="无效股票代码"):
+        asyncio.run(service._handle_stock_quote({"symbol": symbol}))
+
+    assert service.akshare_service.market_cache.calls == []
+
+
+def test_invalid_symbol_rejected_even_without_data_source(service):
+    service.akshare_service = None
+
+    with pytest.raises(ValueError, match="无效股票代码"):
+        asyncio.run(service._handle_stock_quote({"symbol": "bad symbol"}))
+
+
+def test_batch_reports_invalid_symbols_per_item(service):
+    result = asyncio.run(
+        service._handle_stock_quotes({"symbols": ["600519", "!!", "AAPL"]})
+    )
+
+    assert result["success_count"] == 2
+    assert "无效股票代码" in result["quotes"][1]["error"]
+    calls = service.akshare_service.market_cache.calls
+    assert sorted(symbol for _, symbol in calls) == ["600519", "AAPL"]
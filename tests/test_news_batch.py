@@ -0,0 +1,170 @@
+"""
+批量新闻获取测试：所有 (股票, 数据源) 组合提交到共享线程池后按股票重新分组
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+new_service = pytest.importorskip("src.server.services.new_service")
+
+NewsArticle = new_service.NewsArticle
+
+START = datetime(2024, 1, 1)
+END = datetime(2024, 1, 3)
+
+
+class FakeSource:
+    """按股票代码返回预置新闻的数据源"""
+
+    def __init__(self, name, articles, available=True, error=None):
+        self.name = name
+        self.articles = articles
+        self.available = available
+        self.error = error
+        self.calls = []
+        self.threads = set()
+
+    def is_available(self):
+        return self.available
+
+    def get_news_cached(self, symbol, start_date, end_date):
+        self.calls.append(symbol)
+        self.threads.add(threading.current_thread().name)
+        if self.error:
+            raise self.error
+        return list(self.articles.get(symbol, ()))
+
+
+class FakeSymbolProcessor:
+    MARKETS = {"600519": "A股", "00700": "港股", "AAPL": "美股"}
+
+    def process_symbol(self, symbol):
+        return {
+            "market": self.MARKETS.get(symbol, "未知"),
+            "formats": {"akshare": symbol, "yfinance": f"{symbol}.YF"},
+        }
+
+
+def _article(title, source, url="", day="2024-01-02"):
+    return NewsArticle(
+        title=title,
+        content="",
+        source=source,
+        publish_time=f"{day}T09:30:00",
+        url=url,
+        symbol="",
+    )
+
+
+@pytest.fixture
+def make_service():
+    pools = []
+
+    def factory(sources, strategy):
+        service = object.__new__(new_service.MultiSourceNewsService)
+        service.symbol_processor = FakeSymbolProcessor()
+        service.sources = sources
+        service.priority_strategy = strategy
+        service._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="news")
+        pools.append(service._pool)
+        return service
+
+    yield factory
+    for pool in pools:
+        pool.shutdown(wait=True)
+
+
+def test_batch_groups_results_per_symbol(make_service):
+    eastmoney = FakeSource(
+        "eastmoney",
+        {
+            "600519": [_article("茅台年报", "EastMoney", url="https://em/1")],
+            "00700": [_article("腾讯回购", "EastMoney", url="https://em/2")],
+        },
+    )
+    finnhub = FakeSource(
+        "finnhub",
+        {"00700.YF": [_article("Tencent buyback", "FinnHub", url="https://fh/1")]},
+    )
+    service = make_service(
+        {"eastmoney": eastmoney, "finnhub": finnhub},
+        {"A股": ["eastmoney"], "港股": ["eastmoney", "finnhub"]},
+    )
+
+    results = service.get_news_batch(["600519", "00700"], START, END)
+
+    assert list(results) == ["600519", "00700"]
+    assert [n["title"] for n in results["600519"]["news"]] == ["茅台年报"]
+    assert results["00700"]["source_stats"] == {"EastMoney": 1, "FinnHub": 1}
+    assert sorted(eastmoney.calls) == ["00700", "600519"]
+    assert finnhub.calls == ["00700.YF"]
+    # 所有请求都在共享线程池中执行
+    assert all(name.startswith("news") for name in eastmoney.threads | finnhub.threads)
+
+
+def test_batch_dedups_across_sources_in_priority_order(make_service):
+    shared_url = "https://example.com/story"
+    primary = FakeSource(
+        "eastmoney", {"00700": [_article("腾讯回购", "EastMoney", url=shared_url)]}
+    )
+    secondary = FakeSource(
+        "finnhub", {"00700.YF": [_article("Tencent", "FinnHub", url=shared_url)]}
+    )
+    service = make_service(
+        {"eastmoney": primary, "finnhub": secondary},
+        {"港股": ["eastmoney", "finnhub"]},
+    )
+
+    result = service.get_news_batch(["00700"], START, END)["00700"]
+
+    assert result["total_count"] == 1
+    assert result["news"][0]["source"] == "EastMoney"
+
+
+def test_batch_isolates_failures_and_unsupported_markets(make_service):
+    broken = FakeSource("finnhub", {}, error=RuntimeError("boom"))
+    unavailable = FakeSource("alphavantage", {}, available=False)
+    eastmoney = FakeSource(
+        "eastmoney", {"600519": [_article("茅台年报", "EastMoney", url="https://em/1")]}
+    )
+    service = make_service(
+        {"finnhub": broken, "alphavantage": unavailable, "eastmoney": eastmoney},
+        {"A股": ["eastmoney"], "美股": ["finnhub", "alphavantage"]},
+    )
+
+    results = service.get_news_batch(["AAPL", "600519", "UNKNOWN", "AAPL"], START, END)
+
+    assert list(results) == ["AAPL", "600519", "UNKNOWN"]
+    assert results["AAPL"]["success"] is True
+    assert results["AAPL"]["news"] == []
+    assert unavailable.calls == []
+    assert results["600519"]["total_count"] == 1
+    assert results["UNKNOWN"]["success"] is False
+
+
+def test_batch_for_date_resolves_window(make_service):
+    seen = []
+
+    class RecordingSource(FakeSource):
+        def get_news_cached(self, symbol, start_date, end_date):
+            seen.append((start_date, end_date))
+            return super().get_news_cached(symbol, start_date, end_date)
+
+    source = RecordingSource("eastmoney", {})
+    service = make_service({"eastmoney": source}, {"A股": ["eastmoney"]})
+
+    results = service.get_news_batch_for_date(["600519"], "2024-01-31", days_before=7)
+
+    assert results["600519"]["success"] is True
+    assert seen == [(datetime(2024, 1, 24), datetime(2024, 1, 31))]
+
+
+def test_batch_for_date_rejects_bad_date(make_service):
+    service = make_service({}, {})
+
+    results = service.get_news_batch_for_date(["600519", "AAPL"], "2024/01/31")
+
+    assert [r["success"] for r in results.values()] == [False, False]
@@ -0,0 +1,107 @@
+"""
+新闻去重测试
+"""
+
+import pytest
+
+new_service = pytest.importorskip("src.server.services.new_service")
+
+NewsArticle = new_service.NewsArticle
+
+
+def _article(title, url="", publish_time="2024-01-02T09:30:00", source="EastMoney"):
+    return NewsArticle(
+        title=title,
+        content="",
+        source=source,
+        publish_time=publish_time,
+        url=url,
+        symbol="600519",
+    )
+
+
+@pytest.fixture
+def dedup():
+    # 去重不依赖实例状态，跳过会初始化数据源和线程池的构造函数
+    service = object.__new__(new_service.MultiSourceNewsService)
+    return service._deduplicate_news
+
+
+def test_empty_list(dedup):
+    assert dedup([]) == []
+
+
+def test_same_url_is_dropped_case_insensitively(dedup):
+    first = _article("贵州茅台发布年报", url="https://example.com/a")
+    repost = _article("茅台年报出炉", url="HTTPS://EXAMPLE.COM/A ", source="FinnHub")
+
+    assert dedup([first, repost]) == [first]
+
+
+def test_same_title_and_day_is_dropped(dedup):
+    first = _article("Kweichow Moutai Beats Estimates", url="https://a.com/1")
+    repost = _article(
+        "  kweichow moutai beats estimates ",
+        url="https://b.com/2",
+        publish_time="2024-01-02T18:00:00",
+    )
+
+    assert dedup([first, repost]) == [first]
+
+
+def test_same_title_on_different_days_is_kept(dedup):
+    monday = _article("每日收评", url="https://a.com/1")
+    tuesday = _article(
+        "每日收评", url="https://a.com/2", publish_time="2024-01-03T15:00:00"
+    )
+
+    assert dedup([monday, tuesday]) == [monday, tuesday]
+
+
+def test_empty_title_is_dropped(dedup):
+    assert dedup([_article("   ", url="https://a.com/1")]) == []
+
+
+def test_order_is_preserved(dedup):
+    articles = [_article(f"新闻 {i}", url=f"https://a.com/{i}") for i in range(5)]
+
+    assert dedup(articles + articles[::-1]) == articles
+
+
+def test_near_duplicate_titles_are_dropped(dedup):
+    first = _article(
+        "Kweichow Moutai beats third-quarter profit estimates", url="https://a.com/1"
+    )
+    repost = _article(
+        "Kweichow Moutai Beats Third Quarter Profit Estimates!",
+        url="https://b.com/2",
+        source="FinnHub",
+    )
+    other = _article("Kweichow Moutai cuts dividend payout", url="https://c.com/3")
+
+    assert dedup([first, repost, other]) == [first, other]
+
+
+def test_near_duplicates_on_different_days_are_kept(dedup):
+    first = _article("贵州茅台三季度净利润超预期", url="https://a.com/1")
+    next_day = _article(
+        "贵州茅台三季度净利润超预期！",
+        url="https://b.com/2",
+        publish_time="2024-01-03T09:30:00",
+    )
+
+    assert dedup([first, next_day]) == [first, next_day]
+
+
+def test_near_duplicates_found_among_many_articles(dedup):
+    # 超过线性比较上限后走分桶查找
+    articles = [
+        _article(f"Company {i:03d} reports quarterly results", url=f"https://a.com/{i}")
+        for i in range(100)
+    ]
+    reposts = [
+        _article(f"company {i:03d} reports quarterly results.", url=f"https://b.com/{i}")
+        for i in (5, 50, 99)
+    ]
+
+    assert dedup(articles + reposts) == articles
@@ -0,0 +1,83 @@
+"""
+批量行情测试：一次批量读取全市场缓存，仅未命中的股票逐个降级
+"""
+
+from decimal import Decimal
+
+import pytest
+
+quote_service = pytest.importorskip("src.server.services.quote_service")
+
+
+class FakeSymbolProcessor:
+    MARKETS = {"600519": "china", "00700": "hk", "AAPL": "us", "TSLA": "us"}
+
+    def process_symbol(self, symbol):
+        return {
+            "market_simple_name": self.MARKETS.get(symbol, "unknown"),
+            "formats": {"cache_key": symbol, "yfinance": symbol},
+        }
+
+
+class FakeMarketCache:
+    def __init__(self, cached, error=None):
+        self.cached = cached
+        self.error = error
+        self.requests = []
+
+    def get_stocks_data_batch(self, keys_by_market):
+        self.requests.append(keys_by_market)
+        if self.error:
+            raise self.error
+        return self.cached
+
+
+@pytest.fixture
+def make_service(monkeypatch):
+    def factory(market_cache):
+        service = object.__new__(quote_service.QuoteService)
+        service._processor = FakeSymbolProcessor()
+        service.services = {"akshare": object()}
+        service.market_cache = market_cache
+        service.resolved = []
+
+        def resolve(symbol_info, skip):
+            ticker = symbol_info["formats"]["cache_key"]
+            service.resolved.append((ticker, skip))
+            return quote_service.StockMarketDataDTO(ticker=ticker, source="yfinance")
+
+        monkeypatch.setattr(service, "_resolve_quote", resolve)
+        return service
+
+    return factory
+
+
+def test_single_batch_lookup_and_fallback_for_misses(make_service):
+    cache = FakeMarketCache(
+        {
+            "china": {"600519": {"最新价": 1688.0, "涨跌幅": 1.5}},
+            "us": {"AAPL": {"最新价": 190.0}},
+        }
+    )
+    service = make_service(cache)
+
+    quotes = service.get_stock_quotes_batch(["600519", "TSLA", "AAPL", "00700"])
+
+    assert cache.requests == [
+        {"china": ["600519"], "us": ["TSLA", "AAPL"], "hk": ["00700"]}
+    ]
+    assert [q.ticker for q in quotes] == ["600519", "TSLA", "AAPL", "00700"]
+    assert quotes[0].source == "akshare_cache"
+    assert quotes[0].currentPrice == Decimal("1688.0")
+    assert quotes[2].source == "akshare_cache"
+    # 未命中的股票降级时跳过已查过的 AKShare 缓存
+    assert sorted(service.resolved) == [("00700", ("akshare",)), ("TSLA", ("akshare",))]
+
+
+def test_batch_lookup_failure_falls_back_for_all(make_service):
+    service = make_service(FakeMarketCache({}, error=ConnectionError("redis down")))
+
+    quotes = service.get_stock_quotes_batch(["600519", "AAPL"])
+
+    assert [q.source for q in quotes] == ["yfinance", "yfinance"]
+    assert len(service.resolved) == 2
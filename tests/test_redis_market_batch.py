@@ -0,0 +1,117 @@
+"""
+AKShare 全市场缓存批量读取测试：所需市场通过一次 Redis pipeline 往返读取
+"""
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+redis_cache = pytest.importorskip("src.server.utils.redis_cache")
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.keys = []
+
+    def get(self, key):
+        self.keys.append(key)
+
+    def execute(self):
+        self.client.executed.append(list(self.keys))
+        if self.client.error:
+            raise self.client.error
+        return [self.client.store.get(key) for key in self.keys]
+
+
+class FakeRedisClient:
+    def __init__(self, store, error=None):
+        self.store = store
+        self.error = error
+        self.executed = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakeRedisCache:
+    """Redis 中存放市场名作为 payload，反序列化时取回对应的 DataFrame"""
+
+    def __init__(self, store, connected=True, error=None):
+        self.redis_client = FakeRedisClient(store, error)
+        self.connected = connected
+
+    @staticmethod
+    def _deserialize_dataframe(payload):
+        return FRAMES[payload]
+
+
+CHINA = pd.DataFrame({"代码": ["600519", "000001"], "最新价": [1688.0, 10.5]})
+US = pd.DataFrame({"代码": ["105.AAPL", "106.BABA"], "最新价": [190.0, 80.0]})
+HK = pd.DataFrame({"代码": ["00700"], "最新价": [300.0]})
+FRAMES = {b"china": CHINA, b"us": US}
+
+
+@pytest.fixture
+def make_cache(monkeypatch):
+    def factory(store, **kwargs):
+        cache = object.__new__(redis_cache.AKShareMarketCache)
+        cache.redis_cache = FakeRedisCache(store, **kwargs)
+        cache.cache_keys = {
+            "china": "china_key",
+            "hk": "hk_key",
+            "us": "us_key",
+        }
+        cache._memory_backup = {"china": None, "hk": None, "us": None}
+        cache.fallback_calls = []
+
+        def fallback(market_type):
+            cache.fallback_calls.append(market_type)
+            return {"hk": HK}.get(market_type)
+
+        monkeypatch.setattr(cache, "_get_market_data_by_type", fallback)
+        return cache
+
+    return factory
+
+
+def test_reads_all_markets_in_one_round_trip(make_cache):
+    cache = make_cache({"china_key": b"china", "us_key": b"us"})
+
+    results = cache.get_stocks_data_batch(
+        {"china": ["600519", "999999"], "us": ["AAPL"], "hk": []}
+    )
+
+    assert cache.redis_cache.redis_client.executed == [["china_key", "us_key"]]
+    assert cache.fallback_calls == []
+    assert set(results) == {"china", "us"}
+    assert results["china"]["600519"]["最新价"] == 1688.0
+    assert "999999" not in results["china"]
+    assert results["us"]["AAPL"]["代码"] == "105.AAPL"
+    assert cache._memory_backup["china"] is CHINA
+
+
+def test_redis_miss_falls_back_per_market(make_cache):
+    cache = make_cache({"china_key": b"china"})
+
+    results = cache.get_stocks_data_batch({"china": ["600519"], "hk": ["00700"]})
+
+    assert cache.fallback_calls == ["hk"]
+    assert results["hk"]["00700"]["最新价"] == 300.0
+
+
+def test_pipeline_failure_falls_back_to_regular_path(make_cache):
+    cache = make_cache({}, error=ConnectionError("redis down"))
+
+    results = cache.get_stocks_data_batch({"china": ["600519"], "hk": ["00700"]})
+
+    assert cache.fallback_calls == ["china", "hk"]
+    assert results == {"china": {}, "hk": {"00700": HK.iloc[0].to_dict()}}
+
+
+def test_disconnected_redis_skips_pipeline(make_cache):
+    cache = make_cache({"china_key": b"china"}, connected=False)
+
+    cache.get_stocks_data_batch({"china": ["600519"]})
+
+    assert cache.redis_cache.redis_client.executed == []
+    assert cache.fallback_calls == ["china"]
@@ -0,0 +1,63 @@
+"""
+SSE 连接队列测试：队列有界，慢客户端积压时丢弃最旧的消息
+"""
+
+import asyncio
+
+import pytest
+
+sse_service = pytest.importorskip("src.server.services.sse_service")
+
+
+def _drain(queue):
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def _send_all(connection, messages):
+    async def send():
+        return [await connection.send_message(m) for m in messages]
+
+    return asyncio.run(send())
+
+
+@pytest.fixture
+def small_queue(monkeypatch):
+    monkeypatch.setattr(sse_service, "SSE_QUEUE_MAXSIZE", 3)
+
+
+def test_queue_is_bounded(small_queue):
+    connection = sse_service.SSEConnection("client", request=None)
+
+    assert connection.message_queue.maxsize == 3
+
+
+def test_full_queue_drops_oldest(small_queue):
+    connection = sse_service.SSEConnection("client", request=None)
+    messages = [{"seq": i} for i in range(5)]
+
+    assert _send_all(connection, messages) == [True] * 5
+    assert _drain(connection.message_queue) == messages[2:]
+    assert connection.dropped_count == 2
+    assert connection.message_count == 5
+
+
+def test_no_drops_below_capacity(small_queue):
+    connection = sse_service.SSEConnection("client", request=None)
+
+    _send_all(connection, [{"seq": 0}, {"seq": 1}])
+
+    assert connection.dropped_count == 0
+    assert len(_drain(connection.message_queue)) == 2
+
+
+def test_closed_connection_rejects_messages(small_queue):
+    closed = []
+    connection = sse_service.SSEConnection("client", None, on_close=closed.append)
+    connection.close()
+
+    assert _send_all(connection, [{"seq": 0}]) == [False]
+    assert connection.message_queue.empty()
+    assert closed == ["client"]
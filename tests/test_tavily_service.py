@@ -0,0 +1,103 @@
+"""
+Tavily 搜索服务测试
+"""
+
+import threading
+import time
+
+import pytest
+
+tavily_service = pytest.importorskip("src.server.services.tavily_service")
+
+from src.server.utils.ttl_cache import TTLCache
+
+
+class FakeTavilyClient:
+    """记录调用并统计最大并发数的假客户端"""
+
+    def __init__(self, delay=0.0, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.queries = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def search(self, query, **kwargs):
+        with self._lock:
+            self.queries.append(query)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if query in self.failing:
+                raise RuntimeError("quota exceeded")
+            return {"query": query, "results": [{"title": query}]}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _make_service(client):
+    service = object.__new__(tavily_service.TavilyService)
+    service.client = client
+    service._search_cache = TTLCache(maxsize=16, ttl=60)
+    return service
+
+
+def test_search_batch_preserves_order_and_isolates_failures():
+    client = FakeTavilyClient(failing={"bad"})
+    service = _make_service(client)
+
+    results = service.search_batch(["a", "bad", "c"])
+
+    assert results[0]["query"] == "a"
+    assert results[1] is None
+    assert results[2]["query"] == "c"
+
+
+def test_search_batch_bounds_concurrency():
+    client = FakeTavilyClient(delay=0.05)
+    service = _make_service(client)
+    queries = [f"query {i}" for i in range(12)]
+
+    results = service.search_batch(queries)
+
+    assert [r["query"] for r in results] == queries
+    assert 1 < client.peak <= tavily_service.SEARCH_MAX_CONCURRENCY
+
+
+def test_search_batch_empty():
+    assert _make_service(FakeTavilyClient()).search_batch([]) == []
+
+
+def test_cache_key_ignores_case_punctuation_and_spacing():
+    client = FakeTavilyClient()
+    service = _make_service(client)
+
+    service.search("Apple  earnings?")
+    service.search("apple, EARNINGS")
+
+    assert client.queries == ["Apple  earnings?"]
+
+
+def test_cache_key_keeps_word_order():
+    client = FakeTavilyClient()
+    service = _make_service(client)
+
+    service.search("apple buys startup")
+    service.search("startup buys apple")
+
+    assert client.queries == ["apple buys startup", "startup buys apple"]
+
+
+def test_cache_returns_independent_copy():
+    service = _make_service(FakeTavilyClient())
+
+    first = service.search("apple earnings")
+    first["results"].append({"title": "mutated"})
+    second = service.search("apple earnings")
+    second["results"].clear()
+    third = service.search("apple earnings")
+
+    assert third["results"] == [{"title": "apple earnings"}]
@@ -0,0 +1,72 @@
+"""
+通达信批量行情测试：按 80 只一组请求，并按返回的代码回填结果
+"""
+
+import pytest
+
+tdx_service = pytest.importorskip("src.server.services.tdx_service")
+
+
+class FakeTdxApi:
+    """记录每次 get_security_quotes 调用的假客户端"""
+
+    def __init__(self, missing=(), failing_chunks=()):
+        self.calls = []
+        self.missing = set(missing)
+        self.failing_chunks = set(failing_chunks)
+
+    def get_security_quotes(self, pairs):
+        self.calls.append(list(pairs))
+        if len(self.calls) - 1 in self.failing_chunks:
+            raise ConnectionError("tdx timeout")
+        # 服务端返回顺序与请求不同，且可能遗漏个别股票
+        return [
+            {"market": market, "code": code, "price": 11.0, "last_close": 10.0}
+            for market, code in reversed(pairs)
+            if code not in self.missing
+        ]
+
+
+@pytest.fixture
+def make_service(monkeypatch):
+    def factory(api):
+        service = object.__new__(tdx_service.TdxService)
+        monkeypatch.setattr(service, "_get_checked_api", lambda: api, raising=False)
+        return service
+
+    return factory
+
+
+def _symbols(count):
+    return [f"{600000 + i:06d}" if i % 2 else f"{i:06d}" for i in range(count)]
+
+
+def test_bulk_chunks_requests(make_service):
+    api = FakeTdxApi()
+    symbols = _symbols(170)
+
+    quotes = make_service(api).get_stock_quotes_bulk(symbols)
+
+    assert [len(call) for call in api.calls] == [80, 80, 10]
+    assert set(quotes) == set(symbols)
+
+
+def test_bulk_maps_results_by_returned_code(make_service):
+    api = FakeTdxApi(missing={"000002"})
+
+    quotes = make_service(api).get_stock_quotes_bulk(["600519", "000002", "000001"])
+
+    assert set(quotes) == {"600519", "000001"}
+    assert quotes["600519"]["code"] == "600519"
+    assert quotes["600519"]["change_percent"] == pytest.approx(10.0)
+    assert api.calls == [[(1, "600519"), (0, "000002"), (0, "000001")]]
+
+
+def test_bulk_skips_failed_chunk_and_duplicates(make_service):
+    api = FakeTdxApi(failing_chunks={0})
+    symbols = _symbols(100)
+
+    quotes = make_service(api).get_stock_quotes_bulk(symbols + symbols[:5])
+
+    assert len(api.calls) == 2
+    assert set(quotes) == set(symbols[80:])
@@ -0,0 +1,113 @@
+"""
+TTLCache 测试
+"""
+
+import pytest
+
+from src.server.utils import ttl_cache
+from src.server.utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    """可手动推进的单调时钟"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(ttl_cache, "time", fake)
+    return fake
+
+
+def test_get_set_and_default():
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+    assert cache.get("missing", "default") == "default"
+
+
+def test_falsy_values_are_cached():
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set("zero", 0)
+    cache.set("none", None)
+
+    assert "zero" in cache
+    assert cache.get("zero", "default") == 0
+    assert "none" in cache
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set("a", 1)
+
+    clock.advance(9.9)
+    assert cache.get("a") == 1
+
+    clock.advance(0.1)
+    assert cache.get("a") is None
+    assert "a" not in cache
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_overrides_default(clock):
+    cache = TTLCache(maxsize=4, ttl=100)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2)
+
+    clock.advance(5)
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    # 访问 a 之后，b 成为最久未使用的条目
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_overwrite_refreshes_position_and_expiry(clock):
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    clock.advance(8)
+    cache.set("a", 10)
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    clock.advance(8)
+    assert cache.get("a") == 10
+
+
+def test_pop_and_clear():
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a", "gone") == "gone"
+    assert "a" not in cache
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get("b") is None
@@ -0,0 +1,110 @@
+"""
+Tushare 前复权价格计算测试：向量化实现与逐行循环的原始算法结果一致
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+tushare_service = pytest.importorskip("src.server.services.tushare_service")
+
+
+def _forward_adjust_loop(data: "pd.DataFrame") -> "pd.DataFrame":
+    """逐行计算前复权价格的原始实现，作为对照"""
+    adjusted = data.sort_values("trade_date").reset_index(drop=True)
+    closes_raw = adjusted["close"].astype(float).tolist()
+
+    adjusted_closes = [closes_raw[-1]]
+    for i in range(len(adjusted) - 2, -1, -1):
+        pct_change = float(adjusted.loc[i + 1, "pct_chg"]) / 100.0
+        adjusted_closes.insert(0, adjusted_closes[0] / (1 + pct_change))
+
+    result = {"close": adjusted_closes, "open": [], "high": [], "low": []}
+    for i, close_raw in enumerate(closes_raw):
+        ratio = adjusted_closes[i] / close_raw if close_raw != 0 else 1.0
+        for column in ("open", "high", "low"):
+            result[column].append(float(adjusted.loc[i, column]) * ratio)
+    return pd.DataFrame(result)
+
+
+@pytest.fixture
+def service():
+    # 只测试纯计算方法，跳过会连接 Tushare 的初始化
+    return object.__new__(tushare_service.TushareService)
+
+
+@pytest.fixture
+def daily_bars():
+    # 乱序输入，并包含一次除权跳空（第 3 天收盘价从 11 跌到 5.6）
+    return pd.DataFrame(
+        {
+            "trade_date": ["20240105", "20240102", "20240104", "20240103", "20240108"],
+            "open": [5.5, 10.0, 10.9, 10.2, 5.8],
+            "high": [5.8, 10.3, 11.2, 10.6, 6.0],
+            "low": [5.4, 9.9, 10.8, 10.1, 5.7],
+            "close": [5.6, 10.2, 11.0, 10.5, 5.9],
+            "pct_chg": [1.8182, 0.0, 4.7619, 2.9412, 5.3571],
+        }
+    )
+
+
+def test_matches_loop_implementation(service, daily_bars):
+    result = service._calculate_forward_adjusted_prices(daily_bars)
+    expected = _forward_adjust_loop(daily_bars)
+
+    assert result["trade_date"].tolist() == sorted(daily_bars["trade_date"])
+    for column in ("close", "open", "high", "low"):
+        np.testing.assert_allclose(
+            result[column].to_numpy(), expected[column].to_numpy(), rtol=1e-12
+        )
+
+
+def test_keeps_raw_prices_and_latest_close(service, daily_bars):
+    result = service._calculate_forward_adjusted_prices(daily_bars)
+    ordered = daily_bars.sort_values("trade_date", ignore_index=True)
+
+    for column in ("close", "open", "high", "low"):
+        np.testing.assert_array_equal(
+            result[f"{column}_raw"].to_numpy(), ordered[column].to_numpy()
+        )
+    assert result["close"].iat[-1] == ordered["close"].iat[-1]
+    assert (result["price_type"] == "forward_adjusted").all()
+
+
+def test_zero_close_keeps_raw_prices(service):
+    data = pd.DataFrame(
+        {
+            "trade_date": ["20240102", "20240103"],
+            "open": [1.0, 10.0],
+            "high": [1.5, 10.5],
+            "low": [0.5, 9.5],
+            "close": [0.0, 10.0],
+            "pct_chg": [0.0, 25.0],
+        }
+    )
+
+    result = service._calculate_forward_adjusted_prices(data)
+
+    assert result["open"].iat[0] == 1.0
+    assert result["high"].iat[0] == 1.5
+    assert result["low"].iat[0] == 0.5
+    assert result["close"].iat[0] == pytest.approx(8.0)
+
+
+def test_single_row_and_missing_pct_chg(service):
+    single = pd.DataFrame(
+        {
+            "trade_date": ["20240102"],
+            "open": [10.0],
+            "high": [10.5],
+            "low": [9.5],
+            "close": [10.2],
+            "pct_chg": [1.0],
+        }
+    )
+    result = service._calculate_forward_adjusted_prices(single)
+    assert result["close"].tolist() == [10.2]
+    assert result["open"].tolist() == [10.0]
+
+    without_pct = single.drop(columns="pct_chg")
+    assert service._calculate_forward_adjusted_prices(without_pct) is without_pct